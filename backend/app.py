@@ -1,12 +1,32 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, g, has_app_context, url_for
 from flask_cors import CORS
 import pyodbc
+import atexit
+import base64
+import click
+import csv
+import hashlib
+import io
+import itertools
+import json
+import math
 import os
+import random
+import re
+import signal
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import logging
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+from openai import AzureOpenAI, APIConnectionError, APIStatusError
 
 # Load environment variables
 load_dotenv()
@@ -38,31 +58,547 @@ openai_api_key = os.environ.get('OPENAI_API_KEY')
 openai_endpoint = os.environ.get('OPENAI_ENDPOINT')
 openai_api_version = os.environ.get('OPENAI_API_VERSION', '2024-02-15-preview')
 
+# Retries are left to llm_executor, which honors Retry-After across all callers
 openai_client = AzureOpenAI(
     api_key=openai_api_key,
     azure_endpoint=openai_endpoint,
-    api_version=openai_api_version
+    api_version=openai_api_version,
+    max_retries=0,
+    timeout=float(os.environ.get('OPENAI_TIMEOUT_SECONDS', '120'))
 )
 
-def get_db_connection():
-    """Create and return a database connection"""
-    try:
-        if DB_CONFIG['username']:
-            conn_string = f"DRIVER={DB_CONFIG['driver']};SERVER={DB_CONFIG['server']};DATABASE={DB_CONFIG['database']};UID={DB_CONFIG['username']};PWD={DB_CONFIG['password']}"
-        else:
-            # Use Windows Authentication
-            conn_string = f"DRIVER={DB_CONFIG['driver']};SERVER={DB_CONFIG['server']};DATABASE={DB_CONFIG['database']};Trusted_Connection=yes"
+# Connection pool configuration
+DB_POOL_CONFIG = {
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+    'checkout_timeout': float(os.environ.get('DB_POOL_CHECKOUT_TIMEOUT', '30')),
+    'idle_timeout': float(os.environ.get('DB_POOL_IDLE_TIMEOUT', '300')),
+    'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '1800')),
+    'health_check_interval': float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', '30'))
+}
+
+# The pool below replaces ODBC driver-manager pooling
+pyodbc.pooling = False
+
+def build_connection_string():
+    """Build the ODBC connection string from DB_CONFIG"""
+    if DB_CONFIG['username']:
+        return f"DRIVER={DB_CONFIG['driver']};SERVER={DB_CONFIG['server']};DATABASE={DB_CONFIG['database']};UID={DB_CONFIG['username']};PWD={DB_CONFIG['password']}"
+    # Use Windows Authentication
+    return f"DRIVER={DB_CONFIG['driver']};SERVER={DB_CONFIG['server']};DATABASE={DB_CONFIG['database']};Trusted_Connection=yes"
 
-        conn = pyodbc.connect(conn_string)
-        return conn
+class PooledConnection:
+    """
+    Proxy around a pyodbc connection checked out of a ConnectionPool.
+
+    Behaves like the raw connection. close() returns it to the pool instead of
+    closing the socket; uncommitted work is rolled back exactly as a real close would.
+    Request-scoped connections stay checked out until the app context tears down.
+    """
+
+    def __init__(self, pool, raw_connection):
+        self._pool = pool
+        self._raw = raw_connection
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        self.request_scoped = False
+        self.closed = True
+        self.broken = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        """Discard uncommitted work and hand the connection back (or keep it for the request)"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.request_scoped:
+            try:
+                self._raw.rollback()
+            except Exception:
+                self.broken = True
+            return
+        self._pool.release(self)
+
+    def release(self):
+        """Return a request-scoped connection to the pool"""
+        self.request_scoped = False
+        already_rolled_back = self.closed
+        self.closed = True
+        self._pool.release(self, discard=self.broken, rolled_back=already_rolled_back)
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections.
+
+    - At most max_size connections are open at once; callers wait up to
+      checkout_timeout seconds for one to become free
+    - Connections idle longer than idle_timeout or older than max_lifetime are closed
+    - Connections idle longer than health_check_interval are pinged before checkout
+    """
+
+    def __init__(self, connect, max_size=10, checkout_timeout=30, idle_timeout=300,
+                 max_lifetime=1800, health_check_interval=30):
+        self._connect = connect
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total_ms': 0.0,
+            'checkout_timeouts': 0,
+            'connects': 0,
+            'connect_failures': 0,
+            'connect_time_total_ms': 0.0,
+            'connect_time_max_ms': 0.0,
+            'health_check_failures': 0,
+            'idle_evictions': 0,
+            'lifetime_recycles': 0,
+            'discards': 0
+        }
+
+    def _is_expired(self, conn, now):
+        """Check whether a connection has outlived its idle or lifetime budget"""
+        if self.max_lifetime and now - conn.created_at >= self.max_lifetime:
+            self._stats['lifetime_recycles'] += 1
+            return True
+        if self.idle_timeout and now - conn.last_used_at >= self.idle_timeout:
+            self._stats['idle_evictions'] += 1
+            return True
+        return False
+
+    def _close_raw(self, conn):
+        try:
+            conn._raw.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn):
+        """Ping a connection that has sat idle long enough to have gone stale"""
+        if time.monotonic() - conn.last_used_at < self.health_check_interval:
+            return True
+        try:
+            cursor = conn._raw.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy pooled connection: {str(e)}")
+            with self._cond:
+                self._stats['health_check_failures'] += 1
+            return False
+
+    def _open(self):
+        """Open a new raw connection, recording connect latency"""
+        started = time.monotonic()
+        try:
+            raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._stats['connect_failures'] += 1
+                self._cond.notify()
+            raise
+        elapsed_ms = (time.monotonic() - started) * 1000
+        with self._cond:
+            self._stats['connects'] += 1
+            self._stats['connect_time_total_ms'] += elapsed_ms
+            self._stats['connect_time_max_ms'] = max(self._stats['connect_time_max_ms'], elapsed_ms)
+        return PooledConnection(self, raw)
+
+    def acquire(self):
+        """Check a connection out of the pool, opening a new one if there is room"""
+        deadline = time.monotonic() + self.checkout_timeout
+        waited_since = None
+
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    while self._idle:
+                        candidate = self._idle.pop()
+                        if self._is_expired(candidate, now):
+                            self._size -= 1
+                            self._close_raw(candidate)
+                            continue
+                        conn = candidate
+                        break
+                    if conn is not None or self._size < self.max_size:
+                        break
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats['checkout_timeouts'] += 1
+                        raise TimeoutError(f"Timed out after {self.checkout_timeout}s waiting for a database connection")
+                    if waited_since is None:
+                        waited_since = now
+                        self._stats['waits'] += 1
+                    self._cond.wait(remaining)
+
+                if conn is None:
+                    self._size += 1
+
+            if conn is None:
+                conn = self._open()
+            elif not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+
+            with self._cond:
+                self._in_use += 1
+                self._stats['checkouts'] += 1
+                if waited_since is not None:
+                    self._stats['wait_time_total_ms'] += (time.monotonic() - waited_since) * 1000
+            conn.closed = False
+            return conn
+
+    def _discard(self, conn):
+        self._close_raw(conn)
+        with self._cond:
+            self._size -= 1
+            self._stats['discards'] += 1
+            self._cond.notify()
+
+    def release(self, conn, discard=False, rolled_back=False):
+        """Return a checked-out connection to the pool"""
+        with self._cond:
+            self._in_use -= 1
+
+        if not discard and not rolled_back:
+            try:
+                conn._raw.rollback()
+            except Exception:
+                discard = True
+
+        if discard or (self.max_lifetime and time.monotonic() - conn.created_at >= self.max_lifetime):
+            self._discard(conn)
+            return
+
+        conn.last_used_at = time.monotonic()
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def stats(self):
+        """Snapshot of pool counters for sizing and monitoring"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'max_size': self.max_size,
+                'open': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle)
+            })
+        stats['avg_connect_time_ms'] = round(stats['connect_time_total_ms'] / stats['connects'], 2) if stats['connects'] else 0
+        stats['avg_wait_time_ms'] = round(stats['wait_time_total_ms'] / stats['waits'], 2) if stats['waits'] else 0
+        for key in ('wait_time_total_ms', 'connect_time_total_ms', 'connect_time_max_ms'):
+            stats[key] = round(stats[key], 2)
+        return stats
+
+def _connect_raw():
+    try:
+        return pyodbc.connect(build_connection_string())
     except Exception as e:
         logger.error(f"Database connection error: {str(e)}")
         raise
 
+db_pool = ConnectionPool(_connect_raw, **DB_POOL_CONFIG)
+
+def get_db_connection():
+    """
+    Return a pooled database connection.
+
+    Inside a request the same connection is reused for every call and returned to
+    the pool when the app context tears down. Outside a request (background threads,
+    CLI commands) the caller owns the connection until it calls close().
+    """
+    if not has_app_context():
+        return db_pool.acquire()
+
+    conn = g.get('db_conn')
+    if conn is not None and conn.broken:
+        conn.release()
+        conn = None
+    if conn is None:
+        conn = db_pool.acquire()
+        conn.request_scoped = True
+        g.db_conn = conn
+    conn.closed = False
+    return conn
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    """Return the request's connection to the pool"""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        conn.release()
+
 def dict_from_row(cursor, row):
-    """Convert database row to dictionary"""
+    """Convert database row to dictionary (rowversion bytes come back as hex strings)"""
     columns = [column[0] for column in cursor.description]
-    return dict(zip(columns, row))
+    return dict(zip(columns, (value.hex() if isinstance(value, (bytes, bytearray)) else value for value in row)))
+
+def fetch_result_sets(cursor, statements):
+    """
+    Run several SELECT statements as a single batch and return every result set.
+
+    Args:
+        cursor: Database cursor
+        statements: List of (sql, params) tuples, executed in order
+
+    Returns:
+        One list of row dicts per statement, in the same order
+    """
+    batch_sql = "SET NOCOUNT ON;\n" + ";\n".join(sql.strip().rstrip(';') for sql, _ in statements)
+    batch_params = [param for _, params in statements for param in params]
+
+    if batch_params:
+        cursor.execute(batch_sql, batch_params)
+    else:
+        cursor.execute(batch_sql)
+
+    result_sets = []
+    while True:
+        # Statements without a result set (e.g. row counts) have no description
+        if cursor.description is not None:
+            result_sets.append([dict_from_row(cursor, row) for row in cursor.fetchall()])
+        if not cursor.nextset():
+            break
+
+    if len(result_sets) != len(statements):
+        raise RuntimeError(f"Expected {len(statements)} result sets from batch, got {len(result_sets)}")
+    return result_sets
+
+def load_related(cursor, table, key_column, columns, keys):
+    """
+    Batch-load a one-to-many relation for many parent rows in one statement.
+
+    Args:
+        cursor: Database cursor
+        table: Child table name
+        key_column: Foreign key column referencing the parent ids
+        columns: A column name (values are returned as-is) or a list of column
+                 names (rows are returned as dicts)
+        keys: Parent ids to load children for
+
+    Returns:
+        Dict mapping every key to its list of related values, in child id order
+    """
+    related = {key: [] for key in keys}
+    if not related:
+        return related
+
+    select_columns = columns if isinstance(columns, str) else ', '.join(columns)
+    # The ids travel as one JSON parameter, so the statement count does not grow
+    # with the number of parents and the 2100-parameter limit never applies
+    cursor.execute(f"""
+        SELECT {key_column}, {select_columns}
+        FROM {table}
+        WHERE {key_column} IN (SELECT CAST(value AS INT) FROM OPENJSON(?))
+        ORDER BY {key_column}, id
+    """, json.dumps(list(related)))
+
+    for row in cursor.fetchall():
+        if isinstance(columns, str):
+            related[row[0]].append(row[1])
+        else:
+            related[row[0]].append(dict(zip(columns, row[1:])))
+    return related
+
+# ==================== Metric Values ====================
+# metric_values holds one row per (initiative, period, metric) from the
+# monthly_metrics.additional_metrics JSON so aggregates can run in SQL.
+# The JSON column stays the source of truth; every write to it also
+# writes metric_values.
+
+def metric_value_columns(metric_name, metric_data):
+    """
+    Flatten one additional_metrics entry into metric_values columns.
+
+    numeric_value follows the dashboard rules: a missing value counts as 0 and a
+    value that is not a finite number is stored as NULL. raw_value keeps the
+    JSON-encoded value so the API returns it with its original type.
+    """
+    if not isinstance(metric_data, dict):
+        metric_data = {'value': metric_data}
+
+    try:
+        numeric_value = float(metric_data.get('value', 0))
+        if not math.isfinite(numeric_value):
+            numeric_value = None
+    except (ValueError, TypeError):
+        numeric_value = None
+
+    return (metric_name, numeric_value, json.dumps(metric_data.get('value')), metric_data.get('comments'))
+
+def metric_entry_from_row(row):
+    """Rebuild an additional_metrics entry from a metric_values row dict"""
+    return {
+        'value': json.loads(row['raw_value']) if row['raw_value'] is not None else None,
+        'comments': row['comments']
+    }
+
+def upsert_metric_values(cursor, initiative_id, metric_period, metrics):
+    """Write additional_metrics entries for one period into metric_values"""
+    if not metrics:
+        return
+
+    placeholders = ','.join(['?' for _ in metrics])
+    cursor.execute(f"""
+        DELETE FROM metric_values
+        WHERE initiative_id = ? AND metric_period = ? AND metric_name IN ({placeholders})
+    """, (initiative_id, metric_period, *metrics.keys()))
+
+    cursor.executemany("""
+        INSERT INTO metric_values (
+            monthly_metric_id, initiative_id, metric_period,
+            metric_name, numeric_value, raw_value, comments
+        )
+        SELECT id, initiative_id, metric_period, ?, ?, ?, ?
+        FROM monthly_metrics
+        WHERE initiative_id = ? AND metric_period = ?
+    """, [
+        (*metric_value_columns(metric_name, metric_data), initiative_id, metric_period)
+        for metric_name, metric_data in metrics.items()
+    ])
+
+def delete_metric_values(cursor, initiative_id, metric_period, metric_name):
+    """Remove one metric for a period from metric_values"""
+    cursor.execute("""
+        DELETE FROM metric_values
+        WHERE initiative_id = ? AND metric_period = ? AND metric_name = ?
+    """, (initiative_id, metric_period, metric_name))
+
+@app.cli.command('backfill-metric-values')
+@click.option('--batch-size', default=500, show_default=True, help='monthly_metrics rows per transaction')
+def backfill_metric_values(batch_size):
+    """Rebuild metric_values from the additional_metrics JSON of every monthly_metrics row"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    last_id = 0
+    periods = 0
+    values = 0
+    while True:
+        cursor.execute("""
+            SELECT TOP (?) id, initiative_id, metric_period, additional_metrics
+            FROM monthly_metrics
+            WHERE id > ?
+            ORDER BY id
+        """, (batch_size, last_id))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            try:
+                metrics = json.loads(row[3]) if row[3] else {}
+            except ValueError:
+                logger.warning(f"Skipping unparseable additional_metrics on monthly_metrics {row[0]}")
+                metrics = {}
+            for metric_name, metric_data in metrics.items():
+                params.append((row[0], row[1], row[2], *metric_value_columns(metric_name, metric_data)))
+
+        ids = [row[0] for row in rows]
+        cursor.execute(f"DELETE FROM metric_values WHERE monthly_metric_id IN ({','.join(['?' for _ in ids])})", ids)
+        if params:
+            cursor.executemany("""
+                INSERT INTO metric_values (
+                    monthly_metric_id, initiative_id, metric_period,
+                    metric_name, numeric_value, raw_value, comments
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, params)
+        conn.commit()
+
+        last_id = ids[-1]
+        periods += len(rows)
+        values += len(params)
+        click.echo(f"Backfilled {periods} periods, {values} metric values")
+
+    conn.close()
+    dashboard_cache.invalidate(MONTHLY_TRENDS)
+    click.echo(f"Done: {periods} periods, {values} metric values")
+
+# ==================== Metric Aggregation ====================
+
+EXTENDED_TREND_STATS = ('min', 'max', 'median', 'p90')
+
+def aggregate_metric_values(periods, metric_names, values, extended=False):
+    """
+    Columnar grouped aggregation of metric values by (period, metric).
+
+    Args:
+        periods, metric_names, values: Parallel sequences, one entry per metric value
+        extended: Also compute min, max, median and p90 (linear interpolation,
+                  as numpy.percentile) from the same sort
+
+    Returns:
+        One dict per group with metric_period, metric_name, total and count
+        (plus the extended statistics), ordered by period then metric name
+    """
+    import numpy as np
+
+    if len(values) == 0:
+        return []
+
+    # Factorize the labels with dict lookups; sorting object arrays is far slower
+    period_index, metric_index = {}, {}
+    period_codes = np.fromiter((period_index.setdefault(period, len(period_index)) for period in periods), dtype=np.int64, count=len(values))
+    metric_codes = np.fromiter((metric_index.setdefault(name, len(metric_index)) for name in metric_names), dtype=np.int64, count=len(values))
+    values = np.asarray(values, dtype=np.float64)
+
+    metric_count = len(metric_index)
+    group_codes = period_codes * metric_count + metric_codes
+    all_counts = np.bincount(group_codes, minlength=len(period_index) * metric_count)
+    all_totals = np.bincount(group_codes, weights=values, minlength=len(all_counts))
+
+    # Keep non-empty groups, ordered by period then metric name
+    period_labels = list(period_index)
+    metric_labels = list(metric_index)
+    period_rank = np.argsort(np.argsort(np.array(period_labels, dtype=object)))
+    metric_rank = np.argsort(np.argsort(np.array(metric_labels, dtype=object)))
+    groups = np.flatnonzero(all_counts)
+    groups = groups[np.lexsort((metric_rank[groups % metric_count], period_rank[groups // metric_count]))]
+    counts = all_counts[groups]
+
+    aggregates = {
+        'metric_period': [period_labels[code] for code in (groups // metric_count).tolist()],
+        'metric_name': [metric_labels[code] for code in (groups % metric_count).tolist()],
+        'total': all_totals[groups].tolist(),
+        'count': counts.tolist()
+    }
+
+    if extended:
+        # Sort by group then value so every group is a contiguous, ordered slice
+        group_position = np.empty(len(all_counts), dtype=np.int64)
+        group_position[groups] = np.arange(len(groups))
+        order = np.lexsort((values, group_position[group_codes]))
+        sorted_values = values[order]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        def percentile(q):
+            position = starts + q * (counts - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.ceil(position).astype(np.int64)
+            return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+        aggregates['min'] = sorted_values[starts].tolist()
+        aggregates['max'] = sorted_values[starts + counts - 1].tolist()
+        aggregates['median'] = percentile(0.5).tolist()
+        aggregates['p90'] = percentile(0.9).tolist()
+
+    return [dict(zip(aggregates, group)) for group in zip(*aggregates.values())]
 
 # ==================== Health Check ====================
 
@@ -76,103 +612,220 @@ def health_check():
     except Exception as e:
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
 
+@app.route('/api/health/db-pool', methods=['GET'])
+def db_pool_stats():
+    """Connection pool statistics (checkouts, waits, connections in use, connect latency)"""
+    return jsonify(db_pool.stats())
+
+# ==================== Dashboard Cache ====================
+
+DASHBOARD_CACHE_CONFIG = {
+    'max_entries': int(os.environ.get('DASHBOARD_CACHE_MAX_ENTRIES', '256')),
+    'ttl_seconds': float(os.environ.get('DASHBOARD_CACHE_TTL_SECONDS', '300'))
+}
+
+# Cache namespaces, invalidated by the write endpoints that change their source data
+DASHBOARD_STATS = 'dashboard_stats'  # initiatives, initiative_departments
+MONTHLY_TRENDS = 'monthly_trends'  # monthly_metrics, initiatives.initiative_type/business_unit
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with a per-entry TTL and an LRU size bound.
+
+    Keys are tuples whose first element is a namespace. Each namespace carries a
+    generation number that invalidate() bumps, so a value computed from data read
+    before an invalidation is never stored after it.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _namespace_stats(self, namespace):
+        return self._stats.setdefault(namespace, {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0})
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Returns:
+            (hit, value, generation) - pass generation back to set() on a miss
+        """
+        namespace = key[0]
+        now = time.monotonic()
+        with self._lock:
+            stats = self._namespace_stats(namespace)
+            generation = self._generations.get(namespace, 0)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                stats['hits'] += 1
+                return True, entry[1], generation
+            if entry is not None:
+                del self._entries[key]
+            stats['misses'] += 1
+            return False, None, generation
+
+    def set(self, key, value, generation):
+        """Store a value unless its namespace was invalidated since the matching get()"""
+        namespace = key[0]
+        with self._lock:
+            if self._generations.get(namespace, 0) != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._namespace_stats(evicted_key[0])['evictions'] += 1
+
+    def generation(self, namespace):
+        """Current generation of a namespace, for a set() that has no matching get()"""
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def invalidate(self, *namespaces):
+        """Drop every entry in the given namespaces"""
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+                self._namespace_stats(namespace)['invalidations'] += 1
+            for key in [key for key in self._entries if key[0] in namespaces]:
+                del self._entries[key]
+
+    def stats(self):
+        """Hit/miss counters per namespace plus current size"""
+        with self._lock:
+            namespaces = {}
+            for namespace, counters in self._stats.items():
+                lookups = counters['hits'] + counters['misses']
+                namespaces[namespace] = dict(counters, hit_rate=round(counters['hits'] / lookups, 4) if lookups else 0)
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'namespaces': namespaces
+            }
+
+dashboard_cache = TTLCache(**DASHBOARD_CACHE_CONFIG)
+
+def cached_json_response(payload, hit):
+    """jsonify a cached payload and tag the response with X-Cache"""
+    response = jsonify(payload)
+    response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
+
+@app.route('/api/dashboard/cache-stats', methods=['GET'])
+def get_dashboard_cache_stats():
+    """Dashboard cache hit/miss counters"""
+    return jsonify(dashboard_cache.stats())
+
 # ==================== Dashboard Statistics ====================
 
 @app.route('/api/dashboard/stats', methods=['GET'])
 def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
+        cache_key = (DASHBOARD_STATS,)
+        hit, cached, generation = dashboard_cache.get(cache_key)
+        if hit:
+            return cached_json_response(cached, hit=True)
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Get overall statistics
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total_initiatives,
-                COUNT(CASE WHEN status = 'Ideation' THEN 1 END) as ideation_count,
-                COUNT(CASE WHEN status = 'In Progress' THEN 1 END) as in_progress_count,
-                COUNT(CASE WHEN status = 'Live (Complete)' THEN 1 END) as completed_count,
-                AVG(percentage_complete) as avg_completion,
-                COUNT(CASE WHEN MONTH(created_at) = MONTH(GETDATE()) AND YEAR(created_at) = YEAR(GETDATE()) THEN 1 END) as new_initiatives_count
-            FROM initiatives
-        """)
-        row = cursor.fetchone()
-        stats = dict_from_row(cursor, row)
-
-        # Get in-progress initiatives
-        cursor.execute("""
-            SELECT TOP 10
-                i.id,
-                i.use_case_name,
-                i.percentage_complete,
-                i.health_status,
-                i.status,
-                STRING_AGG(id_dept.department, ', ') as departments
-            FROM initiatives i
-            LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
-            WHERE i.status = 'In Progress'
-            GROUP BY i.id, i.use_case_name, i.percentage_complete, i.health_status, i.status, i.modified_at
-            ORDER BY i.modified_at DESC
-        """)
-        in_progress = [dict_from_row(cursor, row) for row in cursor.fetchall()]
+        # All six queries go to the server as one batch (one network round trip)
+        (
+            totals,
+            in_progress,
+            departments,
+            benefits,
+            business_units,
+            pinned
+        ) = fetch_result_sets(cursor, [
+            # Overall statistics
+            ("""
+                SELECT
+                    COUNT(*) as total_initiatives,
+                    COUNT(CASE WHEN status = 'Ideation' THEN 1 END) as ideation_count,
+                    COUNT(CASE WHEN status = 'In Progress' THEN 1 END) as in_progress_count,
+                    COUNT(CASE WHEN status = 'Live (Complete)' THEN 1 END) as completed_count,
+                    AVG(percentage_complete) as avg_completion,
+                    COUNT(CASE WHEN MONTH(created_at) = MONTH(GETDATE()) AND YEAR(created_at) = YEAR(GETDATE()) THEN 1 END) as new_initiatives_count
+                FROM initiatives
+            """, ()),
+            # In-progress initiatives
+            ("""
+                SELECT TOP 10
+                    i.id,
+                    i.use_case_name,
+                    i.percentage_complete,
+                    i.health_status,
+                    i.status,
+                    STRING_AGG(id_dept.department, ', ') as departments
+                FROM initiatives i
+                LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
+                WHERE i.status = 'In Progress'
+                GROUP BY i.id, i.use_case_name, i.percentage_complete, i.health_status, i.status, i.modified_at
+                ORDER BY i.modified_at DESC
+            """, ()),
+            # Initiatives by department
+            ("""
+                SELECT department, COUNT(*) as count
+                FROM initiative_departments id
+                JOIN initiatives i ON id.initiative_id = i.id
+                GROUP BY department
+                ORDER BY count DESC
+            """, ()),
+            # Initiatives by benefit
+            ("""
+                SELECT benefit, COUNT(*) as count
+                FROM initiatives
+                WHERE benefit IS NOT NULL
+                GROUP BY benefit
+                ORDER BY count DESC
+            """, ()),
+            # Initiatives by business unit
+            ("""
+                SELECT business_unit, COUNT(*) as count
+                FROM initiatives
+                WHERE business_unit IS NOT NULL
+                GROUP BY business_unit
+                ORDER BY count DESC
+            """, ()),
+            # Pinned initiatives
+            ("""
+                SELECT
+                    i.id,
+                    i.use_case_name,
+                    i.description,
+                    i.percentage_complete,
+                    i.health_status,
+                    i.status,
+                    i.initiative_type,
+                    i.pinned_at,
+                    STRING_AGG(id_dept.department, ', ') as departments
+                FROM initiatives i
+                LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
+                WHERE i.is_pinned = 1
+                GROUP BY i.id, i.use_case_name, i.description, i.percentage_complete, i.health_status, i.status, i.initiative_type, i.pinned_at
+                ORDER BY i.pinned_at DESC
+            """, ())
+        ])
+
+        stats = totals[0]
         stats['in_progress_initiatives'] = in_progress
-
-        # Get initiatives by department
-        cursor.execute("""
-            SELECT department, COUNT(*) as count
-            FROM initiative_departments id
-            JOIN initiatives i ON id.initiative_id = i.id
-            GROUP BY department
-            ORDER BY count DESC
-        """)
-        departments = [dict_from_row(cursor, row) for row in cursor.fetchall()]
         stats['by_department'] = departments
-
-        # Get initiatives by benefit
-        cursor.execute("""
-            SELECT benefit, COUNT(*) as count
-            FROM initiatives
-            WHERE benefit IS NOT NULL
-            GROUP BY benefit
-            ORDER BY count DESC
-        """)
-        benefits = [dict_from_row(cursor, row) for row in cursor.fetchall()]
         stats['by_benefit'] = benefits
-
-        # Get initiatives by business unit
-        cursor.execute("""
-            SELECT business_unit, COUNT(*) as count
-            FROM initiatives
-            WHERE business_unit IS NOT NULL
-            GROUP BY business_unit
-            ORDER BY count DESC
-        """)
-        business_units = [dict_from_row(cursor, row) for row in cursor.fetchall()]
         stats['by_business_unit'] = business_units
-
-        # Get pinned initiatives
-        cursor.execute("""
-            SELECT
-                i.id,
-                i.use_case_name,
-                i.description,
-                i.percentage_complete,
-                i.health_status,
-                i.status,
-                i.initiative_type,
-                i.pinned_at,
-                STRING_AGG(id_dept.department, ', ') as departments
-            FROM initiatives i
-            LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
-            WHERE i.is_pinned = 1
-            GROUP BY i.id, i.use_case_name, i.description, i.percentage_complete, i.health_status, i.status, i.initiative_type, i.pinned_at
-            ORDER BY i.pinned_at DESC
-        """)
-        pinned = [dict_from_row(cursor, row) for row in cursor.fetchall()]
         stats['pinned_initiatives'] = pinned
 
         conn.close()
-        return jsonify(stats)
+        dashboard_cache.set(cache_key, stats, generation)
+        return cached_json_response(stats, hit=False)
     except Exception as e:
         logger.error(f"Error fetching dashboard stats: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -183,24 +836,33 @@ def get_monthly_trends():
     try:
         import json
         from flask import request
-        conn = get_db_connection()
-        cursor = conn.cursor()
 
         # Get filter parameters
         initiative_ids = request.args.get('initiative_ids')  # Comma-separated IDs
         initiative_type = request.args.get('initiative_type')  # Single type filter
         business_unit = request.args.get('business_unit')  # Single business unit filter
+        extended = request.args.get('stats') == 'extended'  # Adds min/max/median/p90 per metric
+
+        id_list = []
+        if initiative_ids:
+            id_list = sorted({int(id.strip()) for id in initiative_ids.split(',') if id.strip()})
+
+        cache_key = (MONTHLY_TRENDS, tuple(id_list), initiative_type or None, business_unit or None, extended)
+        hit, cached, generation = dashboard_cache.get(cache_key)
+        if hit:
+            return cached_json_response(cached, hit=True)
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
 
         # Build WHERE clause based on filters
         where_clauses = []
         params = []
 
-        if initiative_ids:
-            id_list = [int(id.strip()) for id in initiative_ids.split(',') if id.strip()]
-            if id_list:
-                placeholders = ','.join(['?' for _ in id_list])
-                where_clauses.append(f"mm.initiative_id IN ({placeholders})")
-                params.extend(id_list)
+        if id_list:
+            placeholders = ','.join(['?' for _ in id_list])
+            where_clauses.append(f"mm.initiative_id IN ({placeholders})")
+            params.extend(id_list)
 
         if initiative_type:
             where_clauses.append("i.initiative_type = ?")
@@ -214,81 +876,81 @@ def get_monthly_trends():
         if where_clauses:
             where_sql = "WHERE " + " AND ".join(where_clauses)
 
-        # Get all monthly metrics with additional_metrics JSON
-        query = f"""
-            SELECT
-                mm.metric_period,
-                mm.initiative_id,
-                mm.additional_metrics
-            FROM monthly_metrics mm
-            JOIN initiatives i ON mm.initiative_id = i.id
-            {where_sql}
-            ORDER BY mm.metric_period
-        """
-
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-
-        # Aggregate metrics by period
-        period_aggregates = {}
-
-        for row in rows:
-            period = row[0]
-            initiative_id = row[1]
-            additional_metrics_json = row[2]
-
-            if period not in period_aggregates:
-                period_aggregates[period] = {
-                    'metric_period': period,
-                    'active_initiatives': set(),
-                    'metrics': {}
-                }
-
-            period_aggregates[period]['active_initiatives'].add(initiative_id)
-
-            # Parse and aggregate additional_metrics
-            if additional_metrics_json:
-                try:
-                    metrics = json.loads(additional_metrics_json)
-                    for metric_name, metric_data in metrics.items():
-                        if metric_name not in period_aggregates[period]['metrics']:
-                            period_aggregates[period]['metrics'][metric_name] = {
-                                'values': [],
-                                'total': 0,
-                                'count': 0,
-                                'avg': 0
-                            }
-
-                        try:
-                            value = float(metric_data.get('value', 0))
-                            period_aggregates[period]['metrics'][metric_name]['values'].append(value)
-                            period_aggregates[period]['metrics'][metric_name]['total'] += value
-                            period_aggregates[period]['metrics'][metric_name]['count'] += 1
-                        except (ValueError, TypeError):
-                            pass
-                except:
-                    pass
-
-        # Calculate averages and format output
-        trends = []
-        for period, data in sorted(period_aggregates.items()):
-            trend_point = {
-                'metric_period': period,
-                'active_initiatives': len(data['active_initiatives'])
+        # Active initiatives per period, and per-metric aggregates from the
+        # normalized metric_values table, in one round trip. Extended statistics
+        # need the individual values, which are reduced in NumPy instead of SQL.
+        if extended:
+            value_where_sql = "WHERE " + " AND ".join(where_clauses + ["mv.numeric_value IS NOT NULL"])
+            metric_statement = (f"""
+                SELECT
+                    mm.metric_period,
+                    mv.metric_name,
+                    mv.numeric_value
+                FROM metric_values mv
+                JOIN monthly_metrics mm ON mv.monthly_metric_id = mm.id
+                JOIN initiatives i ON mm.initiative_id = i.id
+                {value_where_sql}
+            """, params)
+        else:
+            metric_statement = (f"""
+                SELECT
+                    mm.metric_period,
+                    mv.metric_name,
+                    SUM(mv.numeric_value) as total,
+                    COUNT(mv.numeric_value) as count
+                FROM metric_values mv
+                JOIN monthly_metrics mm ON mv.monthly_metric_id = mm.id
+                JOIN initiatives i ON mm.initiative_id = i.id
+                {where_sql}
+                GROUP BY mm.metric_period, mv.metric_name
+            """, params)
+
+        active_rows, metric_rows = fetch_result_sets(cursor, [
+            (f"""
+                SELECT
+                    mm.metric_period,
+                    COUNT(DISTINCT mm.initiative_id) as active_initiatives
+                FROM monthly_metrics mm
+                JOIN initiatives i ON mm.initiative_id = i.id
+                {where_sql}
+                GROUP BY mm.metric_period
+            """, params),
+            metric_statement
+        ])
+
+        if extended:
+            metric_rows = aggregate_metric_values(
+                [row['metric_period'] for row in metric_rows],
+                [row['metric_name'] for row in metric_rows],
+                [row['numeric_value'] for row in metric_rows],
+                extended=True
+            )
+
+        trend_points = {}
+        for row in active_rows:
+            trend_points[row['metric_period']] = {
+                'metric_period': row['metric_period'],
+                'active_initiatives': row['active_initiatives']
             }
 
-            # Add aggregated metrics
-            for metric_name, metric_data in data['metrics'].items():
-                if metric_data['count'] > 0:
-                    metric_data['avg'] = metric_data['total'] / metric_data['count']
-                    trend_point[f'{metric_name}_total'] = round(metric_data['total'], 2)
-                    trend_point[f'{metric_name}_avg'] = round(metric_data['avg'], 2)
-                    trend_point[f'{metric_name}_count'] = metric_data['count']
-
-            trends.append(trend_point)
+        for row in metric_rows:
+            if not row['count']:
+                continue
+            trend_point = trend_points[row['metric_period']]
+            metric_name = row['metric_name']
+            total = row['total']
+            trend_point[f'{metric_name}_total'] = round(total, 2)
+            trend_point[f'{metric_name}_avg'] = round(total / row['count'], 2)
+            trend_point[f'{metric_name}_count'] = row['count']
+            for stat in EXTENDED_TREND_STATS:
+                if stat in row:
+                    trend_point[f'{metric_name}_{stat}'] = round(row[stat], 2)
+
+        trends = [trend_points[period] for period in sorted(trend_points)]
 
         conn.close()
-        return jsonify(trends)
+        dashboard_cache.set(cache_key, trends, generation)
+        return cached_json_response(trends, hit=False)
     except Exception as e:
         logger.error(f"Error fetching monthly trends: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -297,47 +959,40 @@ def get_monthly_trends():
 def get_period_drilldown(period):
     """Get all initiatives with metrics for a specific period"""
     try:
-        import json
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT
-                i.id,
-                i.use_case_name,
-                i.status,
-                i.health_status,
-                i.percentage_complete,
-                mm.additional_metrics,
-                STRING_AGG(id_dept.department, ', ') as departments
-            FROM initiatives i
-            INNER JOIN monthly_metrics mm ON i.id = mm.initiative_id
-            LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
-            WHERE mm.metric_period = ?
-            GROUP BY i.id, i.use_case_name, i.status, i.health_status, i.percentage_complete, mm.additional_metrics
-            ORDER BY i.use_case_name
-        """, period)
+        initiative_rows, metric_rows = fetch_result_sets(cursor, [
+            ("""
+                SELECT
+                    i.id,
+                    i.use_case_name,
+                    i.status,
+                    i.health_status,
+                    i.percentage_complete,
+                    STRING_AGG(id_dept.department, ', ') as departments
+                FROM initiatives i
+                INNER JOIN monthly_metrics mm ON i.id = mm.initiative_id
+                LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
+                WHERE mm.metric_period = ?
+                GROUP BY i.id, i.use_case_name, i.status, i.health_status, i.percentage_complete
+                ORDER BY i.use_case_name
+            """, (period,)),
+            ("""
+                SELECT initiative_id, metric_name, raw_value, comments
+                FROM metric_values
+                WHERE metric_period = ?
+            """, (period,))
+        ])
+
+        metrics_by_initiative = {}
+        for row in metric_rows:
+            metrics_by_initiative.setdefault(row['initiative_id'], {})[row['metric_name']] = metric_entry_from_row(row)
 
         initiatives = []
-        for row in cursor.fetchall():
-            initiative = {
-                'id': row[0],
-                'use_case_name': row[1],
-                'status': row[2],
-                'health_status': row[3],
-                'percentage_complete': row[4],
-                'departments': row[6],
-                'metrics': {}
-            }
-
-            # Parse additional_metrics
-            if row[5]:
-                try:
-                    initiative['metrics'] = json.loads(row[5])
-                except:
-                    initiative['metrics'] = {}
-
-            initiatives.append(initiative)
+        for row in initiative_rows:
+            row['metrics'] = metrics_by_initiative.get(row['id'], {})
+            initiatives.append(row)
 
         conn.close()
         return jsonify({'period': period, 'initiatives': initiatives})
@@ -349,73 +1004,53 @@ def get_period_drilldown(period):
 def get_metric_drilldown(metric_name):
     """Get all initiatives tracking a specific metric across all periods with percentage contribution"""
     try:
-        import json
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        # Non-numeric values count as 0 towards the period total
         cursor.execute("""
             SELECT
                 i.id,
                 i.use_case_name,
-                mm.metric_period,
-                mm.additional_metrics,
-                STRING_AGG(id_dept.department, ', ') as departments
-            FROM initiatives i
-            INNER JOIN monthly_metrics mm ON i.id = mm.initiative_id
-            LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
-            WHERE mm.additional_metrics IS NOT NULL
-            GROUP BY i.id, i.use_case_name, mm.metric_period, mm.additional_metrics
-            ORDER BY mm.metric_period, i.use_case_name
-        """)
+                mv.metric_period,
+                mv.raw_value,
+                mv.comments,
+                COALESCE(mv.numeric_value, 0) as numeric_value,
+                SUM(COALESCE(mv.numeric_value, 0)) OVER (PARTITION BY mv.metric_period) as period_total,
+                depts.departments
+            FROM metric_values mv
+            INNER JOIN initiatives i ON mv.initiative_id = i.id
+            OUTER APPLY (
+                SELECT STRING_AGG(id_dept.department, ', ') as departments
+                FROM initiative_departments id_dept
+                WHERE id_dept.initiative_id = i.id
+            ) depts
+            WHERE mv.metric_name = ?
+            ORDER BY mv.metric_period, i.use_case_name
+        """, metric_name)
 
         initiatives_by_period = {}
         period_totals = {}
 
         for row in cursor.fetchall():
-            initiative_id = row[0]
-            use_case_name = row[1]
-            period = row[2]
-            additional_metrics_json = row[3]
-            departments = row[4]
-
-            # Parse and check if this initiative has the metric
-            if additional_metrics_json:
-                try:
-                    metrics = json.loads(additional_metrics_json)
-                    if metric_name in metrics:
-                        metric_value = metrics[metric_name].get('value', 0)
-
-                        # Try to convert to float for calculation
-                        try:
-                            numeric_value = float(metric_value) if metric_value else 0
-                        except (ValueError, TypeError):
-                            numeric_value = 0
-
-                        if period not in initiatives_by_period:
-                            initiatives_by_period[period] = []
-                            period_totals[period] = 0
-
-                        period_totals[period] += numeric_value
-
-                        initiatives_by_period[period].append({
-                            'id': initiative_id,
-                            'use_case_name': use_case_name,
-                            'departments': departments,
-                            'value': metrics[metric_name].get('value'),
-                            'numeric_value': numeric_value,
-                            'comments': metrics[metric_name].get('comments')
-                        })
-                except:
-                    pass
-
-        # Calculate percentages for each initiative
-        for period, initiatives in initiatives_by_period.items():
-            total = period_totals.get(period, 0)
-            for initiative in initiatives:
-                if total > 0:
-                    initiative['percentage_contribution'] = (initiative['numeric_value'] / total) * 100
-                else:
-                    initiative['percentage_contribution'] = 0
+            row = dict_from_row(cursor, row)
+            period = row['metric_period']
+            total = row['period_total']
+            entry = metric_entry_from_row(row)
+
+            if period not in initiatives_by_period:
+                initiatives_by_period[period] = []
+                period_totals[period] = total
+
+            initiatives_by_period[period].append({
+                'id': row['id'],
+                'use_case_name': row['use_case_name'],
+                'departments': row['departments'],
+                'value': entry['value'],
+                'numeric_value': row['numeric_value'],
+                'comments': entry['comments'],
+                'percentage_contribution': (row['numeric_value'] / total) * 100 if total > 0 else 0
+            })
 
         conn.close()
         return jsonify({
@@ -427,33 +1062,21 @@ def get_metric_drilldown(metric_name):
         logger.error(f"Error fetching metric drilldown: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# Fields returned by GET /api/dashboard/category/<category>
+CATEGORY_FIELDS = [
+    'id', 'use_case_name', 'description', 'status', 'health_status', 'percentage_complete',
+    'benefit', 'strategic_objective', 'initiative_type', 'business_unit', 'created_at',
+    'initiative_image', 'departments'
+]
+
 @app.route('/api/dashboard/category/<category>', methods=['GET'])
 def get_initiatives_by_category(category):
-    """Get initiatives by category (all, completed, in_progress, new_this_month)"""
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Base query to get initiative details
-        base_query = """
-            SELECT
-                i.id,
-                i.use_case_name,
-                i.description,
-                i.status,
-                i.health_status,
-                i.percentage_complete,
-                i.benefit,
-                i.strategic_objective,
-                i.initiative_type,
-                i.business_unit,
-                i.created_at,
-                i.initiative_image,
-                STRING_AGG(id_dept.department, ', ') as departments
-            FROM initiatives i
-            LEFT JOIN initiative_departments id_dept ON i.id = id_dept.initiative_id
-        """
+    """
+    Get initiatives by category (all, completed, in_progress, new_this_month).
 
+    fields=/exclude= choose the returned fields from CATEGORY_FIELDS.
+    """
+    try:
         # Add WHERE clause based on category
         if category == 'completed':
             where_clause = "WHERE i.status = 'Live (Complete)'"
@@ -469,34 +1092,44 @@ def get_initiatives_by_category(category):
         else:
             return jsonify({'error': 'Invalid category'}), 400
 
-        query = f"""
-            {base_query}
+        try:
+            fields = resolve_fields(CATEGORY_FIELDS, CATEGORY_FIELDS, INITIATIVE_FIELD_SETS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        select_list = [initiative_select_list([field for field in fields if field != 'departments'], prefix='i.')]
+        departments_sql = ""
+        if 'departments' in fields:
+            # Aggregated per initiative so no GROUP BY over the wide columns is needed
+            select_list.append("depts.departments")
+            departments_sql = """
+                OUTER APPLY (
+                    SELECT STRING_AGG(id_dept.department, ', ') as departments
+                    FROM initiative_departments id_dept
+                    WHERE id_dept.initiative_id = i.id
+                ) depts
+            """
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT {', '.join(select_list)}
+            FROM initiatives i
+            {departments_sql}
             {where_clause}
-            GROUP BY i.id, i.use_case_name, i.description, i.status, i.health_status,
-                     i.percentage_complete, i.benefit, i.strategic_objective,
-                     i.initiative_type, i.business_unit, i.created_at, i.initiative_image
             ORDER BY i.use_case_name
-        """
-
-        cursor.execute(query)
+        """)
 
         initiatives = []
         for row in cursor.fetchall():
-            initiatives.append({
-                'id': row[0],
-                'use_case_name': row[1],
-                'description': row[2],
-                'status': row[3],
-                'health_status': row[4],
-                'percentage_complete': float(row[5]) if row[5] else 0,
-                'benefit': row[6],
-                'strategic_objective': row[7],
-                'initiative_type': row[8],
-                'business_unit': row[9],
-                'created_at': row[10].isoformat() if row[10] else None,
-                'initiative_image': row[11],
-                'departments': row[12]
-            })
+            initiative = dict_from_row(cursor, row)
+            present_initiative_image(initiative, size='sm')
+            if 'percentage_complete' in initiative:
+                initiative['percentage_complete'] = float(initiative['percentage_complete']) if initiative['percentage_complete'] else 0
+            if 'created_at' in initiative:
+                initiative['created_at'] = initiative['created_at'].isoformat() if initiative['created_at'] else None
+            initiatives.append(initiative)
 
         conn.close()
 
@@ -518,65 +1151,550 @@ def get_initiatives_by_category(category):
         logger.error(f"Error fetching initiatives by category: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# ==================== Field Projection ====================
+
+# Columns of dbo.initiatives that can be requested with fields=/exclude=
+INITIATIVE_COLUMNS = [
+    'id', 'use_case_name', 'description', 'benefit', 'strategic_objective', 'status',
+    'percentage_complete', 'process_owner', 'business_owner', 'start_date',
+    'expected_completion_date', 'actual_completion_date', 'priority', 'risk_level',
+    'technology_stack', 'team_size', 'budget_allocated', 'budget_spent', 'health_status',
+    'initiative_type', 'business_unit', 'is_pinned', 'pinned_at', 'initiative_image',
+    'is_featured', 'featured_month', 'created_at', 'created_by_name', 'created_by_email',
+    'modified_at', 'modified_by_name', 'modified_by_email', 'row_version'
+]
+
+# Named field sets usable inside fields=, e.g. fields=summary,description
+INITIATIVE_FIELD_SETS = {
+    'summary': [
+        'id', 'use_case_name', 'benefit', 'strategic_objective', 'status', 'percentage_complete',
+        'process_owner', 'business_owner', 'start_date', 'expected_completion_date', 'priority',
+        'risk_level', 'health_status', 'initiative_type', 'business_unit', 'is_pinned',
+        'is_featured', 'featured_month', 'modified_at', 'row_version', 'departments'
+    ],
+    'all': INITIATIVE_COLUMNS + ['departments']
+}
+
+def resolve_fields(allowed, default, field_sets=None):
+    """
+    Resolve the fields= and exclude= query parameters into the fields to return.
+
+    Args:
+        allowed: Every field the endpoint can return, in output order
+        default: Fields returned when fields= is not given
+        field_sets: Named groups of fields that may appear in fields=
+
+    Returns:
+        The selected fields in the order of `allowed`; 'id' is always included
+
+    Raises:
+        ValueError: If a requested field or set is unknown
+    """
+    field_sets = field_sets or {}
+
+    def parse(param):
+        return [name.strip() for name in request.args.get(param, '').split(',') if name.strip()]
+
+    requested = parse('fields')
+    if requested:
+        selected = set()
+        for name in requested:
+            if name in field_sets:
+                selected.update(field for field in field_sets[name] if field in allowed)
+            elif name in allowed:
+                selected.add(name)
+            else:
+                raise ValueError(f"Unknown field '{name}'")
+    else:
+        selected = set(default)
+
+    for name in parse('exclude'):
+        if name not in allowed:
+            raise ValueError(f"Unknown field '{name}'")
+        selected.discard(name)
+
+    selected.add('id')
+    return [field for field in allowed if field in selected]
+
+# ==================== Image Store ====================
+# Initiative images live in dbo.image_blobs, keyed by the SHA-256 of the original
+# bytes, with thumbnails precomputed at upload. initiatives.image_hash points at the
+# image; the legacy base64 initiatives.initiative_image column is only read for rows
+# not yet moved by the migrate-initiative-images command.
+
+IMAGE_MAX_BYTES = int(os.environ.get('IMAGE_MAX_BYTES', str(5 * 1024 * 1024)))
+
+# Longest edge in pixels for each precomputed thumbnail variant
+THUMBNAIL_SIZES = {
+    'sm': 160,
+    'md': 480
+}
+
+IMAGE_CONTENT_TYPES = {
+    'PNG': 'image/png',
+    'JPEG': 'image/jpeg',
+    'GIF': 'image/gif',
+    'WEBP': 'image/webp'
+}
+
+def decode_image_payload(value):
+    """Decode a base64 string or data URL (as sent by the initiative form) into bytes"""
+    if value.startswith('data:'):
+        value = value.split(',', 1)[1] if ',' in value else ''
+    try:
+        return base64.b64decode(value, validate=True)
+    except ValueError:
+        raise ValueError('initiative_image is not valid base64 image data')
+
+def build_image_variants(data):
+    """
+    Validate image bytes and render the thumbnail variants.
+
+    Returns:
+        List of (variant, content_type, bytes), starting with the original
+
+    Raises:
+        ValueError: If the data is too large or not a supported image
+    """
+    from PIL import Image
+    from io import BytesIO
+
+    if len(data) > IMAGE_MAX_BYTES:
+        raise ValueError(f'Image exceeds the {IMAGE_MAX_BYTES // (1024 * 1024)} MB limit')
+
+    try:
+        image = Image.open(BytesIO(data))
+        image.verify()
+        image = Image.open(BytesIO(data))
+        image.load()
+    except Exception:
+        raise ValueError('Unsupported or corrupt image')
+
+    if image.format not in IMAGE_CONTENT_TYPES:
+        raise ValueError(f'Unsupported image format: {image.format}')
+
+    variants = [('original', IMAGE_CONTENT_TYPES[image.format], data)]
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+    for variant, max_edge in THUMBNAIL_SIZES.items():
+        thumbnail = image.convert('RGBA' if has_alpha else 'RGB')
+        thumbnail.thumbnail((max_edge, max_edge))
+        output = BytesIO()
+        if has_alpha:
+            thumbnail.save(output, format='PNG', optimize=True)
+            variants.append((variant, 'image/png', output.getvalue()))
+        else:
+            thumbnail.save(output, format='JPEG', quality=85, optimize=True)
+            variants.append((variant, 'image/jpeg', output.getvalue()))
+
+    return variants
+
+def store_image(cursor, data):
+    """Store image bytes and their thumbnails under the content hash; returns the hash"""
+    image_hash = hashlib.sha256(data).hexdigest()
+
+    cursor.execute("SELECT 1 FROM image_blobs WHERE image_hash = ? AND variant = 'original'", image_hash)
+    if cursor.fetchone():
+        return image_hash
+
+    variants = build_image_variants(data)
+    try:
+        cursor.executemany("""
+            INSERT INTO image_blobs (image_hash, variant, content_type, byte_size, data)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(image_hash, variant, content_type, len(blob), blob) for variant, content_type, blob in variants])
+    except pyodbc.IntegrityError:
+        # Stored concurrently by another request; content addressing makes it identical
+        pass
+    return image_hash
+
+def stored_image_hash(cursor, image_hash):
+    """Return image_hash if that image has been uploaded; raises ValueError otherwise"""
+    cursor.execute("SELECT 1 FROM image_blobs WHERE image_hash = ? AND variant = 'original'", image_hash)
+    if not cursor.fetchone():
+        raise ValueError(f'No uploaded image with hash {image_hash}')
+    return image_hash
+
+def resolve_image_hash(cursor, data):
+    """
+    Work out the image_hash to save from an initiative create/update payload.
+
+    Accepts image_hash directly, or initiative_image as a base64 string/data URL
+    (stored on the fly) or an /api/images/<hash> URL previously returned by the API.
+    A hash or URL must refer to an uploaded image. Returns None when the image is
+    being removed.
+    """
+    if data.get('image_hash'):
+        image_hash = data['image_hash']
+        if not isinstance(image_hash, str) or not re.fullmatch(r'[0-9a-f]{64}', image_hash.lower()):
+            raise ValueError('Invalid image_hash')
+        return stored_image_hash(cursor, image_hash.lower())
+
+    value = data.get('initiative_image')
+    if not value:
+        return None
+    if not isinstance(value, str):
+        raise ValueError('initiative_image must be a string')
+
+    url_match = re.search(r'/api/images/([0-9a-fA-F]{64})', value)
+    if url_match and not value.startswith('data:'):
+        return stored_image_hash(cursor, url_match.group(1).lower())
+
+    return store_image(cursor, decode_image_payload(value))
+
+def image_url(image_hash, size=None):
+    """Public URL of a stored image or one of its thumbnails"""
+    base_url = os.environ.get('PUBLIC_API_URL')
+    if base_url:
+        url = f"{base_url.rstrip('/')}/api/images/{image_hash}"
+    else:
+        url = url_for('get_image', image_hash=image_hash, _external=True)
+    return f"{url}?size={size}" if size else url
+
+def initiative_select_list(columns, prefix=''):
+    """SQL select list for initiative columns; initiative_image also needs image_hash"""
+    select_list = []
+    for column in columns:
+        select_list.append(f"{prefix}{column}")
+        if column == 'initiative_image':
+            select_list.append(f"{prefix}image_hash")
+    return ', '.join(select_list)
+
+def present_initiative_image(initiative, size=None):
+    """Replace image_hash/legacy base64 with the image URL the client should load"""
+    if 'image_hash' not in initiative:
+        return
+    image_hash = initiative.pop('image_hash')
+    if image_hash:
+        initiative['initiative_image'] = image_url(image_hash, size)
+
+@app.route('/api/images', methods=['POST'])
+def upload_image():
+    """Upload an image as multipart/form-data (field 'image'); returns its hash and URLs"""
+    try:
+        upload = request.files.get('image')
+        if upload is None:
+            return jsonify({'error': "Expected a multipart file field named 'image'"}), 400
+
+        data = upload.read(IMAGE_MAX_BYTES + 1)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            image_hash = store_image(cursor, data)
+        except ValueError as e:
+            conn.close()
+            return jsonify({'error': str(e)}), 400
+
+        conn.commit()
+        conn.close()
+
+        return jsonify({
+            'image_hash': image_hash,
+            'url': image_url(image_hash),
+            'thumbnails': {size: image_url(image_hash, size) for size in THUMBNAIL_SIZES}
+        }), 201
+    except Exception as e:
+        logger.error(f"Error uploading image: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/images/<image_hash>', methods=['GET'])
+def get_image(image_hash):
+    """Serve a stored image (?size=sm|md for a thumbnail); content never changes for a hash"""
+    try:
+        variant = request.args.get('size', 'original')
+        if variant != 'original' and variant not in THUMBNAIL_SIZES:
+            return jsonify({'error': f"Invalid size. Use one of: {', '.join(THUMBNAIL_SIZES)}"}), 400
+
+        etag = f'{image_hash}-{variant}'
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT content_type, data FROM image_blobs
+                WHERE image_hash = ? AND variant = ?
+            """, (image_hash.lower(), variant))
+            row = cursor.fetchone()
+            conn.close()
+
+            if not row:
+                return jsonify({'error': 'Image not found'}), 404
+            response = app.response_class(bytes(row[1]), mimetype=row[0])
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+    except Exception as e:
+        logger.error(f"Error fetching image: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/initiatives/<int:initiative_id>/image', methods=['POST'])
+def upload_initiative_image(initiative_id):
+    """Upload and attach an initiative image as multipart/form-data (field 'image')"""
+    try:
+        upload = request.files.get('image')
+        if upload is None:
+            return jsonify({'error': "Expected a multipart file field named 'image'"}), 400
+
+        data = upload.read(IMAGE_MAX_BYTES + 1)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            image_hash = store_image(cursor, data)
+        except ValueError as e:
+            conn.close()
+            return jsonify({'error': str(e)}), 400
+
+        cursor.execute("""
+            UPDATE initiatives
+            SET image_hash = ?, initiative_image = NULL, modified_at = GETDATE()
+            WHERE id = ?
+        """, (image_hash, initiative_id))
+        if cursor.rowcount == 0:
+            conn.close()
+            return jsonify({'error': 'Initiative not found'}), 404
+
+        conn.commit()
+        conn.close()
+
+        return jsonify({
+            'image_hash': image_hash,
+            'url': image_url(image_hash),
+            'thumbnails': {size: image_url(image_hash, size) for size in THUMBNAIL_SIZES}
+        }), 201
+    except Exception as e:
+        logger.error(f"Error uploading initiative image: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.cli.command('migrate-initiative-images')
+@click.option('--batch-size', default=20, show_default=True, help='Initiatives per transaction')
+def migrate_initiative_images(batch_size):
+    """Move base64 initiatives.initiative_image values into the image store"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    migrated = 0
+    failed_ids = set()
+    while True:
+        exclude_sql = f"AND id NOT IN ({','.join(str(i) for i in failed_ids)})" if failed_ids else ""
+        cursor.execute(f"""
+            SELECT TOP (?) id, initiative_image FROM initiatives
+            WHERE initiative_image IS NOT NULL AND image_hash IS NULL {exclude_sql}
+            ORDER BY id
+        """, batch_size)
+        rows = cursor.fetchall()
+        if not rows:
+            break
+
+        for initiative_id, value in rows:
+            try:
+                image_hash = store_image(cursor, decode_image_payload(value.strip()))
+            except ValueError as e:
+                logger.warning(f"Leaving image of initiative {initiative_id} in place: {str(e)}")
+                failed_ids.add(initiative_id)
+                continue
+            cursor.execute("""
+                UPDATE initiatives SET image_hash = ?, initiative_image = NULL
+                WHERE id = ?
+            """, (image_hash, initiative_id))
+            migrated += 1
+
+        conn.commit()
+        click.echo(f"Migrated {migrated} images")
+
+    conn.close()
+    click.echo(f"Done: {migrated} migrated, {len(failed_ids)} left in place")
+
 # ==================== Initiatives CRUD ====================
 
+# Sortable columns for GET /api/initiatives and how their keyset values are compared
+INITIATIVE_SORT_COLUMNS = {
+    'modified_at': 'datetime',
+    'created_at': 'datetime',
+    'use_case_name': 'text',
+    'id': 'int'
+}
+
+# Equality filters accepted by GET /api/initiatives
+INITIATIVE_FILTERS = ['status', 'business_unit', 'initiative_type', 'health_status', 'priority']
+
+INITIATIVES_DEFAULT_PAGE_SIZE = 50
+INITIATIVES_MAX_PAGE_SIZE = 200
+
+def encode_page_cursor(sort, order, last_row):
+    """Build the opaque cursor pointing just past last_row"""
+    value = last_row[sort]
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({'s': sort, 'o': order, 'v': value, 'id': last_row['id']})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_page_cursor(cursor_token, sort, order):
+    """Parse a cursor from encode_page_cursor; raises ValueError if it is invalid for this sort"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor_token.encode('ascii')))
+        value, last_id = payload['v'], int(payload['id'])
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if payload.get('s') != sort or payload.get('o') != order:
+        raise ValueError('Cursor does not match the requested sort')
+    if INITIATIVE_SORT_COLUMNS[sort] == 'datetime' and value is not None:
+        value = datetime.fromisoformat(value)
+    return value, last_id
+
 @app.route('/api/initiatives', methods=['GET'])
 def get_initiatives():
-    """Get all initiatives with optional filtering"""
+    """
+    Get initiatives with optional filtering.
+
+    Filters: status, department, business_unit, initiative_type, health_status, priority.
+
+    fields=/exclude= choose the returned columns (see INITIATIVE_FIELD_SETS).
+    Paginated requests default to the 'summary' set, the legacy array to every column.
+
+    Without page_size or cursor the full list is returned as a JSON array (legacy
+    behaviour). With either, results are keyset-paginated on (sort, id) and returned
+    as {'items', 'next_cursor', 'page_size', 'sort', 'order'}; pass next_cursor back
+    as cursor to get the following page.
+    """
     try:
-        status = request.args.get('status')
         department = request.args.get('department')
+        sort = request.args.get('sort', 'modified_at')
+        order = request.args.get('order', 'asc' if sort == 'use_case_name' else 'desc').lower()
+        cursor_token = request.args.get('cursor')
+        paginated = 'page_size' in request.args or cursor_token is not None
+
+        if sort not in INITIATIVE_SORT_COLUMNS:
+            return jsonify({'error': f"Invalid sort. Use one of: {', '.join(INITIATIVE_SORT_COLUMNS)}"}), 400
+        if order not in ('asc', 'desc'):
+            return jsonify({'error': "Invalid order. Use 'asc' or 'desc'"}), 400
+
+        page_size = None
+        if paginated:
+            try:
+                page_size = int(request.args.get('page_size', INITIATIVES_DEFAULT_PAGE_SIZE))
+            except ValueError:
+                return jsonify({'error': 'page_size must be an integer'}), 400
+            page_size = max(1, min(page_size, INITIATIVES_MAX_PAGE_SIZE))
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        try:
+            fields = resolve_fields(INITIATIVE_FIELD_SETS['all'],
+                                    INITIATIVE_FIELD_SETS['summary' if paginated else 'all'],
+                                    INITIATIVE_FIELD_SETS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # The sort column is needed for the next cursor even if not requested
+        columns = [field for field in fields if field in INITIATIVE_COLUMNS]
+        select_columns = columns + ([sort] if paginated and sort not in columns else [])
 
-        query = "SELECT * FROM initiatives WHERE 1=1"
+        where_clauses = []
         params = []
 
-        if status:
-            query += " AND status = ?"
-            params.append(status)
+        for field in INITIATIVE_FILTERS:
+            value = request.args.get(field)
+            if value:
+                where_clauses.append(f"{field} = ?")
+                params.append(value)
 
         if department:
-            query += " AND id IN (SELECT initiative_id FROM initiative_departments WHERE department = ?)"
+            where_clauses.append("id IN (SELECT initiative_id FROM initiative_departments WHERE department = ?)")
             params.append(department)
 
-        query += " ORDER BY modified_at DESC"
+        # Keyset predicate: rows strictly after the cursor row in (sort, id) order.
+        # Datetime values are cast back to DATETIME so the comparison uses the
+        # column's own precision. The sort columns are nullable and SQL Server sorts
+        # NULL lowest (first ascending, last descending); comparisons never match
+        # NULL, so NULL rows and NULL cursor values get explicit IS NULL branches.
+        if cursor_token:
+            try:
+                last_value, last_id = decode_page_cursor(cursor_token, sort, order)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            comparison = '<' if order == 'desc' else '>'
+            if sort == 'id':
+                where_clauses.append(f"id {comparison} ?")
+                params.append(last_id)
+            else:
+                placeholder = 'CAST(? AS DATETIME)' if INITIATIVE_SORT_COLUMNS[sort] == 'datetime' else '?'
+                if last_value is None:
+                    tie = f"({sort} IS NULL AND id {comparison} ?)"
+                    where_clauses.append(f"({tie} OR {sort} IS NOT NULL)" if order == 'asc' else tie)
+                    params.append(last_id)
+                else:
+                    after = f"{sort} {comparison} {placeholder} OR ({sort} = {placeholder} AND id {comparison} ?)"
+                    where_clauses.append(f"({after} OR {sort} IS NULL)" if order == 'desc' else f"({after})")
+                    params.extend([last_value, last_value, last_id])
+
+        where_sql = ("WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
+        order_sql = f"{sort} {order.upper()}" if sort == 'id' else f"{sort} {order.upper()}, id {order.upper()}"
+        top_sql = f"TOP ({page_size + 1})" if paginated else ""
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
 
-        cursor.execute(query, params)
+        cursor.execute(f"SELECT {top_sql} {initiative_select_list(select_columns)} FROM initiatives {where_sql} ORDER BY {order_sql}", params)
         initiatives = [dict_from_row(cursor, row) for row in cursor.fetchall()]
 
-        # Get departments for each initiative and trim string fields
+        # Build the cursor from the untrimmed database value of the last row
+        next_cursor = None
+        if paginated and len(initiatives) > page_size:
+            initiatives = initiatives[:page_size]
+            next_cursor = encode_page_cursor(sort, order, initiatives[-1])
+
+        if sort not in columns:
+            for initiative in initiatives:
+                initiative.pop(sort, None)
+
+        # Get departments for all initiatives in one query
+        if 'departments' in fields:
+            departments = load_related(cursor, 'initiative_departments', 'initiative_id', 'department',
+                                       [initiative['id'] for initiative in initiatives])
+
+        # Trim string fields
         string_fields = ['use_case_name', 'description', 'benefit', 'strategic_objective', 'status',
                         'process_owner', 'business_owner', 'priority', 'risk_level', 'technology_stack',
                         'health_status', 'initiative_type', 'business_unit']
         for initiative in initiatives:
-            # Trim string fields
+            present_initiative_image(initiative, size='sm')
             for field in string_fields:
                 if initiative.get(field) and isinstance(initiative[field], str):
-                    initiative[field] = initiative[field].strip()
-
-            # Get departments
-            cursor.execute("""
-                SELECT department FROM initiative_departments
-                WHERE initiative_id = ?
-            """, initiative['id'])
-            initiative['departments'] = [row[0] for row in cursor.fetchall()]
+                    initiative[field] = initiative[field].strip()
+
+            if 'departments' in fields:
+                initiative['departments'] = departments[initiative['id']]
 
         conn.close()
-        return jsonify(initiatives)
+
+        if not paginated:
+            return jsonify(initiatives)
+
+        return jsonify({
+            'items': initiatives,
+            'next_cursor': next_cursor,
+            'page_size': page_size,
+            'sort': sort,
+            'order': order
+        })
     except Exception as e:
         logger.error(f"Error fetching initiatives: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/initiatives/<int:initiative_id>', methods=['GET'])
 def get_initiative(initiative_id):
-    """Get a specific initiative by ID"""
+    """Get a specific initiative by ID (fields=/exclude= choose the returned columns)"""
     try:
+        try:
+            fields = resolve_fields(INITIATIVE_FIELD_SETS['all'], INITIATIVE_FIELD_SETS['all'], INITIATIVE_FIELD_SETS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        columns = [field for field in fields if field in INITIATIVE_COLUMNS]
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM initiatives WHERE id = ?", initiative_id)
+        cursor.execute(f"SELECT {initiative_select_list(columns)} FROM initiatives WHERE id = ?", initiative_id)
         row = cursor.fetchone()
 
         if not row:
@@ -584,6 +1702,7 @@ def get_initiative(initiative_id):
             return jsonify({'error': 'Initiative not found'}), 404
 
         initiative = dict_from_row(cursor, row)
+        present_initiative_image(initiative)
 
         # Trim string fields to remove any whitespace
         string_fields = ['use_case_name', 'description', 'benefit', 'strategic_objective', 'status',
@@ -604,14 +1723,18 @@ def get_initiative(initiative_id):
         logger.info(f"Fetching initiative {initiative_id} - returning date values: start_date={initiative.get('start_date')}, expected_completion_date={initiative.get('expected_completion_date')}")
 
         # Get departments
-        cursor.execute("""
-            SELECT department FROM initiative_departments
-            WHERE initiative_id = ?
-        """, initiative_id)
-        initiative['departments'] = [row[0] for row in cursor.fetchall()]
+        if 'departments' in fields:
+            cursor.execute("""
+                SELECT department FROM initiative_departments
+                WHERE initiative_id = ?
+            """, initiative_id)
+            initiative['departments'] = [row[0] for row in cursor.fetchall()]
 
         conn.close()
-        return jsonify(initiative)
+        response = jsonify(initiative)
+        if initiative.get('row_version'):
+            response.set_etag(initiative['row_version'])
+        return response
     except Exception as e:
         logger.error(f"Error fetching initiative: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -624,6 +1747,12 @@ def create_initiative():
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        try:
+            image_hash = resolve_image_hash(cursor, data)
+        except ValueError as e:
+            conn.close()
+            return jsonify({'error': str(e)}), 400
+
         # Insert initiative
         cursor.execute("""
             INSERT INTO initiatives (
@@ -631,9 +1760,11 @@ def create_initiative():
                 percentage_complete, process_owner, business_owner, start_date,
                 expected_completion_date, priority, risk_level, technology_stack,
                 team_size, budget_allocated, health_status, initiative_type, business_unit,
-                initiative_image, created_by_name, created_by_email,
+                image_hash, created_by_name, created_by_email,
                 modified_by_name, modified_by_email
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            )
+            OUTPUT INSERTED.id
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             data.get('use_case_name'),
             data.get('description'),
@@ -653,27 +1784,26 @@ def create_initiative():
             data.get('health_status', 'Green'),
             data.get('initiative_type', 'Internal AI'),
             data.get('business_unit'),
-            data.get('initiative_image'),
+            image_hash,
             data.get('created_by_name', DEFAULT_USER['name']),
             data.get('created_by_email', DEFAULT_USER['email']),
             data.get('modified_by_name', DEFAULT_USER['name']),
             data.get('modified_by_email', DEFAULT_USER['email'])
         ))
 
-        # Get the inserted ID
-        cursor.execute("SELECT @@IDENTITY")
         initiative_id = cursor.fetchone()[0]
 
         # Insert departments
         departments = data.get('departments', [])
-        for dept in departments:
-            cursor.execute("""
+        if departments:
+            cursor.executemany("""
                 INSERT INTO initiative_departments (initiative_id, department)
                 VALUES (?, ?)
-            """, (initiative_id, dept))
+            """, [(initiative_id, dept) for dept in departments])
 
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(DASHBOARD_STATS)
 
         return jsonify({'id': initiative_id, 'message': 'Initiative created successfully'}), 201
     except Exception as e:
@@ -688,6 +1818,12 @@ def update_initiative(initiative_id):
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        try:
+            image_hash = resolve_image_hash(cursor, data)
+        except ValueError as e:
+            conn.close()
+            return jsonify({'error': str(e)}), 400
+
         # Helper function to process string fields - only strip if not empty
         def process_string(value):
             if value is None or value == '':
@@ -728,7 +1864,8 @@ def update_initiative(initiative_id):
                 health_status = ?,
                 initiative_type = ?,
                 business_unit = ?,
-                initiative_image = ?,
+                initiative_image = NULL,
+                image_hash = ?,
                 is_featured = ?,
                 featured_month = ?,
                 modified_at = GETDATE(),
@@ -756,7 +1893,7 @@ def update_initiative(initiative_id):
             process_string(data.get('health_status')),
             process_string(data.get('initiative_type')),
             process_string(data.get('business_unit')),
-            data.get('initiative_image'),
+            image_hash,
             1 if data.get('is_featured') else 0,
             featured_month_value,
             data.get('modified_by_name', DEFAULT_USER['name']),
@@ -776,6 +1913,7 @@ def update_initiative(initiative_id):
 
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(DASHBOARD_STATS, MONTHLY_TRENDS)
 
         logger.info(f"Successfully updated initiative {initiative_id}")
         return jsonify({'message': 'Initiative updated successfully'})
@@ -783,6 +1921,160 @@ def update_initiative(initiative_id):
         logger.error(f"Error updating initiative: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# PATCH writes only the columns present in the body, and diffs departments
+# against what is stored instead of replacing them all. Every PATCH must carry
+# the row_version the client last read (If-Match header or "row_version" in the
+# body); the UPDATE only matches while that is still current, so concurrent
+# small edits cannot silently overwrite each other.
+
+# Columns PATCH may set; images go through image_hash/initiative_image and
+# departments through the set difference below
+INITIATIVE_PATCH_COLUMNS = [
+    column for column in INITIATIVE_COLUMNS
+    if column not in ('id', 'is_pinned', 'pinned_at', 'initiative_image', 'created_at', 'created_by_name',
+                      'created_by_email', 'modified_at', 'modified_by_name', 'modified_by_email', 'row_version')
+]
+INITIATIVE_DATE_COLUMNS = {'start_date', 'expected_completion_date', 'actual_completion_date', 'featured_month'}
+
+def normalize_initiative_value(column, value):
+    """Normalize one submitted initiative value the way update_initiative does"""
+    if column == 'is_featured':
+        return 1 if value else 0
+    if column in INITIATIVE_DATE_COLUMNS:
+        return convert_to_date(value)
+    if value == '':
+        return None
+    return value.strip() if isinstance(value, str) else value
+
+def parse_row_version(value):
+    """8-byte rowversion from a hex string or (quoted, possibly weak) ETag, or None"""
+    # A JSON body can carry any type; only strings can hold a rowversion
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    value = value.strip('"')
+    if not re.fullmatch(r'(0x)?[0-9a-fA-F]{16}', value):
+        return None
+    return bytes.fromhex(value[-16:])
+
+@app.route('/api/initiatives/<int:initiative_id>', methods=['PATCH'])
+def patch_initiative(initiative_id):
+    """
+    Update only the supplied fields of an initiative.
+
+    Requires the current row_version as an If-Match header or a "row_version"
+    body field (428 if missing, 412 with the current row_version if stale).
+    "departments", when given, is the full desired list; only the difference
+    from what is stored is written.
+    """
+    try:
+        data = request.json or {}
+        row_version = parse_row_version(request.headers.get('If-Match') or data.get('row_version'))
+        if row_version is None:
+            return jsonify({'error': 'Send the current row_version as an If-Match header or in the body'}), 428
+
+        audit = {'modified_by_name', 'modified_by_email', 'row_version'}
+        unknown = [key for key in data if key not in INITIATIVE_PATCH_COLUMNS and key not in audit
+                   and key not in ('departments', 'image_hash', 'initiative_image')]
+        if unknown:
+            return jsonify({'error': f"Fields cannot be patched: {', '.join(sorted(unknown))}"}), 400
+        departments = data.get('departments')
+        if departments is not None and not isinstance(departments, list):
+            return jsonify({'error': 'departments must be a list'}), 400
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        assignments = []
+        params = []
+        for column in INITIATIVE_PATCH_COLUMNS:
+            if column in data:
+                assignments.append(f'{column} = ?')
+                params.append(normalize_initiative_value(column, data[column]))
+        if 'image_hash' in data or 'initiative_image' in data:
+            try:
+                image_hash = resolve_image_hash(cursor, data)
+            except ValueError as e:
+                conn.close()
+                return jsonify({'error': str(e)}), 400
+            assignments += ['image_hash = ?', 'initiative_image = NULL']
+            params.append(image_hash)
+        updated_columns = [assignment.split(' = ')[0] for assignment in assignments if assignment != 'initiative_image = NULL']
+
+        # modified_* are always written, which also moves row_version for department-only patches
+        cursor.execute(f"""
+            UPDATE initiatives SET
+                {''.join(f'{assignment}, ' for assignment in assignments)}modified_at = GETDATE(),
+                modified_by_name = ?,
+                modified_by_email = ?
+            OUTPUT INSERTED.row_version
+            WHERE id = ? AND row_version = ?
+        """, (
+            *params,
+            data.get('modified_by_name', DEFAULT_USER['name']),
+            data.get('modified_by_email', DEFAULT_USER['email']),
+            initiative_id,
+            row_version
+        ))
+        row = cursor.fetchone()
+
+        if row is None:
+            cursor.execute("SELECT row_version FROM initiatives WHERE id = ?", initiative_id)
+            current = cursor.fetchone()
+            conn.close()
+            if current is None:
+                return jsonify({'error': 'Initiative not found'}), 404
+            return jsonify({
+                'error': 'Initiative was changed by someone else; reload it and retry',
+                'row_version': bytes(current[0]).hex()
+            }), 412
+        new_row_version = bytes(row[0]).hex()
+
+        added = removed = 0
+        if departments is not None:
+            wanted = json.dumps(list(dict.fromkeys(department for department in departments if department)))
+            cursor.execute("""
+                SET NOCOUNT ON;
+                DECLARE @removed INT, @added INT;
+
+                DELETE FROM initiative_departments
+                WHERE initiative_id = ? AND department NOT IN (SELECT value FROM OPENJSON(?));
+                SET @removed = @@ROWCOUNT;
+
+                INSERT INTO initiative_departments (initiative_id, department)
+                SELECT ?, wanted.value
+                FROM OPENJSON(?) wanted
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM initiative_departments d
+                    WHERE d.initiative_id = ? AND d.department = wanted.value
+                );
+                SET @added = @@ROWCOUNT;
+
+                SELECT @added, @removed;
+            """, (initiative_id, wanted, initiative_id, wanted, initiative_id))
+            added, removed = cursor.fetchone()
+
+        conn.commit()
+        conn.close()
+        if {'initiative_type', 'business_unit'} & set(updated_columns):
+            dashboard_cache.invalidate(DASHBOARD_STATS, MONTHLY_TRENDS)
+        else:
+            dashboard_cache.invalidate(DASHBOARD_STATS)
+
+        response = jsonify({
+            'message': 'Initiative updated successfully',
+            'row_version': new_row_version,
+            'updated_columns': updated_columns,
+            'departments': {'added': added, 'removed': removed}
+        })
+        response.set_etag(new_row_version)
+        return response
+    except Exception as e:
+        logger.error(f"Error patching initiative: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/initiatives/<int:initiative_id>', methods=['DELETE'])
 def delete_initiative(initiative_id):
     """Delete an initiative"""
@@ -794,6 +2086,7 @@ def delete_initiative(initiative_id):
 
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(DASHBOARD_STATS, MONTHLY_TRENDS)
 
         return jsonify({'message': 'Initiative deleted successfully'})
     except Exception as e:
@@ -815,6 +2108,7 @@ def pin_initiative(initiative_id):
 
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(DASHBOARD_STATS)
 
         return jsonify({'message': 'Initiative pinned successfully'})
     except Exception as e:
@@ -836,326 +2130,1055 @@ def unpin_initiative(initiative_id):
 
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(DASHBOARD_STATS)
 
         return jsonify({'message': 'Initiative unpinned successfully'})
     except Exception as e:
         logger.error(f"Error unpinning initiative: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/initiatives/export', methods=['GET'])
-def export_initiatives_to_excel():
-    """Export all initiatives and related data to Excel with multiple sheets"""
+# ==================== Batch Initiatives ====================
+# POST /api/initiatives/batch creates (and, for items carrying an id, replaces)
+# many initiatives at once. Each chunk of INITIATIVE_BATCH_SIZE items is staged
+# into temp tables with fast_executemany and applied with a few set-based
+# statements in its own transaction; new ids come back through OUTPUT INSERTED.id
+# keyed by the item's position, so they can be mapped to the client's keys.
+
+INITIATIVE_BATCH_SIZE = int(os.environ.get('INITIATIVE_BATCH_SIZE', '500'))  # items per transaction
+INITIATIVE_BATCH_MAX_ITEMS = int(os.environ.get('INITIATIVE_BATCH_MAX_ITEMS', '5000'))
+
+# Columns written for every item, in staging order; created_by_* only apply to inserts
+INITIATIVE_BATCH_COLUMNS = [
+    'use_case_name', 'description', 'benefit', 'strategic_objective', 'status',
+    'percentage_complete', 'process_owner', 'business_owner', 'start_date',
+    'expected_completion_date', 'actual_completion_date', 'priority', 'risk_level',
+    'technology_stack', 'team_size', 'budget_allocated', 'budget_spent', 'health_status',
+    'initiative_type', 'business_unit', 'image_hash', 'is_featured', 'featured_month',
+    'created_by_name', 'created_by_email', 'modified_by_name', 'modified_by_email'
+]
+INITIATIVE_BATCH_DEFAULTS = {'status': 'Ideation', 'percentage_complete': 0, 'health_status': 'Green', 'initiative_type': 'Internal AI'}
+
+def initiative_batch_values(data, image_hash, creating):
+    """Staging row for one batch item, normalized the way the single-item endpoints do"""
+    values = []
+    for column in INITIATIVE_BATCH_COLUMNS:
+        if column == 'image_hash':
+            value = image_hash
+        elif column.endswith(('_by_name', '_by_email')):
+            value = data.get(column) or DEFAULT_USER[column.rsplit('_', 1)[1]]
+        else:
+            value = normalize_initiative_value(column, data.get(column))
+        if value is None and creating:
+            value = INITIATIVE_BATCH_DEFAULTS.get(column)
+        values.append(value)
+    return tuple(values)
+
+def validate_initiative_batch(cursor, items):
+    """
+    Validate a batch payload and store its images.
+
+    Images are decoded and stored here rather than in the chunk transactions so a
+    bad image is reported against its item. Returns (errors, image_hashes): the
+    per-item errors (client_key, index, error) and the image_hash for each index.
+    """
+    errors = []
+    image_hashes = {}
+    seen = set()
+    update_ids = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'error': 'Each item must be an object'})
+            continue
+        key = str(item.get('client_key', index))
+        if key in seen:
+            errors.append({'index': index, 'client_key': key, 'error': 'Duplicate client_key'})
+        seen.add(key)
+        if item.get('id') is not None:
+            if not isinstance(item['id'], int) or isinstance(item['id'], bool):
+                errors.append({'index': index, 'client_key': key, 'error': 'id must be an integer'})
+            else:
+                update_ids.setdefault(item['id'], []).append((index, key))
+        if not str(item.get('use_case_name') or '').strip():
+            errors.append({'index': index, 'client_key': key, 'error': 'use_case_name is required'})
+        if not isinstance(item.get('departments', []), list):
+            errors.append({'index': index, 'client_key': key, 'error': 'departments must be a list'})
+        try:
+            image_hashes[index] = resolve_image_hash(cursor, item)
+        except ValueError as e:
+            errors.append({'index': index, 'client_key': key, 'error': str(e)})
+
+    for initiative_id, positions in update_ids.items():
+        for index, key in positions[1:]:
+            errors.append({'index': index, 'client_key': key, 'error': f'Initiative {initiative_id} appears more than once'})
+    if update_ids:
+        cursor.execute("SELECT id FROM initiatives WHERE id IN (SELECT CAST(value AS INT) FROM OPENJSON(?))",
+                       json.dumps(list(update_ids)))
+        existing = {row[0] for row in cursor.fetchall()}
+        for initiative_id in update_ids.keys() - existing:
+            for index, key in update_ids[initiative_id]:
+                errors.append({'index': index, 'client_key': key, 'error': f'Initiative {initiative_id} not found'})
+    return sorted(errors, key=lambda entry: entry['index']), image_hashes
+
+def write_initiative_batch(cursor, items, image_hashes):
+    """
+    Create or replace one chunk of initiatives in the caller's transaction.
+
+    items is a list of (position, item) pairs and image_hashes the hashes from
+    validate_initiative_batch, by position; returns {position: id}. The staging
+    tables are built with SELECT TOP 0 ... INTO so their column types always match
+    initiatives.
+    """
+    columns = ', '.join(INITIATIVE_BATCH_COLUMNS)
+    cursor.execute(f"""
+        IF OBJECT_ID('tempdb..#initiative_batch') IS NOT NULL DROP TABLE #initiative_batch;
+        IF OBJECT_ID('tempdb..#initiative_batch_departments') IS NOT NULL DROP TABLE #initiative_batch_departments;
+        IF OBJECT_ID('tempdb..#initiative_batch_ids') IS NOT NULL DROP TABLE #initiative_batch_ids;
+        SELECT TOP 0 CAST(0 AS INT) AS position, CAST(NULL AS INT) AS target_id, {columns}
+        INTO #initiative_batch FROM initiatives;
+        SELECT TOP 0 CAST(0 AS INT) AS position, department
+        INTO #initiative_batch_departments FROM initiative_departments;
+        CREATE TABLE #initiative_batch_ids (position INT PRIMARY KEY, id INT NOT NULL);
+    """)
+
+    rows = []
+    departments = []
+    for position, item in items:
+        rows.append((position, item.get('id'), *initiative_batch_values(item, image_hashes[position], item.get('id') is None)))
+        departments.extend((position, department) for department in dict.fromkeys(item.get('departments') or []) if department)
+
+    cursor.fast_executemany = True
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
-        import json
-        from io import BytesIO
+        cursor.executemany(f"""
+            INSERT INTO #initiative_batch (position, target_id, {columns})
+            VALUES ({', '.join('?' * (len(INITIATIVE_BATCH_COLUMNS) + 2))})
+        """, rows)
+        if departments:
+            cursor.executemany("INSERT INTO #initiative_batch_departments (position, department) VALUES (?, ?)", departments)
+    finally:
+        # The cursor is reused for the next chunk after a failed one is rolled back
+        cursor.fast_executemany = False
+
+    update_columns = [column for column in INITIATIVE_BATCH_COLUMNS if not column.startswith('created_by_')]
+    cursor.execute(f"""
+        SET NOCOUNT ON;
+
+        -- MERGE rather than INSERT so OUTPUT can return source.position next to the new id
+        MERGE initiatives AS target
+        USING (SELECT * FROM #initiative_batch WHERE target_id IS NULL) AS source ON 1 = 0
+        WHEN NOT MATCHED THEN INSERT ({columns})
+            VALUES ({', '.join(f'source.{column}' for column in INITIATIVE_BATCH_COLUMNS)})
+        OUTPUT source.position, INSERTED.id INTO #initiative_batch_ids (position, id);
+
+        UPDATE i SET
+            {', '.join(f'{column} = s.{column}' for column in update_columns)},
+            initiative_image = NULL,
+            modified_at = GETDATE()
+        FROM initiatives i
+        JOIN #initiative_batch s ON s.target_id = i.id;
+
+        INSERT INTO #initiative_batch_ids (position, id)
+        SELECT position, target_id FROM #initiative_batch WHERE target_id IS NOT NULL;
+
+        DELETE FROM initiative_departments
+        WHERE initiative_id IN (SELECT target_id FROM #initiative_batch WHERE target_id IS NOT NULL);
+
+        INSERT INTO initiative_departments (initiative_id, department)
+        SELECT ids.id, d.department
+        FROM #initiative_batch_departments d
+        JOIN #initiative_batch_ids ids ON ids.position = d.position;
+
+        SELECT position, id FROM #initiative_batch_ids;
+
+        DROP TABLE #initiative_batch;
+        DROP TABLE #initiative_batch_departments;
+        DROP TABLE #initiative_batch_ids;
+    """)
+    return {position: initiative_id for position, initiative_id in cursor.fetchall()}
+
+@app.route('/api/initiatives/batch', methods=['POST'])
+def batch_initiatives():
+    """
+    Create or replace many initiatives in one request.
+
+    Body: {"initiatives": [{"client_key": "...", "use_case_name": ..., "departments": [...]}, ...]}
+    Items with an "id" replace that initiative like PUT does; the rest are created.
+    Returns the id for every client_key (defaulting to the item's index). Each chunk
+    of INITIATIVE_BATCH_SIZE items commits on its own, so a failed chunk is reported
+    without undoing the chunks before it.
+    """
+    try:
+        data = request.json or {}
+        items = data.get('initiatives')
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': "Expected a non-empty 'initiatives' list"}), 400
+        if len(items) > INITIATIVE_BATCH_MAX_ITEMS:
+            return jsonify({'error': f'At most {INITIATIVE_BATCH_MAX_ITEMS} initiatives per request'}), 400
 
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Create workbook
-        wb = Workbook()
-        wb.remove(wb.active)  # Remove default sheet
-
-        # Define styles
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        errors, image_hashes = validate_initiative_batch(cursor, items)
+        if errors:
+            conn.close()
+            return jsonify({'error': f'{len(errors)} invalid item(s); nothing was saved', 'errors': errors}), 400
+        # Commit the stored images so rolling back a failed chunk can't remove one a later chunk uses
+        conn.commit()
 
-        # ========== SHEET 1: Initiatives ==========
-        ws_initiatives = wb.create_sheet("Initiatives")
-
-        # Headers for initiatives
-        initiative_headers = [
-            'ID', 'Use Case Name', 'Description', 'Benefit', 'Strategic Objective',
-            'Status', 'Percentage Complete', 'Process Owner', 'Business Owner',
-            'Start Date', 'Expected Completion', 'Actual Completion', 'Priority',
-            'Risk Level', 'Technology Stack', 'Team Size', 'Budget Allocated',
-            'Budget Spent', 'Health Status', 'Initiative Type', 'Business Unit',
-            'Is Pinned', 'Is Featured', 'Featured Month', 'Created At',
-            'Created By Name', 'Created By Email', 'Modified At',
-            'Modified By Name', 'Modified By Email'
-        ]
-
-        ws_initiatives.append(initiative_headers)
-
-        # Style headers
-        for cell in ws_initiatives[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+        keys = [str(item.get('client_key', index)) for index, item in enumerate(items)]
+        results = []
+        failed = []
+        for start in range(0, len(items), INITIATIVE_BATCH_SIZE):
+            chunk = list(enumerate(items[start:start + INITIATIVE_BATCH_SIZE], start=start))
+            try:
+                ids = write_initiative_batch(cursor, chunk, image_hashes)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error saving initiative batch items {start}-{start + len(chunk) - 1}: {str(e)}")
+                failed.append({'client_keys': [keys[position] for position, _ in chunk], 'error': str(e)})
+                continue
+            results.extend({
+                'client_key': keys[position],
+                'id': ids[position],
+                'action': 'created' if item.get('id') is None else 'updated'
+            } for position, item in chunk)
 
-        # Fetch initiatives
-        cursor.execute("SELECT * FROM initiatives ORDER BY use_case_name")
-        initiatives = cursor.fetchall()
-
-        for row in initiatives:
-            ws_initiatives.append([
-                row[0],  # id
-                row[1],  # use_case_name
-                row[2],  # description
-                row[3],  # benefit
-                row[4],  # strategic_objective
-                row[5],  # status
-                float(row[6]) if row[6] else 0,  # percentage_complete
-                row[7],  # process_owner
-                row[8],  # business_owner
-                row[9].strftime('%Y-%m-%d') if row[9] else '',  # start_date
-                row[10].strftime('%Y-%m-%d') if row[10] else '',  # expected_completion_date
-                row[11].strftime('%Y-%m-%d') if row[11] else '',  # actual_completion_date
-                row[12],  # priority
-                row[13],  # risk_level
-                row[14],  # technology_stack
-                row[15],  # team_size
-                float(row[16]) if row[16] else 0,  # budget_allocated
-                float(row[17]) if row[17] else 0,  # budget_spent
-                row[18],  # health_status
-                row[19],  # initiative_type
-                row[20],  # business_unit
-                'Yes' if row[21] else 'No',  # is_pinned
-                'Yes' if row[25] else 'No',  # is_featured
-                row[26],  # featured_month
-                row[22].strftime('%Y-%m-%d %H:%M:%S') if row[22] else '',  # created_at
-                row[23],  # created_by_name
-                row[24],  # created_by_email
-                row[27].strftime('%Y-%m-%d %H:%M:%S') if row[27] else '',  # modified_at
-                row[28],  # modified_by_name
-                row[29],  # modified_by_email
-            ])
-
-        # Auto-size columns
-        for column in ws_initiatives.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_initiatives.column_dimensions[column_letter].width = adjusted_width
+        conn.close()
+        if results:
+            dashboard_cache.invalidate(DASHBOARD_STATS, MONTHLY_TRENDS)
+
+        response = {
+            'ids': {result['client_key']: result['id'] for result in results},
+            'results': results,
+            'created': sum(1 for result in results if result['action'] == 'created'),
+            'updated': sum(1 for result in results if result['action'] == 'updated')
+        }
+        if failed:
+            response['failed'] = failed
+            return jsonify(response), 207 if results else 500
+        return jsonify(response), 201
+    except Exception as e:
+        logger.error(f"Error saving initiative batch: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
-        # ========== SHEET 2: Departments ==========
-        ws_departments = wb.create_sheet("Initiative Departments")
+# ==================== Excel Export ====================
+
+# Export sheets, each described by (header, SQL expression, kind) columns. The kind
+# decides how format_export_value renders the value in the workbook; the raw csv and
+# ndjson exports name each column after its SQL expression and write 'file'.{format}.
+EXPORT_FETCH_SIZE = int(os.environ.get('EXPORT_FETCH_SIZE', '1000'))
+EXPORT_WIDTH_SAMPLE_ROWS = int(os.environ.get('EXPORT_WIDTH_SAMPLE_ROWS', '500'))
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Sheets are built concurrently, each on its own pooled connection. The executor is
+# shared so concurrent exports together never hold more than this many connections.
+EXPORT_SHEET_WORKERS = int(os.environ.get('EXPORT_SHEET_WORKERS', '4'))
+export_sheet_executor = ThreadPoolExecutor(max_workers=EXPORT_SHEET_WORKERS, thread_name_prefix='export-sheet')
+
+EXPORT_SHEETS = [
+    {
+        'title': 'Initiatives',
+        'file': 'initiatives',
+        'delta': ('i', 'modified_at'),
+        'from': 'initiatives i',
+        'order_by': 'i.use_case_name, i.id',
+        'max_width': 50,
+        'wrap_header': False,
+        'columns': [
+            ('ID', 'i.id', None),
+            ('Use Case Name', 'i.use_case_name', None),
+            ('Description', 'i.description', None),
+            ('Benefit', 'i.benefit', None),
+            ('Strategic Objective', 'i.strategic_objective', None),
+            ('Status', 'i.status', None),
+            ('Percentage Complete', 'i.percentage_complete', 'number'),
+            ('Process Owner', 'i.process_owner', None),
+            ('Business Owner', 'i.business_owner', None),
+            ('Start Date', 'i.start_date', 'date'),
+            ('Expected Completion', 'i.expected_completion_date', 'date'),
+            ('Actual Completion', 'i.actual_completion_date', 'date'),
+            ('Priority', 'i.priority', None),
+            ('Risk Level', 'i.risk_level', None),
+            ('Technology Stack', 'i.technology_stack', None),
+            ('Team Size', 'i.team_size', None),
+            ('Budget Allocated', 'i.budget_allocated', 'number'),
+            ('Budget Spent', 'i.budget_spent', 'number'),
+            ('Health Status', 'i.health_status', None),
+            ('Initiative Type', 'i.initiative_type', None),
+            ('Business Unit', 'i.business_unit', None),
+            ('Is Pinned', 'i.is_pinned', 'flag'),
+            ('Is Featured', 'i.is_featured', 'flag'),
+            ('Featured Month', 'i.featured_month', None),
+            ('Created At', 'i.created_at', 'datetime'),
+            ('Created By Name', 'i.created_by_name', None),
+            ('Created By Email', 'i.created_by_email', None),
+            ('Modified At', 'i.modified_at', 'datetime'),
+            ('Modified By Name', 'i.modified_by_name', None),
+            ('Modified By Email', 'i.modified_by_email', None),
+        ],
+    },
+    {
+        'title': 'Initiative Departments',
+        'file': 'initiative_departments',
+        'delta': ('i', 'modified_at'),
+        'from': 'initiative_departments id_dept JOIN initiatives i ON id_dept.initiative_id = i.id',
+        'order_by': 'i.use_case_name, id_dept.department',
+        'max_width': 50,
+        'wrap_header': False,
+        'columns': [
+            ('Initiative ID', 'id_dept.initiative_id', None),
+            ('Initiative Name', 'i.use_case_name', None),
+            ('Department', 'id_dept.department', None),
+        ],
+    },
+    {
+        'title': 'Monthly Metrics',
+        'file': 'monthly_metrics',
+        'delta': ('mm', 'modified_at'),
+        'from': 'monthly_metrics mm JOIN initiatives i ON mm.initiative_id = i.id',
+        'order_by': 'i.use_case_name, mm.metric_period DESC',
+        'max_width': 60,
+        'wrap_header': True,
+        'columns': [
+            ('Initiative ID', 'mm.initiative_id', None),
+            ('Initiative Name', 'i.use_case_name', None),
+            ('Metric Period', 'mm.metric_period', None),
+            ('Customer Experience Improvement', 'mm.customer_experience_score', 'number'),
+            ('Time Saved Hours', 'mm.time_saved_hours', 'number'),
+            ('Cost Saved Rands', 'mm.cost_saved_rands', 'number'),
+            ('Revenue Increase', 'mm.revenue_increase_rands', 'number'),
+            ('Processed Units', 'mm.processed_units', None),
+            ('Additional Metrics (JSON)', 'mm.additional_metrics', None),
+            ('Created At', 'mm.created_at', 'datetime'),
+            ('Modified At', 'mm.modified_at', 'datetime'),
+        ],
+    },
+    {
+        'title': 'Risk Assessments',
+        'file': 'risks',
+        'delta': ('r', 'modified_at'),
+        'from': 'risks r JOIN initiatives i ON r.initiative_id = i.id',
+        'order_by': 'i.use_case_name, r.created_at DESC',
+        'max_width': 60,
+        'wrap_header': True,
+        'columns': [
+            ('Risk ID', 'r.id', None),
+            ('Initiative ID', 'r.initiative_id', None),
+            ('Initiative Name', 'i.use_case_name', None),
+            ('Risk Title', 'r.risk_title', None),
+            ('Risk Detail', 'r.risk_detail', None),
+            ('Frequency', 'r.frequency', None),
+            ('Severity', 'r.severity', None),
+            ('Overall Risk', 'r.overall_risk', None),
+            ('Mitigation Strategy', 'r.risk_mitigation', None),
+            ('Controls', 'r.controls', None),
+            ('Created At', 'r.created_at', 'datetime'),
+            ('Created By', 'r.created_by_name', None),
+            ('Modified At', 'r.modified_at', 'datetime'),
+            ('Modified By', 'r.modified_by_name', None),
+        ],
+    },
+    {
+        'title': 'Progress Updates',
+        'file': 'progress_updates',
+        'delta': ('pu', 'modified_at'),
+        'from': 'progress_updates pu JOIN initiatives i ON pu.initiative_id = i.id',
+        'order_by': 'i.use_case_name, pu.created_at DESC',
+        'max_width': 60,
+        'wrap_header': True,
+        'columns': [
+            ('Update ID', 'pu.id', None),
+            ('Initiative ID', 'pu.initiative_id', None),
+            ('Initiative Name', 'i.use_case_name', None),
+            ('Update Type', 'pu.update_type', None),
+            ('Update Title', 'pu.update_title', None),
+            ('Update Details', 'pu.update_details', None),
+            ('Created At', 'pu.created_at', 'datetime'),
+            ('Created By', 'pu.created_by_name', None),
+            ('Modified At', 'pu.modified_at', 'datetime'),
+            ('Modified By', 'pu.modified_by_name', None),
+        ],
+    },
+]
+
+def format_export_value(value, kind):
+    """Render a database value the way the Excel export shows it"""
+    if kind == 'number':
+        return float(value) if value else 0
+    if kind == 'date':
+        return value.strftime('%Y-%m-%d') if value else ''
+    if kind == 'datetime':
+        return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+    if kind == 'flag':
+        return 'Yes' if value else 'No'
+    return value
 
-        dept_headers = ['Initiative ID', 'Initiative Name', 'Department']
-        ws_departments.append(dept_headers)
+def export_sheet_query(sheet, where=None):
+    """SELECT statement for one export sheet, optionally filtered"""
+    select_list = ', '.join(expression for _, expression, _ in sheet['columns'])
+    where_clause = f" WHERE {where}" if where else ""
+    return f"SELECT {select_list} FROM {sheet['from']}{where_clause} ORDER BY {sheet['order_by']}"
 
-        for cell in ws_departments[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+def iter_export_batches(cursor, sheet, fetch_size=None, timing=None, where=None, params=None):
+    """
+    Run a sheet's query (optionally filtered by a where clause) and yield raw row
+    batches from fetchmany(). If a timing dict is given, time spent waiting on the
+    database accumulates in timing['query_ms'].
+    """
+    started = time.perf_counter()
+    if params:
+        cursor.execute(export_sheet_query(sheet, where), params)
+    else:
+        cursor.execute(export_sheet_query(sheet, where))
+    while True:
+        rows = cursor.fetchmany(fetch_size or EXPORT_FETCH_SIZE)
+        if timing is not None:
+            timing['query_ms'] = timing.get('query_ms', 0) + (time.perf_counter() - started) * 1000
+        if not rows:
+            break
+        yield rows
+        started = time.perf_counter()
+
+def iter_export_rows(cursor, sheet, fetch_size=None, timing=None):
+    """Run a sheet's query and yield rows formatted for the workbook"""
+    kinds = [kind for _, _, kind in sheet['columns']]
+    for rows in iter_export_batches(cursor, sheet, fetch_size, timing):
+        for row in rows:
+            yield [format_export_value(value, kind) for value, kind in zip(row, kinds)]
 
-        cursor.execute("""
-            SELECT id_dept.initiative_id, i.use_case_name, id_dept.department
-            FROM initiative_departments id_dept
-            JOIN initiatives i ON id_dept.initiative_id = i.id
-            ORDER BY i.use_case_name, id_dept.department
-        """)
+def write_export_sheet(ws, sheet, rows, progress=None, style_lock=None):
+    """
+    Write a styled sheet into a write-only worksheet and return the number of rows written.
+    progress, if given, is called with the running row count every EXPORT_FETCH_SIZE rows.
 
-        for row in cursor.fetchall():
-            ws_departments.append([row[0], row[1], row[2]])
+    Write-only sheets need column widths before the first row goes out, so the first
+    EXPORT_WIDTH_SAMPLE_ROWS rows are buffered to size the columns and the rest are
+    streamed straight through. Styling header cells registers styles on the shared
+    workbook, so sheets written from several threads pass a style_lock.
+    """
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
 
-        for column in ws_departments.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws_departments.column_dimensions[column_letter].width = adjusted_width
-
-        # ========== SHEET 3: Monthly Metrics ==========
-        ws_metrics = wb.create_sheet("Monthly Metrics")
-
-        metrics_headers = [
-            'Initiative ID', 'Initiative Name', 'Metric Period',
-            'Customer Experience Improvement', 'Time Saved Hours',
-            'Cost Saved Rands', 'Revenue Increase', 'Processed Units',
-            'Additional Metrics (JSON)', 'Comments', 'Created At', 'Modified At'
-        ]
-        ws_metrics.append(metrics_headers)
-
-        for cell in ws_metrics[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = border
+    headers = [header for header, _, _ in sheet['columns']]
 
-        cursor.execute("""
-            SELECT mm.*, i.use_case_name
-            FROM monthly_metrics mm
-            JOIN initiatives i ON mm.initiative_id = i.id
-            ORDER BY i.use_case_name, mm.metric_period DESC
-        """)
+    rows = iter(rows)
+    sample = list(itertools.islice(rows, EXPORT_WIDTH_SAMPLE_ROWS))
+    for index, header in enumerate(headers):
+        max_length = max([len(str(header))] + [len(str(row[index])) for row in sample])
+        ws.column_dimensions[get_column_letter(index + 1)].width = min(max_length + 2, sheet['max_width'])
 
-        for row in cursor.fetchall():
-            ws_metrics.append([
-                row[1],  # initiative_id
-                row[13],  # use_case_name
-                row[2],  # metric_period
-                float(row[3]) if row[3] else 0,  # customer_experience_improvement
-                float(row[4]) if row[4] else 0,  # time_saved_hours
-                float(row[5]) if row[5] else 0,  # cost_saved_rands
-                float(row[6]) if row[6] else 0,  # revenue_increase
-                row[7],  # processed_units
-                row[8],  # additional_metrics
-                row[9],  # comments
-                row[10].strftime('%Y-%m-%d %H:%M:%S') if row[10] else '',  # created_at
-                row[11].strftime('%Y-%m-%d %H:%M:%S') if row[11] else '',  # modified_at
-            ])
-
-        for column in ws_metrics.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 60)
-            ws_metrics.column_dimensions[column_letter].width = adjusted_width
-
-        # ========== SHEET 4: Risks ==========
-        ws_risks = wb.create_sheet("Risk Assessments")
-
-        risk_headers = [
-            'Risk ID', 'Initiative ID', 'Initiative Name', 'Risk Title',
-            'Risk Detail', 'Frequency', 'Severity', 'Overall Risk',
-            'Mitigation Strategy', 'Controls', 'Created At', 'Created By',
-            'Modified At', 'Modified By'
-        ]
-        ws_risks.append(risk_headers)
-
-        for cell in ws_risks[1]:
+    with style_lock or threading.Lock():
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=11)
+        header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=sheet['wrap_header'])
+        border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
             cell.fill = header_fill
             cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+            cell.alignment = header_alignment
             cell.border = border
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+    row_count = 0
+    for row in itertools.chain(sample, rows):
+        ws.append(row)
+        row_count += 1
+        if progress and row_count % EXPORT_FETCH_SIZE == 0:
+            progress(row_count)
+    if progress:
+        progress(row_count)
+    return row_count
+
+def build_export_sheet(ws, sheet, progress=None, style_lock=None):
+    """Fill one export sheet on its own pooled connection; returns (row_count, timing)"""
+    started = time.perf_counter()
+    timing = {'query_ms': 0}
+    conn = db_pool.acquire()
+    try:
+        cursor = conn.cursor()
+        row_count = write_export_sheet(ws, sheet, iter_export_rows(cursor, sheet, timing=timing), progress, style_lock)
+    finally:
+        conn.close()
+    timing['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    timing['query_ms'] = round(timing['query_ms'], 1)
+    return row_count, timing
 
-        cursor.execute("""
-            SELECT r.*, i.use_case_name
-            FROM risks r
-            JOIN initiatives i ON r.initiative_id = i.id
-            ORDER BY i.use_case_name, r.created_at DESC
-        """)
+def write_export_workbook(fileobj, progress=None):
+    """
+    Build every export sheet concurrently and save the workbook to fileobj.
 
-        for row in cursor.fetchall():
-            ws_risks.append([
-                row[0],  # id
-                row[1],  # initiative_id
-                row[15],  # use_case_name
-                row[2],  # risk_title
-                row[3],  # risk_detail
-                row[4],  # frequency
-                row[5],  # severity
-                row[8],  # overall_risk
-                row[6],  # risk_mitigation
-                row[7],  # controls
-                row[9].strftime('%Y-%m-%d %H:%M:%S') if row[9] else '',  # created_at
-                row[10],  # created_by_name
-                row[12].strftime('%Y-%m-%d %H:%M:%S') if row[12] else '',  # modified_at
-                row[13],  # modified_by_name
-            ])
-
-        for column in ws_risks.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 60)
-            ws_risks.column_dimensions[column_letter].width = adjusted_width
+    Sheets are created up front so their order is fixed, then each one is queried,
+    formatted and written on export_sheet_executor with its own database connection.
+    progress, if given, is called as progress(sheet_title, rows_written).
 
-        # ========== SHEET 5: Progress Updates ==========
-        ws_progress = wb.create_sheet("Progress Updates")
+    Returns:
+        (row_counts, timings), both keyed by sheet title
+    """
+    from concurrent.futures import wait
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    style_lock = threading.Lock()
+    futures = {}
+    for sheet in EXPORT_SHEETS:
+        ws = wb.create_sheet(sheet['title'])
+        sheet_progress = (lambda rows, title=sheet['title']: progress(title, rows)) if progress else None
+        futures[sheet['title']] = export_sheet_executor.submit(build_export_sheet, ws, sheet, sheet_progress, style_lock)
+
+    # Let every sheet finish (and return its connection) before surfacing a failure
+    wait(futures.values())
+    row_counts = {}
+    timings = {}
+    for title, future in futures.items():
+        row_counts[title], timings[title] = future.result()
+
+    wb.save(fileobj)
+    logger.info("Export sheet timings: " + ", ".join(
+        f"{title}={timing['total_ms']:.0f}ms (query {timing['query_ms']:.0f}ms, {row_counts[title]} rows)"
+        for title, timing in timings.items()
+    ))
+    return row_counts, timings
+
+def server_timing_header(timings):
+    """Server-Timing header value with the total time spent on each export sheet"""
+    return ', '.join(
+        f'{re.sub(r"[^a-z0-9]+", "-", title.lower())};dur={timing["total_ms"]:.1f};desc="{title}"'
+        for title, timing in timings.items()
+    )
+
+# ==================== Raw Data Export ====================
+# format=csv|ndjson skips openpyxl entirely: each sheet's rows are serialized straight
+# from fetchmany() batches into a zip member, and the zip is streamed to the client
+# as it is produced, so memory stays flat regardless of portfolio size.
+
+RAW_EXPORT_FORMATS = ('csv', 'ndjson')
+
+def export_field_names(sheet):
+    """Raw export column names: the column part of each SQL expression"""
+    return [expression.split('.')[-1] for _, expression, _ in sheet['columns']]
+
+# Per-kind conversions for the raw formats; kind None columns pass through unchanged
+RAW_EXPORT_CONVERTERS = {
+    'csv': {'number': str, 'date': lambda value: value.isoformat(), 'datetime': lambda value: value.isoformat(), 'flag': int},
+    'ndjson': {'number': float, 'date': lambda value: value.isoformat(), 'datetime': lambda value: value.isoformat(), 'flag': bool}
+}
 
-        progress_headers = [
-            'Update ID', 'Initiative ID', 'Initiative Name', 'Update Type',
-            'Update Title', 'Update Details', 'Created At', 'Created By',
-            'Modified At', 'Modified By'
-        ]
-        ws_progress.append(progress_headers)
+def raw_export_row_converter(sheet, export_format):
+    """
+    Build a function turning a database row into raw export values.
+    Conversions are resolved once per sheet from the column kinds, not per value.
+    """
+    converters = RAW_EXPORT_CONVERTERS[export_format]
+    conversions = [(index, converters[kind]) for index, (_, _, kind) in enumerate(sheet['columns']) if kind]
+
+    def convert(row):
+        values = list(row)
+        for index, converter in conversions:
+            if values[index] is not None:
+                values[index] = converter(values[index])
+        return values
+    return convert
+
+def serialize_export_batch(rows, fields, export_format, convert):
+    """Encode a fetchmany() batch as UTF-8 CSV rows (NULL as empty) or NDJSON lines"""
+    if export_format == 'ndjson':
+        return ''.join(
+            json.dumps(dict(zip(fields, convert(row))), ensure_ascii=False) + '\n'
+            for row in rows
+        ).encode('utf-8')
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerows(map(convert, rows))
+    return buffer.getvalue().encode('utf-8')
+
+class ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink for zipfile; drain() hands back what was written so far"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+# ==================== Delta Export ====================
+# since=<watermark> limits the raw export to rows changed after the watermark. Change
+# tracking uses the row_version (ROWVERSION) columns on initiatives, monthly_metrics,
+# risks and progress_updates, and deletes are recorded in export_tombstones by
+# AFTER DELETE triggers, cascades included. The next watermark is
+# MIN_ACTIVE_ROWVERSION() read before streaming: everything below it is committed,
+# so rows from transactions still in flight are picked up by the following pull.
+# Departments ride on their initiative: a changed initiative is sent with its full
+# department list, which replaces the previous one.
+
+EXPORT_TOMBSTONE_SHEET = {
+    'title': 'Tombstones',
+    'file': 'tombstones',
+    'delta': ('t', 'deleted_at'),
+    'from': 'export_tombstones t',
+    'order_by': 't.row_version',
+    'columns': [
+        ('Table', 't.table_name', None),
+        ('Row ID', 't.row_id', None),
+        ('Initiative ID', 't.initiative_id', None),
+        ('Deleted At', 't.deleted_at', 'datetime'),
+    ],
+}
 
-        for cell in ws_progress[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = border
+def encode_export_watermark(row_version):
+    """Opaque since= token for a rowversion value"""
+    payload = json.dumps({'rv': bytes(row_version).hex()}).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
 
-        cursor.execute("""
-            SELECT pu.*, i.use_case_name
-            FROM progress_updates pu
-            JOIN initiatives i ON pu.initiative_id = i.id
-            ORDER BY i.use_case_name, pu.created_at DESC
-        """)
+def decode_export_watermark(since):
+    """
+    Parse since= into ('row_version', bytes) for a token returned by a previous
+    export, or ('timestamp', datetime) for an ISO 8601 timestamp.
+    Raises ValueError when it is neither.
+    """
+    try:
+        padded = since + '=' * (-len(since) % 4)
+        row_version = bytes.fromhex(json.loads(base64.urlsafe_b64decode(padded))['rv'])
+        if len(row_version) != 8:
+            raise ValueError
+        return 'row_version', row_version
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return 'timestamp', datetime.fromisoformat(since.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError('Invalid since watermark, expected a token from a previous export or an ISO 8601 timestamp')
+
+def current_export_watermark(cursor):
+    """Upper bound for a delta: every change below it has committed"""
+    cursor.execute("SELECT MIN_ACTIVE_ROWVERSION()")
+    return bytes(cursor.fetchone()[0])
+
+def export_delta_filter(sheet, delta):
+    """WHERE clause and params limiting a sheet to the delta window"""
+    alias, timestamp_column = sheet['delta']
+    if delta['mode'] == 'row_version':
+        lower = f"{alias}.row_version >= CONVERT(BINARY(8), ?)"
+    else:
+        lower = f"{alias}.{timestamp_column} > ?"
+    return f"{lower} AND {alias}.row_version < CONVERT(BINARY(8), ?)", [delta['since'], delta['until']]
+
+def stream_export_archive(cursor, export_format, fetch_size=None, sheets=None, delta=None, manifest=None):
+    """
+    Yield a zip archive holding one <file>.<format> member per export sheet
+    (EXPORT_SHEETS unless sheets is given). With a delta window, each sheet is
+    limited to changed rows and a tombstones member lists deleted rows. A manifest
+    dict, if given, is written last as manifest.json.
 
-        for row in cursor.fetchall():
-            ws_progress.append([
-                row[0],  # id
-                row[1],  # initiative_id
-                row[11],  # use_case_name
-                row[2],  # update_type
-                row[3],  # update_title
-                row[4],  # update_details
-                row[5].strftime('%Y-%m-%d %H:%M:%S') if row[5] else '',  # created_at
-                row[6],  # created_by_name
-                row[8].strftime('%Y-%m-%d %H:%M:%S') if row[8] else '',  # modified_at
-                row[9],  # modified_by_name
-            ])
-
-        for column in ws_progress.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 60)
-            ws_progress.column_dimensions[column_letter].width = adjusted_width
+    zipfile writes data descriptors when the sink can't seek, so each member is
+    compressed and emitted batch by batch without knowing its size up front.
+    """
+    sheets = list(sheets or EXPORT_SHEETS)
+    if delta:
+        sheets.append(EXPORT_TOMBSTONE_SHEET)
+
+    sink = ZipStream()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for sheet in sheets:
+            fields = export_field_names(sheet)
+            convert = raw_export_row_converter(sheet, export_format)
+            where, params = export_delta_filter(sheet, delta) if delta else (None, None)
+            with archive.open(f"{sheet['file']}.{export_format}", 'w', force_zip64=True) as member:
+                if export_format == 'csv':
+                    member.write((','.join(fields) + '\n').encode('utf-8'))
+                for rows in iter_export_batches(cursor, sheet, fetch_size, where=where, params=params):
+                    member.write(serialize_export_batch(rows, fields, export_format, convert))
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+        if manifest is not None:
+            archive.writestr('manifest.json', json.dumps(manifest, indent=2))
+    yield sink.drain()
+
+def raw_export_response(export_format, since=None):
+    """
+    Streaming zip response for format=csv|ndjson. The next watermark comes back in
+    the X-Export-Watermark header and manifest.json; pass it as since= to get only
+    later changes.
+    Raises ValueError for an unparseable since.
+    """
+    delta = None
+    if since:
+        mode, since_value = decode_export_watermark(since)
+        delta = {'mode': mode, 'since': since_value}
+
+    conn = get_db_connection()
+    watermark = current_export_watermark(conn.cursor())
+    conn.close()
+    if delta:
+        delta['until'] = watermark
+    manifest = {
+        'format': export_format,
+        'since': since,
+        'next_watermark': encode_export_watermark(watermark),
+        'generated_at': datetime.now().isoformat()
+    }
 
-        conn.close()
+    def generate():
+        # The response outlives the request context, so take a connection straight from the pool
+        conn = db_pool.acquire()
+        try:
+            yield from stream_export_archive(conn.cursor(), export_format, delta=delta, manifest=manifest)
+        except Exception as e:
+            logger.error(f"Error streaming {export_format} export: {str(e)}")
+            raise
+        finally:
+            conn.close()
 
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    kind = 'Delta' if delta else 'Export'
+    filename = f'AI_Initiatives_{kind}_{timestamp}_{export_format}.zip'
+    return Response(
+        generate(),
+        mimetype='application/zip',
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'X-Export-Watermark': manifest['next_watermark'],
+            'Access-Control-Expose-Headers': 'X-Export-Watermark, Content-Disposition'
+        }
+    )
+
+@app.route('/api/initiatives/export', methods=['GET'])
+def export_initiatives_to_excel():
+    """Export all initiatives and related data to Excel with multiple sheets (or format=csv|ndjson)"""
+    output = None
+    try:
+        since = request.args.get('since')
+        export_format = request.args.get('format', 'ndjson' if since else 'xlsx').lower()
+        if export_format in RAW_EXPORT_FORMATS:
+            try:
+                return raw_export_response(export_format, since)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        if export_format != 'xlsx':
+            return jsonify({'error': f"Unsupported format '{export_format}', use xlsx, csv or ndjson"}), 400
+        if since:
+            return jsonify({'error': 'since is only supported with format=csv or ndjson'}), 400
+
+        # Rows stream from fetchmany() into openpyxl's write-only sheets (spooled to
+        # disk), and the finished file is sent from a temp file rather than memory
+        output = tempfile.TemporaryFile()
+        row_counts, timings = write_export_workbook(output)
         output.seek(0)
+        logger.info(f"Exported initiatives workbook: {row_counts}")
 
         # Generate filename with timestamp
-        from datetime import datetime
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f'AI_Initiatives_Export_{timestamp}.xlsx'
 
-        return send_file(
+        response = send_file(
             output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            mimetype=XLSX_MIMETYPE,
             as_attachment=True,
             download_name=filename
         )
+        response.headers['Server-Timing'] = server_timing_header(timings)
+        return response
 
     except Exception as e:
+        if output is not None:
+            output.close()
         logger.error(f"Error exporting initiatives to Excel: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# ==================== Export Jobs ====================
+# Exports run on a bounded thread pool instead of tying up a request worker. Finished
+# workbooks stay on disk, named by a fingerprint of the exported data, so a new job
+# hands back the existing artifact when none of the source tables have changed.
+
+EXPORT_JOB_CONFIG = {
+    'max_workers': int(os.environ.get('EXPORT_JOB_WORKERS', '2')),
+    'max_pending': int(os.environ.get('EXPORT_JOB_MAX_PENDING', '20')),
+    'artifact_dir': os.environ.get('EXPORT_ARTIFACT_DIR', os.path.join(tempfile.gettempdir(), 'ai-reporting-exports')),
+    'retention_seconds': float(os.environ.get('EXPORT_RETENTION_SECONDS', '86400')),
+    'max_artifacts': int(os.environ.get('EXPORT_MAX_ARTIFACTS', '20'))
+}
+
+# Every table the export sheets read from; each carries a row_version column
+EXPORT_SOURCE_TABLES = ['initiatives', 'initiative_departments', 'monthly_metrics', 'risks', 'progress_updates']
+
+def export_source_fingerprint(cursor):
+    """
+    Hash the row count and highest row_version of every exported table.
+
+    Runs as one batch. rowversion is database-wide and only increases, so any insert
+    or update raises a table's maximum, and a delete lowers its count. Unlike a
+    checksum aggregate, no combination of changes can cancel out. A change to the
+    sheet queries themselves also changes the result.
+    """
+    statements = [(f"SELECT COUNT_BIG(*) AS row_count, MAX(row_version) AS max_row_version FROM {table}", [])
+                  for table in EXPORT_SOURCE_TABLES]
+
+    digest = hashlib.sha256()
+    for sheet in EXPORT_SHEETS:
+        digest.update(export_sheet_query(sheet).encode('utf-8'))
+    for table, rows in zip(EXPORT_SOURCE_TABLES, fetch_result_sets(cursor, statements)):
+        digest.update(f"{table}|{rows[0]['row_count']}|{rows[0]['max_row_version']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+class ExportJobManager:
+    """
+    Runs export jobs on a bounded thread pool and tracks their progress.
+
+    Artifacts are written as <fingerprint>.xlsx with a JSON sidecar holding the row
+    counts, and removed once they are older than retention_seconds or there are more
+    than max_artifacts of them. Job records are kept in memory for the same period.
+    """
+
+    def __init__(self, max_workers, max_pending, artifact_dir, retention_seconds, max_artifacts):
+        self.max_pending = max_pending
+        self.artifact_dir = artifact_dir
+        self.retention_seconds = retention_seconds
+        self.max_artifacts = max_artifacts
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='export-job')
+        self._jobs = {}
+        self._build_locks = {}
+        self._lock = threading.Lock()
+
+    def submit(self):
+        """Queue a new export job; returns its snapshot, or None when the queue is full"""
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job['status'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                return None
+            job_id = os.urandom(16).hex()
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'progress': {sheet['title']: 0 for sheet in EXPORT_SHEETS},
+                'reused': False,
+                'timings': None,
+                'error': None,
+                'filename': None,
+                'path': None,
+                'created_at': datetime.now(),
+                'started_at': None,
+                'finished_at': None
+            }
+            snapshot = self._snapshot(self._jobs[job_id])
+        self._executor.submit(self._run, job_id)
+        return snapshot
+
+    def get(self, job_id):
+        """Snapshot of a job, or None if it is unknown or has expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def artifact(self, job_id):
+        """(path, filename) of a completed job's workbook, or None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job['status'] != 'completed':
+                return None
+            return job['path'], job['filename']
+
+    def _snapshot(self, job):
+        return {
+            'id': job['id'],
+            'status': job['status'],
+            'progress': dict(job['progress']),
+            'rows_written': sum(job['progress'].values()),
+            'reused': job['reused'],
+            'timings_ms': job['timings'],
+            'error': job['error'],
+            'filename': job['filename'],
+            'created_at': job['created_at'].isoformat(),
+            'started_at': job['started_at'].isoformat() if job['started_at'] else None,
+            'finished_at': job['finished_at'].isoformat() if job['finished_at'] else None
+        }
+
+    def _update(self, job_id, **changes):
+        with self._lock:
+            self._jobs[job_id].update(changes)
+
+    def _set_progress(self, job_id, title, rows):
+        with self._lock:
+            self._jobs[job_id]['progress'][title] = rows
+
+    def _build_lock(self, fingerprint):
+        with self._lock:
+            return self._build_locks.setdefault(fingerprint, threading.Lock())
+
+    def _run(self, job_id):
+        self._update(job_id, status='running', started_at=datetime.now())
+        conn = None
+        partial_path = None
+        try:
+            os.makedirs(self.artifact_dir, exist_ok=True)
+            self.purge_expired()
+
+            conn = db_pool.acquire()
+            cursor = conn.cursor()
+            fingerprint = export_source_fingerprint(cursor)
+            path = os.path.join(self.artifact_dir, f'{fingerprint}.xlsx')
+            sidecar_path = os.path.join(self.artifact_dir, f'{fingerprint}.json')
+
+            # Jobs for the same data wait for one build instead of duplicating it
+            with self._build_lock(fingerprint):
+                reused = os.path.exists(path) and os.path.exists(sidecar_path)
+                if reused:
+                    with open(sidecar_path) as f:
+                        built = json.load(f)
+                else:
+                    partial_path = os.path.join(self.artifact_dir, f'{job_id}.partial')
+                    with open(partial_path, 'wb') as output:
+                        row_counts, timings = write_export_workbook(
+                            output,
+                            progress=lambda title, rows: self._set_progress(job_id, title, rows)
+                        )
+
+                    # Data that changed mid-build must not be cached under the old fingerprint
+                    if export_source_fingerprint(cursor) != fingerprint:
+                        path = os.path.join(self.artifact_dir, f'{job_id}.xlsx')
+                        sidecar_path = None
+                    os.replace(partial_path, path)
+                    partial_path = None
+
+                    built = {
+                        'row_counts': row_counts,
+                        'timings': timings,
+                        'built_at': datetime.now().strftime('%Y%m%d_%H%M%S')
+                    }
+                    if sidecar_path:
+                        with open(sidecar_path, 'w') as f:
+                            json.dump(built, f)
+            # Release the connection exactly once; a second close could return it after another thread took it
+            conn.close()
+            conn = None
+
+            self._update(
+                job_id,
+                status='completed',
+                progress=built['row_counts'],
+                timings=built.get('timings'),
+                reused=reused,
+                path=path,
+                filename=f"AI_Initiatives_Export_{built['built_at']}.xlsx",
+                finished_at=datetime.now()
+            )
+            logger.info(f"Export job {job_id} completed (reused={reused}): {built['row_counts']}")
+            self.purge_expired(keep=path)
+        except Exception as e:
+            logger.error(f"Error running export job {job_id}: {str(e)}")
+            self._update(job_id, status='failed', error=str(e), finished_at=datetime.now())
+            if partial_path and os.path.exists(partial_path):
+                os.remove(partial_path)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def purge_expired(self, keep=None):
+        """Apply the retention policy to artifacts on disk and finished job records"""
+        now = time.time()
+        cutoff = now - self.retention_seconds
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job['finished_at'] and job['finished_at'].timestamp() < cutoff]:
+                del self._jobs[job_id]
+
+        if not os.path.isdir(self.artifact_dir):
+            return
+        artifacts = []
+        for name in os.listdir(self.artifact_dir):
+            file_path = os.path.join(self.artifact_dir, name)
+            try:
+                modified = os.path.getmtime(file_path)
+            except OSError:
+                continue
+            if file_path == keep:
+                continue
+            if name.endswith('.xlsx'):
+                artifacts.append((modified, file_path))
+            elif name.endswith('.partial') and now - modified > self.retention_seconds:
+                self._remove_artifact(file_path)
+
+        artifacts.sort(reverse=True)
+        limit = self.max_artifacts - (1 if keep else 0)
+        for index, (modified, file_path) in enumerate(artifacts):
+            if index >= limit or now - modified > self.retention_seconds:
+                self._remove_artifact(file_path)
+
+    def _remove_artifact(self, file_path):
+        base, _ = os.path.splitext(file_path)
+        for stale_path in (file_path, base + '.json'):
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+
+export_jobs = ExportJobManager(**EXPORT_JOB_CONFIG)
+
+@app.route('/api/initiatives/export/jobs', methods=['POST'])
+def create_export_job():
+    """Start a background Excel export and return its job id"""
+    try:
+        job = export_jobs.submit()
+        if job is None:
+            return jsonify({'error': 'Too many export jobs in progress, try again shortly'}), 429
+
+        job['status_url'] = url_for('get_export_job', job_id=job['id'])
+        job['download_url'] = url_for('download_export_job', job_id=job['id'])
+        return jsonify(job), 202
+    except Exception as e:
+        logger.error(f"Error creating export job: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/initiatives/export/jobs/<job_id>', methods=['GET'])
+def get_export_job(job_id):
+    """Status and per-sheet progress of an export job"""
+    job = export_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Export job not found'}), 404
+
+    job['status_url'] = url_for('get_export_job', job_id=job_id)
+    job['download_url'] = url_for('download_export_job', job_id=job_id)
+    return jsonify(job)
+
+@app.route('/api/initiatives/export/jobs/<job_id>/download', methods=['GET'])
+def download_export_job(job_id):
+    """Download the workbook produced by a completed export job"""
+    try:
+        job = export_jobs.get(job_id)
+        if not job:
+            return jsonify({'error': 'Export job not found'}), 404
+
+        artifact = export_jobs.artifact(job_id)
+        if artifact is None:
+            return jsonify({'error': f"Export job is {job['status']}", 'status': job['status']}), 409
+
+        path, filename = artifact
+        if not os.path.exists(path):
+            return jsonify({'error': 'Export artifact has expired, start a new export'}), 410
+
+        return send_file(path, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=filename)
+    except Exception as e:
+        logger.error(f"Error downloading export job: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 # ==================== Monthly Metrics ====================
 
 @app.route('/api/initiatives/<int:initiative_id>/metrics', methods=['GET'])
@@ -1226,59 +3249,59 @@ def get_initiative_metric_for_period(initiative_id, period):
         logger.error(f"Error fetching metric: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def metric_json_path(metric_name):
+    """JSON path addressing one additional_metrics key, quoted so any metric name is safe"""
+    return '$."' + metric_name.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
 @app.route('/api/initiatives/<int:initiative_id>/metrics/<period>/metric/<metric_name>', methods=['PUT'])
 def update_individual_metric(initiative_id, period, metric_name):
     """Update a specific metric within a period"""
     try:
-        import json
         data = request.json
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        # Get existing metrics
-        cursor.execute("""
-            SELECT id, additional_metrics FROM monthly_metrics
-            WHERE initiative_id = ? AND metric_period = ?
-        """, (initiative_id, period))
-
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return jsonify({'error': 'Metrics not found for this period'}), 404
-
-        # Parse existing metrics
-        existing_metrics = {}
-        if row[1]:
-            try:
-                existing_metrics = json.loads(row[1])
-            except:
-                existing_metrics = {}
-
-        # Update the specific metric
-        existing_metrics[metric_name] = {
+        metric = {
             'value': data.get('value'),
             'comments': data.get('comments', '')
         }
+        path = metric_json_path(metric_name)
 
-        # Save back to database
+        # Only the targeted key is rewritten, in place, so edits to other metrics in
+        # the same period can't be overwritten by a stale copy of the blob
         cursor.execute("""
             UPDATE monthly_metrics
-            SET additional_metrics = ?,
+            SET additional_metrics = JSON_MODIFY(
+                    CASE WHEN ISJSON(additional_metrics) = 1 THEN additional_metrics ELSE N'{}' END,
+                    ?, JSON_QUERY(?)),
                 modified_at = GETDATE(),
                 modified_by_name = ?,
                 modified_by_email = ?
-            WHERE id = ?
+            OUTPUT JSON_QUERY(inserted.additional_metrics, ?)
+            WHERE initiative_id = ? AND metric_period = ?
         """, (
-            json.dumps(existing_metrics),
+            path,
+            json.dumps(metric),
             data.get('modified_by_name', DEFAULT_USER['name']),
             data.get('modified_by_email', DEFAULT_USER['email']),
-            row[0]
+            path,
+            initiative_id,
+            period
         ))
 
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return jsonify({'error': 'Metrics not found for this period'}), 404
+
+        saved_metric = json.loads(row[0])
+        upsert_metric_values(cursor, initiative_id, period, {metric_name: saved_metric})
+
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(MONTHLY_TRENDS)
 
-        return jsonify({'message': 'Metric updated successfully'})
+        return jsonify({'message': 'Metric updated successfully', 'metric_name': metric_name, 'metric': saved_metric})
     except Exception as e:
         logger.error(f"Error updating individual metric: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -1287,52 +3310,45 @@ def update_individual_metric(initiative_id, period, metric_name):
 def delete_individual_metric(initiative_id, period, metric_name):
     """Delete a specific metric from a period"""
     try:
-        import json
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Get existing metrics
-        cursor.execute("""
-            SELECT id, additional_metrics FROM monthly_metrics
-            WHERE initiative_id = ? AND metric_period = ?
-        """, (initiative_id, period))
-
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return jsonify({'error': 'Metrics not found for this period'}), 404
-
-        # Parse existing metrics
-        existing_metrics = {}
-        if row[1]:
-            try:
-                existing_metrics = json.loads(row[1])
-            except:
-                existing_metrics = {}
-
-        # Remove the specific metric
-        if metric_name in existing_metrics:
-            del existing_metrics[metric_name]
+        conn = get_db_connection()
+        cursor = conn.cursor()
 
-        # Save back to database
+        # JSON_MODIFY with NULL removes just this key; an emptied blob is stored as NULL
         cursor.execute("""
             UPDATE monthly_metrics
-            SET additional_metrics = ?,
+            SET additional_metrics = NULLIF(JSON_MODIFY(
+                    CASE WHEN ISJSON(additional_metrics) = 1 THEN additional_metrics ELSE N'{}' END,
+                    ?, NULL), N'{}'),
                 modified_at = GETDATE(),
                 modified_by_name = ?,
                 modified_by_email = ?
-            WHERE id = ?
+            OUTPUT CASE WHEN ISJSON(deleted.additional_metrics) = 1 THEN JSON_QUERY(deleted.additional_metrics, ?) END
+            WHERE initiative_id = ? AND metric_period = ?
         """, (
-            json.dumps(existing_metrics) if existing_metrics else None,
+            metric_json_path(metric_name),
             DEFAULT_USER['name'],
             DEFAULT_USER['email'],
-            row[0]
+            metric_json_path(metric_name),
+            initiative_id,
+            period
         ))
 
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return jsonify({'error': 'Metrics not found for this period'}), 404
+
+        delete_metric_values(cursor, initiative_id, period, metric_name)
+
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(MONTHLY_TRENDS)
 
-        return jsonify({'message': 'Metric deleted successfully'})
+        return jsonify({
+            'message': 'Metric deleted successfully',
+            'metric_name': metric_name,
+            'deleted_metric': json.loads(row[0]) if row[0] else None
+        })
     except Exception as e:
         logger.error(f"Error deleting individual metric: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -1351,6 +3367,7 @@ def delete_period_metrics(initiative_id, period):
 
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(MONTHLY_TRENDS)
 
         return jsonify({'message': 'Period metrics deleted successfully'})
     except Exception as e:
@@ -1372,6 +3389,55 @@ def convert_to_date(value):
         return None
     return value
 
+# The 13 standard metric columns on monthly_metrics, each with its comments column
+STANDARD_METRIC_COLUMNS = [
+    ('customer_experience_score', 'customer_experience_comments'),
+    ('time_saved_hours', 'time_saved_comments'),
+    ('cost_saved_rands', 'cost_saved_comments'),
+    ('revenue_increase_rands', 'revenue_increase_comments'),
+    ('processed_units', 'processed_units_comments'),
+    ('model_accuracy', 'model_accuracy_comments'),
+    ('user_adoption_rate', 'user_adoption_comments'),
+    ('error_rate', 'error_rate_comments'),
+    ('response_time_ms', 'response_time_comments'),
+    ('data_quality_score', 'data_quality_comments'),
+    ('user_satisfaction_score', 'user_satisfaction_comments'),
+    ('business_impact_score', 'business_impact_comments'),
+    ('innovation_score', 'innovation_comments'),
+]
+
+def build_monthly_metric_upsert_sql():
+    """
+    Single-statement upsert for one (initiative_id, metric_period) row.
+
+    HOLDLOCK keeps the key range locked between the match and the write, so
+    concurrent saves for the same period serialize instead of racing to insert.
+    Standard columns are overwritten as before; additional_metrics is merged
+    key-by-key with what is stored, server-side, by dbo.json_merge_objects.
+    """
+    standard = [column for pair in STANDARD_METRIC_COLUMNS for column in pair]
+    audit = ['created_by_name', 'created_by_email', 'modified_by_name', 'modified_by_email']
+    source_columns = ['initiative_id', 'metric_period', *standard, 'additional_metrics', *audit]
+    insert_values = [f'source.{column}' for column in source_columns]
+    insert_values[source_columns.index('additional_metrics')] = 'dbo.json_merge_objects(NULL, source.additional_metrics)'
+    update_assignments = [f'{column} = source.{column}' for column in standard] + [
+        'additional_metrics = dbo.json_merge_objects(target.additional_metrics, source.additional_metrics)',
+        'modified_at = GETDATE()',
+        'modified_by_name = source.modified_by_name',
+        'modified_by_email = source.modified_by_email',
+    ]
+    return f"""
+        MERGE monthly_metrics WITH (HOLDLOCK) AS target
+        USING (SELECT {', '.join(f'? AS {column}' for column in source_columns)}) AS source
+        ON target.initiative_id = source.initiative_id AND target.metric_period = source.metric_period
+        WHEN MATCHED THEN UPDATE SET
+            {', '.join(update_assignments)}
+        WHEN NOT MATCHED THEN INSERT ({', '.join(source_columns)})
+            VALUES ({', '.join(insert_values)});
+    """
+
+MONTHLY_METRIC_UPSERT_SQL = build_monthly_metric_upsert_sql()
+
 @app.route('/api/initiatives/<int:initiative_id>/metrics', methods=['POST'])
 def create_initiative_metric(initiative_id):
     """Create or update monthly metrics for an initiative"""
@@ -1382,177 +3448,396 @@ def create_initiative_metric(initiative_id):
 
         metric_period = data.get('metric_period')
 
-        # Convert numeric fields properly
-        customer_experience_score = convert_to_numeric(data.get('customer_experience_score'))
-        time_saved_hours = convert_to_numeric(data.get('time_saved_hours'))
-        cost_saved_rands = convert_to_numeric(data.get('cost_saved_rands'))
-        revenue_increase_rands = convert_to_numeric(data.get('revenue_increase_rands'))
-        processed_units = convert_to_numeric(data.get('processed_units'))
-        model_accuracy = convert_to_numeric(data.get('model_accuracy'))
-        user_adoption_rate = convert_to_numeric(data.get('user_adoption_rate'))
-        error_rate = convert_to_numeric(data.get('error_rate'))
-        response_time_ms = convert_to_numeric(data.get('response_time_ms'))
-        data_quality_score = convert_to_numeric(data.get('data_quality_score'))
-        user_satisfaction_score = convert_to_numeric(data.get('user_satisfaction_score'))
-        business_impact_score = convert_to_numeric(data.get('business_impact_score'))
-        innovation_score = convert_to_numeric(data.get('innovation_score'))
-
-        # Handle additional dynamic metrics
-        import json
-        new_additional_metrics = data.get('additional_metrics', {})
+        # Standard metrics are overwritten (missing ones become NULL), as are their comments
+        standard_values = []
+        for value_column, comments_column in STANDARD_METRIC_COLUMNS:
+            standard_values.append(convert_to_numeric(data.get(value_column)))
+            standard_values.append(data.get(comments_column))
+
+        # Additional metrics are merged into what is stored: submitted keys win, others are kept
+        new_additional_metrics = data.get('additional_metrics') or {}
+        additional_metrics_json = json.dumps(new_additional_metrics) if new_additional_metrics else None
+
+        # One atomic statement; created_by is only written when the period is new
+        cursor.execute(MONTHLY_METRIC_UPSERT_SQL, (
+            initiative_id, metric_period,
+            *standard_values,
+            additional_metrics_json,
+            data.get('created_by_name', DEFAULT_USER['name']),
+            data.get('created_by_email', DEFAULT_USER['email']),
+            data.get('modified_by_name', DEFAULT_USER['name']),
+            data.get('modified_by_email', DEFAULT_USER['email'])
+        ))
 
-        # Check if metric already exists
-        cursor.execute("""
-            SELECT id, additional_metrics FROM monthly_metrics
-            WHERE initiative_id = ? AND metric_period = ?
-        """, (initiative_id, metric_period))
+        # Only the submitted metrics change; merged-in existing ones are already stored
+        upsert_metric_values(cursor, initiative_id, metric_period, new_additional_metrics)
 
-        existing = cursor.fetchone()
+        conn.commit()
+        conn.close()
+        dashboard_cache.invalidate(MONTHLY_TRENDS)
 
-        if existing:
-            # Merge new metrics with existing metrics (don't overwrite)
-            existing_metrics = {}
-            if existing[1]:  # existing[1] is the additional_metrics column
-                try:
-                    existing_metrics = json.loads(existing[1])
-                except:
-                    existing_metrics = {}
+        return jsonify({'message': 'Metrics saved successfully'}), 201
+    except Exception as e:
+        logger.error(f"Error saving metrics: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
-            # Merge: new metrics are added, existing metrics are preserved
-            merged_metrics = {**existing_metrics, **new_additional_metrics}
-            additional_metrics_json = json.dumps(merged_metrics) if merged_metrics else None
+# ==================== Bulk Metrics Import ====================
+# Business units send monthly metrics for many initiatives and periods as one
+# spreadsheet. The upload is read as a stream (csv.reader, or openpyxl in
+# read-only mode), validated in memory against custom_metrics, staged into a
+# temp table with fast_executemany and applied with set-based statements, all
+# in one transaction.
+#
+# The header row picks the layout:
+#   long: initiative_id | metric_period | metric_name | value | comments
+#   wide: initiative_id | metric_period | <metric> | <metric> Comments | ...
+# use_case_name can be given instead of initiative_id in either layout.
+
+METRIC_IMPORT_BATCH_SIZE = int(os.environ.get('METRIC_IMPORT_BATCH_SIZE', '5000'))  # rows per executemany
+METRIC_IMPORT_MAX_ERRORS = int(os.environ.get('METRIC_IMPORT_MAX_ERRORS', '1000'))  # errors listed in the response
+METRIC_IMPORT_MAX_TEXT = 4000  # staging width of raw_value and comments
+METRIC_IMPORT_KEY_COLUMNS = ('initiative_id', 'use_case_name', 'metric_period', 'metric_name', 'value', 'comments')
+METRIC_PERIOD_PATTERN = re.compile(r'\d{4}-(0[1-9]|1[0-2])')
+
+def iter_metric_import_rows(upload):
+    """Yield the rows of an uploaded .csv or .xlsx file as tuples, header first"""
+    filename = (upload.filename or '').lower()
+    if filename.endswith('.csv'):
+        yield from csv.reader(io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''))
+    elif filename.endswith('.xlsx'):
+        from openpyxl import load_workbook
+
+        # read_only parses the sheet XML lazily instead of building every cell up front
+        wb = load_workbook(upload.stream, read_only=True, data_only=True)
+        try:
+            yield from wb.worksheets[0].iter_rows(values_only=True)
+        finally:
+            wb.close()
+    else:
+        raise ValueError('Upload a .csv or .xlsx file')
+
+def is_blank_cell(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+def parse_import_period(value):
+    """YYYY-MM from a text cell or an Excel date cell, or None if invalid"""
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m')
+    period = str(value).strip()
+    return period if METRIC_PERIOD_PATTERN.fullmatch(period) else None
+
+def parse_import_initiative(value, by_id):
+    """Initiative id (or use case name) from a cell, or None if invalid"""
+    if not by_id:
+        return str(value).strip()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
 
-            # Update existing metric
-            cursor.execute("""
-                UPDATE monthly_metrics SET
-                    customer_experience_score = ?,
-                    customer_experience_comments = ?,
-                    time_saved_hours = ?,
-                    time_saved_comments = ?,
-                    cost_saved_rands = ?,
-                    cost_saved_comments = ?,
-                    revenue_increase_rands = ?,
-                    revenue_increase_comments = ?,
-                    processed_units = ?,
-                    processed_units_comments = ?,
-                    model_accuracy = ?,
-                    model_accuracy_comments = ?,
-                    user_adoption_rate = ?,
-                    user_adoption_comments = ?,
-                    error_rate = ?,
-                    error_rate_comments = ?,
-                    response_time_ms = ?,
-                    response_time_comments = ?,
-                    data_quality_score = ?,
-                    data_quality_comments = ?,
-                    user_satisfaction_score = ?,
-                    user_satisfaction_comments = ?,
-                    business_impact_score = ?,
-                    business_impact_comments = ?,
-                    innovation_score = ?,
-                    innovation_comments = ?,
-                    additional_metrics = ?,
-                    modified_at = GETDATE(),
-                    modified_by_name = ?,
-                    modified_by_email = ?
-                WHERE id = ?
-            """, (
-                customer_experience_score,
-                data.get('customer_experience_comments'),
-                time_saved_hours,
-                data.get('time_saved_comments'),
-                cost_saved_rands,
-                data.get('cost_saved_comments'),
-                revenue_increase_rands,
-                data.get('revenue_increase_comments'),
-                processed_units,
-                data.get('processed_units_comments'),
-                model_accuracy,
-                data.get('model_accuracy_comments'),
-                user_adoption_rate,
-                data.get('user_adoption_comments'),
-                error_rate,
-                data.get('error_rate_comments'),
-                response_time_ms,
-                data.get('response_time_comments'),
-                data_quality_score,
-                data.get('data_quality_comments'),
-                user_satisfaction_score,
-                data.get('user_satisfaction_comments'),
-                business_impact_score,
-                data.get('business_impact_comments'),
-                innovation_score,
-                data.get('innovation_comments'),
-                additional_metrics_json,
-                data.get('modified_by_name', DEFAULT_USER['name']),
-                data.get('modified_by_email', DEFAULT_USER['email']),
-                existing[0]
-            ))
+def parse_metric_import(rows, metric_types):
+    """
+    Turn uploaded rows into metric cells.
+
+    metric_types maps lower-cased custom metric names to (metric_name, metric_type).
+    Returns (cells, errors, summary). Each cell is (row, initiative, metric_period,
+    metric_name, numeric_value, raw_value, comments) where initiative is still the
+    id or use case name from the file. Rows are numbered as in the spreadsheet,
+    so the header is row 1. Raises ValueError if the header row is unusable.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if not header:
+        raise ValueError('The file is empty')
+
+    names = ['' if name is None else str(name).strip() for name in header]
+    keys = [name.lower().replace(' ', '_') for name in names]
+    position = {key: index for index, key in reversed(list(enumerate(keys))) if key in METRIC_IMPORT_KEY_COLUMNS}
+    by_id = 'initiative_id' in position
+    if 'metric_period' not in position or not (by_id or 'use_case_name' in position):
+        raise ValueError('The header row needs metric_period and initiative_id (or use_case_name) columns')
+
+    initiative_index = position['initiative_id' if by_id else 'use_case_name']
+    period_index = position['metric_period']
+    errors = []
+
+    def error(row_number, message, column=None):
+        entry = {'row': row_number, 'error': message}
+        if column:
+            entry['column'] = column
+        errors.append(entry)
+
+    if 'metric_name' in position:
+        if 'value' not in position:
+            raise ValueError("The header row has metric_name but no value column")
+        layout = 'long'
+        metric_columns = None
+    else:
+        layout = 'wide'
+        lowered = {name.lower(): index for index, name in enumerate(names) if name}
+        metric_columns = []
+        for index, name in enumerate(names):
+            if not name or keys[index] in METRIC_IMPORT_KEY_COLUMNS:
+                continue
+            if name.lower().endswith(' comments') and name[:-len(' comments')].strip().lower() in lowered:
+                continue
+            metric = metric_types.get(name.lower())
+            if metric is None:
+                error(1, f"Unknown metric '{name}'; add it under custom metrics first", name)
+                continue
+            metric_columns.append((index, metric, lowered.get(f'{name.lower()} comments')))
+        if not metric_columns and not errors:
+            raise ValueError('The header row has no metric columns (or metric_name/value for one metric per row)')
+
+    cells = []
+    rows_read = 0
+    for row_number, row in enumerate(rows, start=2):
+        if not row or all(is_blank_cell(value) for value in row):
+            continue
+        rows_read += 1
+        row = tuple(row) + (None,) * (len(names) - len(row))
+
+        raw_initiative = row[initiative_index]
+        initiative = None if is_blank_cell(raw_initiative) else parse_import_initiative(raw_initiative, by_id)
+        if initiative is None:
+            error(row_number, f"Invalid {'initiative_id' if by_id else 'use_case_name'}: {raw_initiative!r}")
+            continue
+        period = None if is_blank_cell(row[period_index]) else parse_import_period(row[period_index])
+        if period is None:
+            error(row_number, f"Invalid metric_period {row[period_index]!r}; expected YYYY-MM")
+            continue
+
+        if layout == 'long':
+            metric = metric_types.get(str(row[position['metric_name']] or '').strip().lower())
+            if metric is None:
+                error(row_number, f"Unknown metric '{row[position['metric_name']]}'")
+                continue
+            comments_index = position.get('comments')
+            entries = [(metric, row[position['value']], None if comments_index is None else row[comments_index], True)]
         else:
-            # Insert new metric (first time for this period)
-            additional_metrics_json = json.dumps(new_additional_metrics) if new_additional_metrics else None
+            entries = [
+                (metric, row[index], None if comments_index is None else row[comments_index], False)
+                for index, metric, comments_index in metric_columns
+            ]
+
+        for (metric_name, metric_type), value, comments, required in entries:
+            if is_blank_cell(value):
+                # A blank cell in the wide layout just means no value for that metric
+                if required:
+                    error(row_number, f"Missing value for '{metric_name}'")
+                continue
+
+            if metric_type == 'quantitative':
+                value = convert_to_numeric(value.strip() if isinstance(value, str) else value)
+                if value is None or not math.isfinite(value):
+                    error(row_number, f"'{metric_name}' must be a number", metric_name)
+                    continue
+            elif not isinstance(value, (int, float)):
+                value = str(value).strip()
+
+            comments = None if is_blank_cell(comments) else str(comments).strip()
+            name, numeric_value, raw_value, comments = metric_value_columns(metric_name, {'value': value, 'comments': comments})
+            if len(raw_value) > METRIC_IMPORT_MAX_TEXT or len(comments or '') > METRIC_IMPORT_MAX_TEXT:
+                error(row_number, f"'{metric_name}' value or comments exceed {METRIC_IMPORT_MAX_TEXT} characters", metric_name)
+                continue
+            cells.append((row_number, initiative, period, name, numeric_value, raw_value, comments))
+
+    return cells, errors, {'layout': layout, 'by_id': by_id, 'rows_read': rows_read}
+
+def resolve_metric_import(cursor, cells, by_id, errors):
+    """
+    Map each cell's initiative to an existing id and drop repeated cells.
 
-            cursor.execute("""
-                INSERT INTO monthly_metrics (
-                    initiative_id, metric_period,
-                    customer_experience_score, customer_experience_comments,
-                    time_saved_hours, time_saved_comments,
-                    cost_saved_rands, cost_saved_comments,
-                    revenue_increase_rands, revenue_increase_comments,
-                    processed_units, processed_units_comments,
-                    model_accuracy, model_accuracy_comments,
-                    user_adoption_rate, user_adoption_comments,
-                    error_rate, error_rate_comments,
-                    response_time_ms, response_time_comments,
-                    data_quality_score, data_quality_comments,
-                    user_satisfaction_score, user_satisfaction_comments,
-                    business_impact_score, business_impact_comments,
-                    innovation_score, innovation_comments,
-                    additional_metrics,
-                    created_by_name, created_by_email,
-                    modified_by_name, modified_by_email
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                initiative_id, metric_period,
-                customer_experience_score,
-                data.get('customer_experience_comments'),
-                time_saved_hours,
-                data.get('time_saved_comments'),
-                cost_saved_rands,
-                data.get('cost_saved_comments'),
-                revenue_increase_rands,
-                data.get('revenue_increase_comments'),
-                processed_units,
-                data.get('processed_units_comments'),
-                model_accuracy,
-                data.get('model_accuracy_comments'),
-                user_adoption_rate,
-                data.get('user_adoption_comments'),
-                error_rate,
-                data.get('error_rate_comments'),
-                response_time_ms,
-                data.get('response_time_comments'),
-                data_quality_score,
-                data.get('data_quality_comments'),
-                user_satisfaction_score,
-                data.get('user_satisfaction_comments'),
-                business_impact_score,
-                data.get('business_impact_comments'),
-                innovation_score,
-                data.get('innovation_comments'),
-                additional_metrics_json,
-                data.get('created_by_name', DEFAULT_USER['name']),
-                data.get('created_by_email', DEFAULT_USER['email']),
-                data.get('modified_by_name', DEFAULT_USER['name']),
-                data.get('modified_by_email', DEFAULT_USER['email'])
-            ))
+    Returns staging rows (initiative_id, metric_period, metric_name, numeric_value,
+    raw_value, comments); problems are appended to errors.
+    """
+    references = list({cell[1] for cell in cells})
+    if by_id:
+        cursor.execute("SELECT id FROM initiatives WHERE id IN (SELECT CAST(value AS INT) FROM OPENJSON(?))",
+                       json.dumps(references))
+        known = {row[0]: row[0] for row in cursor.fetchall()}
+    else:
+        cursor.execute("SELECT use_case_name, id FROM initiatives WHERE use_case_name IN (SELECT value FROM OPENJSON(?))",
+                       json.dumps(references))
+        matches = {}
+        for name, initiative_id in cursor.fetchall():
+            matches.setdefault(name.lower(), []).append(initiative_id)
+        known = {}
+        for name in references:
+            ids = matches.get(name.lower(), [])
+            known[name] = ids[0] if len(ids) == 1 else (None if not ids else ids)
+
+    staged = []
+    seen = {}
+    for row_number, initiative, period, metric_name, numeric_value, raw_value, comments in cells:
+        initiative_id = known.get(initiative)
+        if initiative_id is None:
+            errors.append({'row': row_number, 'error': f"Initiative {initiative!r} not found"})
+            continue
+        if isinstance(initiative_id, list):
+            errors.append({'row': row_number, 'error': f"Use case name {initiative!r} matches initiatives {initiative_id}; use initiative_id"})
+            continue
+        key = (initiative_id, period, metric_name)
+        if key in seen:
+            errors.append({'row': row_number, 'column': metric_name,
+                           'error': f"'{metric_name}' for {period} is already given on row {seen[key]}"})
+            continue
+        seen[key] = row_number
+        staged.append((initiative_id, period, metric_name, numeric_value, raw_value, comments))
+    return staged
+
+def write_metric_import(cursor, staged, user):
+    """
+    Apply staged metric cells in the caller's transaction; returns period counts.
 
-        conn.commit()
+    Cells are bulk-loaded into #metric_import in METRIC_IMPORT_BATCH_SIZE chunks,
+    then missing monthly_metrics rows are inserted, each period's entries are merged
+    into additional_metrics with one JSON patch per period, and metric_values is
+    replaced for the imported metrics - a handful of statements however many cells
+    there are.
+    """
+    cursor.execute(f"""
+        IF OBJECT_ID('tempdb..#metric_import') IS NOT NULL DROP TABLE #metric_import;
+        CREATE TABLE #metric_import (
+            initiative_id INT NOT NULL,
+            metric_period NVARCHAR(7) COLLATE DATABASE_DEFAULT NOT NULL,
+            metric_name NVARCHAR(255) COLLATE DATABASE_DEFAULT NOT NULL,
+            numeric_value FLOAT,
+            raw_value NVARCHAR({METRIC_IMPORT_MAX_TEXT}) COLLATE DATABASE_DEFAULT,
+            comments NVARCHAR({METRIC_IMPORT_MAX_TEXT}) COLLATE DATABASE_DEFAULT,
+            PRIMARY KEY (initiative_id, metric_period, metric_name)
+        );
+    """)
+
+    # fast_executemany sends each chunk as one parameter array instead of a round trip per row
+    cursor.fast_executemany = True
+    for start in range(0, len(staged), METRIC_IMPORT_BATCH_SIZE):
+        cursor.executemany("INSERT INTO #metric_import VALUES (?, ?, ?, ?, ?, ?)",
+                           staged[start:start + METRIC_IMPORT_BATCH_SIZE])
+    cursor.fast_executemany = False
+
+    cursor.execute("""
+        SET NOCOUNT ON;
+        DECLARE @created_periods INT, @updated_periods INT;
+
+        INSERT INTO monthly_metrics (initiative_id, metric_period, created_by_name, created_by_email, modified_by_name, modified_by_email)
+        SELECT DISTINCT s.initiative_id, s.metric_period, ?, ?, ?, ?
+        FROM #metric_import s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM monthly_metrics m WITH (UPDLOCK, HOLDLOCK)
+            WHERE m.initiative_id = s.initiative_id AND m.metric_period = s.metric_period
+        );
+        SET @created_periods = @@ROWCOUNT;
+
+        UPDATE m SET
+            additional_metrics = dbo.json_merge_objects(m.additional_metrics, p.patch),
+            modified_at = GETDATE(),
+            modified_by_name = ?,
+            modified_by_email = ?
+        FROM monthly_metrics m
+        JOIN (
+            SELECT initiative_id, metric_period,
+                N'{' + STRING_AGG(CAST(
+                    N'"' + STRING_ESCAPE(metric_name, 'json') + N'":{"value":' + raw_value +
+                    N',"comments":' + ISNULL(N'"' + STRING_ESCAPE(comments, 'json') + N'"', N'null') + N'}'
+                AS NVARCHAR(MAX)), N',') + N'}' AS patch
+            FROM #metric_import
+            GROUP BY initiative_id, metric_period
+        ) p ON p.initiative_id = m.initiative_id AND p.metric_period = m.metric_period;
+        SET @updated_periods = @@ROWCOUNT - @created_periods;
+
+        DELETE mv FROM metric_values mv
+        JOIN #metric_import s
+            ON s.initiative_id = mv.initiative_id AND s.metric_period = mv.metric_period AND s.metric_name = mv.metric_name;
+
+        INSERT INTO metric_values (monthly_metric_id, initiative_id, metric_period, metric_name, numeric_value, raw_value, comments)
+        SELECT m.id, s.initiative_id, s.metric_period, s.metric_name, s.numeric_value, s.raw_value, s.comments
+        FROM #metric_import s
+        JOIN monthly_metrics m ON m.initiative_id = s.initiative_id AND m.metric_period = s.metric_period;
+
+        DROP TABLE #metric_import;
+        SELECT @created_periods AS created_periods, @updated_periods AS updated_periods;
+    """, (user['name'], user['email'], user['name'], user['email'], user['name'], user['email']))
+    created_periods, updated_periods = cursor.fetchone()
+    return {'created_periods': created_periods, 'updated_periods': updated_periods}
+
+@app.route('/api/metrics/import', methods=['POST'])
+def import_metrics():
+    """
+    Bulk import monthly metrics from a .csv or .xlsx upload (multipart field 'file').
+
+    Query params:
+        on_error: 'abort' (default) imports nothing if any row is invalid;
+                  'skip' imports the valid cells and reports the rest
+        dry_run:  'true' validates and reports without writing
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is None:
+            return jsonify({'error': "Expected a multipart file field named 'file'"}), 400
+        on_error = request.args.get('on_error', 'abort')
+        if on_error not in ('abort', 'skip'):
+            return jsonify({'error': "on_error must be 'abort' or 'skip'"}), 400
+        dry_run = request.args.get('dry_run') == 'true'
+        user = {
+            'name': request.form.get('modified_by_name', DEFAULT_USER['name']),
+            'email': request.form.get('modified_by_email', DEFAULT_USER['email'])
+        }
+
+        timings = {}
+        started = time.perf_counter()
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT metric_name, metric_type FROM custom_metrics WHERE is_active = 1")
+        metric_types = {name.lower(): (name, metric_type) for name, metric_type in cursor.fetchall()}
+
+        try:
+            cells, errors, summary = parse_metric_import(iter_metric_import_rows(upload), metric_types)
+        except (ValueError, UnicodeDecodeError, csv.Error, zipfile.BadZipFile) as e:
+            conn.close()
+            return jsonify({'error': f'Could not read the upload: {str(e)}'}), 400
+        timings['parse_ms'] = (time.perf_counter() - started) * 1000
+
+        mark = time.perf_counter()
+        staged = resolve_metric_import(cursor, cells, summary.pop('by_id'), errors)
+        errors.sort(key=lambda entry: entry['row'])
+        timings['validate_ms'] = (time.perf_counter() - mark) * 1000
+
+        result = {
+            **summary,
+            'cells': len(staged),
+            'initiatives': len({cell[0] for cell in staged}),
+            'periods': len({cell[:2] for cell in staged}),
+            'error_count': len(errors),
+            'errors': errors[:METRIC_IMPORT_MAX_ERRORS],
+            'errors_truncated': len(errors) > METRIC_IMPORT_MAX_ERRORS,
+            'dry_run': dry_run,
+            'imported': False
+        }
+
+        if errors and on_error == 'abort':
+            conn.close()
+            result['error'] = f"{len(errors)} problem(s) found; nothing was imported"
+            result['timings_ms'] = {key: round(value, 1) for key, value in timings.items()}
+            return jsonify(result), 400
+
+        if staged and not dry_run:
+            mark = time.perf_counter()
+            result.update(write_metric_import(cursor, staged, user))
+            conn.commit()
+            timings['write_ms'] = (time.perf_counter() - mark) * 1000
+            result['imported'] = True
+            dashboard_cache.invalidate(MONTHLY_TRENDS)
         conn.close()
 
-        return jsonify({'message': 'Metrics saved successfully'}), 201
+        timings['total_ms'] = (time.perf_counter() - started) * 1000
+        result['timings_ms'] = {key: round(value, 1) for key, value in timings.items()}
+        return jsonify(result), 200
     except Exception as e:
-        logger.error(f"Error saving metrics: {str(e)}")
+        logger.error(f"Error importing metrics: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 # ==================== Field Options (Management View) ====================
@@ -1721,6 +4006,7 @@ def update_field_option(option_id):
 
         conn.commit()
         conn.close()
+        dashboard_cache.invalidate(DASHBOARD_STATS)
 
         return jsonify({'message': 'Field option updated successfully'})
     except Exception as e:
@@ -1755,35 +4041,42 @@ def delete_field_option(option_id):
 
 @app.route('/api/featured-solutions', methods=['GET'])
 def get_featured_solutions():
-    """Get featured solutions for a specific month"""
+    """Get featured solutions for a specific month (fields=/exclude= choose the returned columns)"""
     try:
         month = request.args.get('month')  # Format: YYYY-MM
 
+        try:
+            fields = resolve_fields(INITIATIVE_FIELD_SETS['all'], INITIATIVE_FIELD_SETS['all'], INITIATIVE_FIELD_SETS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        select_columns = initiative_select_list([field for field in fields if field in INITIATIVE_COLUMNS])
+
         conn = get_db_connection()
         cursor = conn.cursor()
 
         if month:
-            cursor.execute("""
-                SELECT * FROM initiatives
+            cursor.execute(f"""
+                SELECT {select_columns} FROM initiatives
                 WHERE is_featured = 1 AND featured_month = ?
                 ORDER BY modified_at DESC
             """, month)
         else:
-            cursor.execute("""
-                SELECT * FROM initiatives
+            cursor.execute(f"""
+                SELECT {select_columns} FROM initiatives
                 WHERE is_featured = 1
                 ORDER BY featured_month DESC, modified_at DESC
             """)
 
         solutions = [dict_from_row(cursor, row) for row in cursor.fetchall()]
-
-        # Get departments for each solution
         for solution in solutions:
-            cursor.execute("""
-                SELECT department FROM initiative_departments
-                WHERE initiative_id = ?
-            """, solution['id'])
-            solution['departments'] = [row[0] for row in cursor.fetchall()]
+            present_initiative_image(solution, size='sm')
+
+        # Get departments for all solutions in one query
+        if 'departments' in fields:
+            departments = load_related(cursor, 'initiative_departments', 'initiative_id', 'department',
+                                       [solution['id'] for solution in solutions])
+            for solution in solutions:
+                solution['departments'] = departments[solution['id']]
 
         conn.close()
         return jsonify(solutions)
@@ -2158,16 +4451,982 @@ def delete_progress_update(update_id):
         logger.error(f"Error deleting progress update: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
-# ==================== ROI Assistant ====================
+# ==================== Recommendation Cache ====================
+# Assistant recommendations are cached by a hash of the normalized answers the
+# prompt is built from, plus the prompt version and deployment, so identical
+# questionnaires skip the multi-second completion. Lookups try an in-process
+# LRU first, then the llm_response_cache table, which survives restarts and is
+# shared by every worker. Entries expire after LLM_CACHE_TTL_SECONDS; sending
+# "regenerate": true (or ?regenerate=true) skips the lookup and replaces the
+# entry with a fresh completion.
+
+LLM_CACHE_CONFIG = {
+    'enabled': os.environ.get('LLM_CACHE_ENABLED', 'true').lower() == 'true',
+    'ttl_seconds': int(os.environ.get('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600))),
+    'memory_entries': int(os.environ.get('LLM_CACHE_MEMORY_ENTRIES', '256')),
+    'memory_ttl_seconds': float(os.environ.get('LLM_CACHE_MEMORY_TTL_SECONDS', '3600'))
+}
 
-@app.route('/api/roi-assistant', methods=['POST'])
-def roi_assistant():
-    """Get ROI recommendations from OpenAI based on user responses"""
+def normalize_answer(value):
+    """Canonical form of a questionnaire answer: trimmed, single-spaced, case-folded; blank is None"""
+    if isinstance(value, str):
+        return ' '.join(value.split()).casefold() or None
+    if isinstance(value, (list, tuple)):
+        return [normalize_answer(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): normalize_answer(item) for key, item in value.items()}
+    return value
+
+def recommendation_cache_key(assistant, prompt_version, answers):
+    """sha256 hex over the assistant, prompt version, deployment and normalized answers"""
+    canonical = json.dumps({
+        'assistant': assistant,
+        'prompt_version': prompt_version,
+        'deployment': OPENAI_CHAT_DEPLOYMENT,
+        'answers': {field: normalize_answer(value) for field, value in answers.items()}
+    }, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def wants_regenerate(data):
+    """Pop the regenerate flag from a request body (so it is not stored with the answers)"""
+    flag = data.pop('regenerate', False) if isinstance(data, dict) else False
+    return flag is True or request.args.get('regenerate') == 'true'
+
+class RecommendationCache:
+    """
+    Two-tier cache of assistant recommendations.
+
+    The memory tier is a TTLCache namespaced by assistant; the persistent tier
+    is the llm_response_cache table. Database errors are logged and treated as
+    misses, so the cache never fails a request. latency_saved_ms adds up, for
+    every hit, the stored generation time minus the time the lookup took.
+    """
+
+    def __init__(self, enabled=True, ttl_seconds=7 * 24 * 3600, memory_entries=256, memory_ttl_seconds=3600):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(max_entries=memory_entries, ttl_seconds=memory_ttl_seconds)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, assistant, **amounts):
+        with self._lock:
+            stats = self._stats.setdefault(assistant, {
+                'memory_hits': 0, 'database_hits': 0, 'misses': 0, 'bypasses': 0, 'latency_saved_ms': 0.0
+            })
+            for counter, amount in amounts.items():
+                stats[counter] += amount
+
+    def lookup(self, assistant, key, regenerate=False):
+        """
+        Find a cached recommendation.
+
+        Returns:
+            (text or None, token) - pass token back to store() after generating
+        """
+        if not self.enabled:
+            return None, None
+        if regenerate:
+            self._count(assistant, bypasses=1)
+            return None, self.memory.generation(assistant)
+
+        started = time.perf_counter()
+        hit, entry, generation = self.memory.get((assistant, key))
+        tier = 'memory_hits'
+        if not hit:
+            entry = self._load(key)
+            tier = 'database_hits'
+            if entry is not None:
+                self.memory.set((assistant, key), entry, generation)
+        if entry is None:
+            self._count(assistant, misses=1)
+            return None, generation
+
+        text, generation_ms = entry
+        lookup_ms = (time.perf_counter() - started) * 1000
+        self._count(assistant, **{tier: 1, 'latency_saved_ms': max(0.0, (generation_ms or 0) - lookup_ms)})
+        return text, generation
+
+    def _load(self, key):
+        # Checked out of the pool directly: the request-scoped connection would stay
+        # checked out for the whole completion that follows a miss
+        try:
+            conn = db_pool.acquire()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE llm_response_cache
+                    SET hit_count = hit_count + 1, last_hit_at = SYSUTCDATETIME()
+                    OUTPUT INSERTED.response, INSERTED.generation_ms
+                    WHERE cache_key = ? AND expires_at > SYSUTCDATETIME()
+                """, key)
+                row = cursor.fetchone()
+                conn.commit()
+            finally:
+                conn.close()
+            return (row[0], row[1]) if row else None
+        except Exception as e:
+            logger.warning(f"Recommendation cache lookup failed: {str(e)}")
+            return None
+
+    def store(self, assistant, key, prompt_version, text, generation_ms, token):
+        """Save a fresh recommendation in both tiers (the memory tier skips it if purged since lookup)"""
+        if not self.enabled or not text:
+            return
+        self.memory.set((assistant, key), (text, generation_ms), token)
+        try:
+            conn = db_pool.acquire()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    MERGE llm_response_cache WITH (HOLDLOCK) AS target
+                    USING (SELECT ? AS cache_key, ? AS assistant, ? AS prompt_version, ? AS response,
+                                  ? AS generation_ms, DATEADD(SECOND, ?, SYSUTCDATETIME()) AS expires_at) AS source
+                    ON target.cache_key = source.cache_key
+                    WHEN MATCHED THEN UPDATE SET
+                        response = source.response,
+                        generation_ms = source.generation_ms,
+                        created_at = SYSUTCDATETIME(),
+                        expires_at = source.expires_at,
+                        hit_count = 0
+                    WHEN NOT MATCHED THEN INSERT (cache_key, assistant, prompt_version, response, generation_ms, expires_at)
+                        VALUES (source.cache_key, source.assistant, source.prompt_version, source.response,
+                                source.generation_ms, source.expires_at);
+                """, (key, assistant, prompt_version, text, round(generation_ms), self.ttl_seconds))
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Recommendation cache store failed: {str(e)}")
+
+    def purge(self, assistant=None, expired_only=False):
+        """Delete entries (all, or only expired ones) for one assistant or all; returns database rows removed"""
+        if not expired_only:
+            with self._lock:
+                namespaces = [assistant] if assistant else list(self._stats)
+            self.memory.invalidate(*namespaces)
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            DELETE FROM llm_response_cache
+            WHERE (? IS NULL OR assistant = ?)
+              AND (? = 0 OR expires_at <= SYSUTCDATETIME())
+        """, (assistant, assistant, 1 if expired_only else 0))
+        purged = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return purged
+
+    def stats(self):
+        """Hit/miss/bypass counters, hit rate and latency saved per assistant"""
+        with self._lock:
+            assistants = {name: dict(counters) for name, counters in self._stats.items()}
+        for counters in assistants.values():
+            hits = counters['memory_hits'] + counters['database_hits']
+            lookups = hits + counters['misses']
+            counters['hit_rate'] = round(hits / lookups, 4) if lookups else 0
+            counters['latency_saved_ms'] = round(counters['latency_saved_ms'], 1)
+        return {
+            'enabled': self.enabled,
+            'ttl_seconds': self.ttl_seconds,
+            'memory_entries': self.memory.stats()['entries'],
+            'assistants': assistants
+        }
+
+recommendation_cache = RecommendationCache(**LLM_CACHE_CONFIG)
+
+@app.route('/api/llm/cache-stats', methods=['GET'])
+def get_llm_cache_stats():
+    """Recommendation cache hit rate and latency saved, plus database tier size"""
+    stats = recommendation_cache.stats()
     try:
-        data = request.json
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT assistant, COUNT(*), SUM(CASE WHEN expires_at > SYSUTCDATETIME() THEN 1 ELSE 0 END)
+            FROM llm_response_cache
+            GROUP BY assistant
+        """)
+        stats['database_entries'] = {row[0]: {'total': row[1], 'live': row[2]} for row in cursor.fetchall()}
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Could not count recommendation cache entries: {str(e)}")
+    return jsonify(stats)
+
+@app.route('/api/llm/cache', methods=['DELETE'])
+def purge_llm_cache():
+    """Purge the recommendation cache (?assistant= limits it to one, ?expired=true keeps live entries)"""
+    try:
+        purged = recommendation_cache.purge(request.args.get('assistant'), request.args.get('expired') == 'true')
+        return jsonify({'message': 'Recommendation cache purged', 'database_entries_removed': purged})
+    except Exception as e:
+        logger.error(f"Error purging recommendation cache: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.cli.command('purge-llm-cache')
+@click.option('--assistant', default=None, help='Only purge this assistant (roi-assistant, complexity-analyzer)')
+@click.option('--expired-only', is_flag=True, help='Only remove entries past their TTL')
+def purge_llm_cache_command(assistant, expired_only):
+    """Remove cached assistant recommendations from the database tier"""
+    purged = recommendation_cache.purge(assistant, expired_only)
+    click.echo(f"Removed {purged} cached recommendations")
+
+# ==================== LLM Executor ====================
+# Every OpenAI call goes through llm_executor, which caps how many run at once
+# (LLM_MAX_CONCURRENCY), paces them with token buckets for requests and tokens
+# per minute, and retries 429s, 5xxs and connection errors with exponential
+# backoff and full jitter. A Retry-After from Azure is honored and also pauses
+# the other callers until it has passed. The OpenAI client's own retries are
+# turned off so this is the only retry policy.
+#
+# The assistants also have a submit-and-poll API (POST .../jobs, then
+# GET /api/llm/jobs/<id>) that runs the request on the executor's job pool, so
+# a burst of analyses queues up (bounded by LLM_MAX_QUEUED) instead of holding
+# request threads.
+
+LLM_EXECUTOR_CONFIG = {
+    'max_concurrency': int(os.environ.get('LLM_MAX_CONCURRENCY', '4')),
+    'max_queued': int(os.environ.get('LLM_MAX_QUEUED', '50')),
+    'requests_per_minute': float(os.environ.get('LLM_REQUESTS_PER_MINUTE', '60')),
+    'tokens_per_minute': float(os.environ.get('LLM_TOKENS_PER_MINUTE', '0')),  # 0 disables token pacing
+    'max_retries': int(os.environ.get('LLM_MAX_RETRIES', '4')),
+    'backoff_base_seconds': float(os.environ.get('LLM_BACKOFF_BASE_SECONDS', '1')),
+    'backoff_max_seconds': float(os.environ.get('LLM_BACKOFF_MAX_SECONDS', '30')),
+    'slot_timeout_seconds': float(os.environ.get('LLM_SLOT_TIMEOUT_SECONDS', '60')),
+    'job_retention_seconds': float(os.environ.get('LLM_JOB_RETENTION_SECONDS', '900'))
+}
+
+class LLMBusyError(Exception):
+    """Raised when the LLM executor has no free slot or queue space"""
+
+class TokenBucket:
+    """Thread-safe token bucket refilling at rate tokens per second up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        """Take amount tokens, sleeping until they are available; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+def retry_after_seconds(error):
+    """Seconds from a Retry-After (or Azure's retry-after-ms) header on an OpenAI error, or None"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    return None
+
+def is_retryable_llm_error(error):
+    """Throttling, server errors and dropped connections are worth retrying"""
+    if isinstance(error, APIConnectionError):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+def estimate_llm_tokens(messages, max_tokens):
+    """Rough token cost of a request for pacing: ~4 characters per prompt token plus the completion budget"""
+    return sum(len(message['content']) for message in messages) // 4 + max_tokens
+
+class LLMExecutor:
+    """
+    Concurrency cap, rate limiting, retries and a bounded job queue for LLM calls.
+
+    call() runs a request in the caller's thread once a slot is free; slot() and
+    run() split that up for streams, which must hold the slot while they are
+    read. submit() queues a whole assistant request on the job pool.
+    """
+
+    def __init__(self, max_concurrency, max_queued, requests_per_minute, tokens_per_minute, max_retries,
+                 backoff_base_seconds, backoff_max_seconds, slot_timeout_seconds, job_retention_seconds):
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.slot_timeout_seconds = slot_timeout_seconds
+        self.job_retention_seconds = job_retention_seconds
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._requests = TokenBucket(requests_per_minute / 60, max(1.0, float(max_concurrency))) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute / 6) if tokens_per_minute > 0 else None
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._cooldown_until = 0.0
+        self._stats = {
+            'calls': 0, 'failed': 0, 'retries': 0, 'throttled': 0, 'busy_rejections': 0,
+            'in_flight': 0, 'max_in_flight': 0, 'slot_wait_ms': 0.0, 'rate_limit_wait_ms': 0.0
+        }
+
+    def _count(self, **amounts):
+        with self._lock:
+            for counter, amount in amounts.items():
+                self._stats[counter] += amount
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the max_concurrency slots; raises LLMBusyError after slot_timeout_seconds"""
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.slot_timeout_seconds):
+            self._count(busy_rejections=1)
+            raise LLMBusyError('The assistant is busy, please try again shortly')
+        with self._lock:
+            self._stats['slot_wait_ms'] += (time.perf_counter() - started) * 1000
+            self._stats['in_flight'] += 1
+            self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._stats['in_flight'])
+        try:
+            yield
+        finally:
+            self._count(in_flight=-1)
+            self._slots.release()
+
+    def _wait_for_capacity(self, tokens):
+        waited = 0.0
+        with self._lock:
+            cooldown = self._cooldown_until - time.monotonic()
+        if cooldown > 0:
+            time.sleep(cooldown)
+            waited += cooldown
+        if self._requests:
+            waited += self._requests.acquire()
+        if self._tokens:
+            waited += self._tokens.acquire(tokens)
+        if waited:
+            self._count(rate_limit_wait_ms=waited * 1000)
+
+    def _backoff(self, attempt, retry_after):
+        if retry_after is not None:
+            # Honor the server's hint, with a little jitter so waiting callers don't retry in lockstep
+            return retry_after + random.uniform(0, self.backoff_base_seconds)
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt))
+
+    def run(self, request_fn, tokens=1):
+        """Run request_fn with pacing and retries (the caller should hold a slot)"""
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_capacity(tokens)
+            self._count(calls=1)
+            try:
+                return request_fn()
+            except Exception as e:
+                if not is_retryable_llm_error(e) or attempt == self.max_retries:
+                    self._count(failed=1)
+                    raise
+                retry_after = retry_after_seconds(e)
+                delay = self._backoff(attempt, retry_after)
+                throttled = getattr(e, 'status_code', None) == 429
+                self._count(retries=1, throttled=1 if throttled else 0)
+                if throttled and retry_after is not None:
+                    with self._lock:
+                        self._cooldown_until = max(self._cooldown_until, time.monotonic() + retry_after)
+                logger.warning(f"LLM call failed ({str(e)}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def call(self, request_fn, tokens=1):
+        """Run request_fn in a slot, with pacing and retries"""
+        with self.slot():
+            return self.run(request_fn, tokens)
+
+    def submit(self, kind, job_fn, error_message):
+        """Queue job_fn() on the job pool; returns the job snapshot, or None when the queue is full"""
+        self.purge_expired()
+        with self._lock:
+            queued = sum(1 for job in self._jobs.values() if job['status'] == 'queued')
+            if queued >= self.max_queued:
+                self._stats['busy_rejections'] += 1
+                return None
+            job_id = os.urandom(16).hex()
+            self._jobs[job_id] = {
+                'id': job_id,
+                'kind': kind,
+                'status': 'queued',
+                'result': None,
+                'error': None,
+                'created_at': datetime.now(),
+                'started_at': None,
+                'finished_at': None
+            }
+            snapshot = self._snapshot(self._jobs[job_id])
+        self._pool.submit(self._run_job, job_id, job_fn, error_message)
+        return snapshot
+
+    def _run_job(self, job_id, job_fn, error_message):
+        with self._lock:
+            self._jobs[job_id].update(status='running', started_at=datetime.now())
+        try:
+            result = job_fn()
+            changes = {'status': 'completed', 'result': result}
+        except Exception as e:
+            logger.error(f"Error running LLM job {job_id}: {str(e)}")
+            changes = {'status': 'failed', 'error': str(e) if isinstance(e, LLMBusyError) else error_message}
+        with self._lock:
+            self._jobs[job_id].update(changes, finished_at=datetime.now())
+
+    def get(self, job_id):
+        """Snapshot of a job, or None if it is unknown or has expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def _snapshot(self, job):
+        def elapsed_ms(start, end):
+            return round((end - start).total_seconds() * 1000, 1) if start and end else None
+
+        return {
+            'id': job['id'],
+            'kind': job['kind'],
+            'status': job['status'],
+            'result': job['result'],
+            'error': job['error'],
+            'created_at': job['created_at'].isoformat(),
+            'started_at': job['started_at'].isoformat() if job['started_at'] else None,
+            'finished_at': job['finished_at'].isoformat() if job['finished_at'] else None,
+            'queued_ms': elapsed_ms(job['created_at'], job['started_at']),
+            'run_ms': elapsed_ms(job['started_at'], job['finished_at'])
+        }
+
+    def purge_expired(self):
+        """Forget finished jobs older than job_retention_seconds"""
+        cutoff = time.time() - self.job_retention_seconds
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job['finished_at'] and job['finished_at'].timestamp() < cutoff]:
+                del self._jobs[job_id]
+
+    def stats(self):
+        """Slot usage, job queue depth and retry/throttle counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            statuses = [job['status'] for job in self._jobs.values()]
+        stats.update({
+            'max_concurrency': self.max_concurrency,
+            'jobs_queued': statuses.count('queued'),
+            'jobs_running': statuses.count('running'),
+            'max_queued': self.max_queued
+        })
+        for key in ('slot_wait_ms', 'rate_limit_wait_ms'):
+            stats[key] = round(stats[key], 1)
+        return stats
+
+llm_executor = LLMExecutor(**LLM_EXECUTOR_CONFIG)
+
+@app.route('/api/llm/executor-stats', methods=['GET'])
+def get_llm_executor_stats():
+    """LLM concurrency, queue and retry counters"""
+    return jsonify(llm_executor.stats())
+
+@app.route('/api/llm/jobs/<job_id>', methods=['GET'])
+def get_llm_job(job_id):
+    """Status of a queued assistant request; result holds the usual response once completed"""
+    job = llm_executor.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    job['status_url'] = url_for('get_llm_job', job_id=job_id)
+    return jsonify(job)
+
+def submit_llm_job(kind, job_fn, error_message):
+    """202 with the job snapshot, or 429 when the queue is full"""
+    job = llm_executor.submit(kind, job_fn, error_message)
+    if job is None:
+        response = jsonify({'error': 'Too many assistant requests in progress, try again shortly'})
+        response.headers['Retry-After'] = '5'
+        return response, 429
+    job['status_url'] = url_for('get_llm_job', job_id=job['id'])
+    return jsonify(job), 202
+
+# ==================== LLM Assistants ====================
+# The ROI assistant and complexity analyzer each have a blocking endpoint that
+# returns the whole completion as JSON, and a /stream variant that forwards
+# tokens as Server-Sent Events while the model generates them:
+#
+#   event: meta   {...}                      scores known before the LLM call
+#   event: token  {"text": "..."}            one per streamed delta
+#   event: done   {"conversation_id": ..., "ttft_ms": ..., "total_ms": ...}
+#   event: error  {"error": "..."}
+#
+# The conversation is saved once the stream has finished, so it holds the full
+# text; a stream the client abandons is not saved. Time to first token and
+# total latency are kept per endpoint and mode for /api/llm/latency-stats.
+
+OPENAI_CHAT_DEPLOYMENT = os.environ.get('OPENAI_CHAT_DEPLOYMENT', 'gpt-4.1')
+LLM_LATENCY_SAMPLES = int(os.environ.get('LLM_LATENCY_SAMPLES', '500'))  # recent requests kept per endpoint and mode
+
+class LatencyTracker:
+    """Rolling time-to-first-token and total latency samples, keyed by endpoint and mode"""
+
+    def __init__(self, max_samples=500):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._outcomes = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, outcome, total_ms, ttft_ms=None):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.max_samples)).append((ttft_ms, total_ms))
+            outcomes = self._outcomes.setdefault(name, {})
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    @staticmethod
+    def _percentiles(values):
+        if not values:
+            return None
+        values = sorted(values)
+        pick = lambda q: round(values[min(len(values) - 1, int(q * len(values)))], 1)
+        return {'p50': pick(0.5), 'p95': pick(0.95), 'max': round(values[-1], 1)}
+
+    def stats(self):
+        """Outcome counters plus p50/p95/max over the recent samples"""
+        with self._lock:
+            snapshot = {name: (list(samples), dict(self._outcomes[name])) for name, samples in self._samples.items()}
+        return {
+            name: {
+                'outcomes': outcomes,
+                'samples': len(samples),
+                'ttft_ms': self._percentiles([ttft for ttft, _ in samples if ttft is not None]),
+                'total_ms': self._percentiles([total for _, total in samples])
+            }
+            for name, (samples, outcomes) in snapshot.items()
+        }
+
+llm_latency = LatencyTracker(LLM_LATENCY_SAMPLES)
+
+@app.route('/api/llm/latency-stats', methods=['GET'])
+def get_llm_latency_stats():
+    """Time-to-first-token and total latency for the LLM endpoints"""
+    return jsonify(llm_latency.stats())
+
+def sse_event(event, payload):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def sse_response(events):
+    """Streamed text/event-stream response; proxies are asked not to buffer it"""
+    return Response(events, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def complete_chat(name, messages, max_tokens, cache_key=None, prompt_version=None, regenerate=False):
+    """
+    Blocking chat completion, served from the recommendation cache when possible.
+
+    Returns (text, cached). Latency is recorded only for real completions.
+    """
+    token = None
+    if cache_key:
+        cached, token = recommendation_cache.lookup(name, cache_key, regenerate)
+        if cached is not None:
+            return cached, True
+
+    started = time.perf_counter()
+    try:
+        response = llm_executor.call(lambda: openai_client.chat.completions.create(
+            model=OPENAI_CHAT_DEPLOYMENT,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=max_tokens
+        ), tokens=estimate_llm_tokens(messages, max_tokens))
+    except Exception:
+        llm_latency.record(f'{name}/blocking', 'failed', (time.perf_counter() - started) * 1000)
+        raise
+    generation_ms = (time.perf_counter() - started) * 1000
+    llm_latency.record(f'{name}/blocking', 'completed', generation_ms)
+
+    text = response.choices[0].message.content
+    if cache_key:
+        recommendation_cache.store(name, cache_key, prompt_version, text, generation_ms, token)
+    return text, False
+
+def stream_chat_events(name, messages, max_tokens, on_complete, error_message, meta=None,
+                       cache_key=None, prompt_version=None, regenerate=False):
+    """
+    Generate the SSE stream for one chat completion.
+
+    on_complete(text) runs once the last token has arrived and returns extra
+    fields for the done event (e.g. conversation_id). If the client disconnects
+    the generator is closed at its next yield, which also closes the upstream
+    stream, and on_complete is never called. A cached recommendation is sent as
+    a single token event and is not counted in the latency stats.
+    """
+    started = time.perf_counter()
+    ttft_ms = None
+    outcome = 'disconnected'
+    stream = None
+    cached = None
+    try:
+        if meta is not None:
+            yield sse_event('meta', meta)
+
+        token = None
+        if cache_key:
+            cached, token = recommendation_cache.lookup(name, cache_key, regenerate)
+
+        if cached is not None:
+            ttft_ms = (time.perf_counter() - started) * 1000
+            parts = [cached]
+            yield sse_event('token', {'text': cached})
+        else:
+            # The slot is held until the stream has been read; retries only cover opening it
+            with llm_executor.slot():
+                stream = llm_executor.run(lambda: openai_client.chat.completions.create(
+                    model=OPENAI_CHAT_DEPLOYMENT,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    stream=True
+                ), tokens=estimate_llm_tokens(messages, max_tokens))
+                parts = []
+                for chunk in stream:
+                    # Azure sends content-filter results in chunks without choices
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if text:
+                        if ttft_ms is None:
+                            ttft_ms = (time.perf_counter() - started) * 1000
+                        parts.append(text)
+                        yield sse_event('token', {'text': text})
+            if cache_key:
+                recommendation_cache.store(name, cache_key, prompt_version, ''.join(parts),
+                                           (time.perf_counter() - started) * 1000, token)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        result = on_complete(''.join(parts))
+        outcome = 'completed'
+        yield sse_event('done', {
+            **result,
+            'status': 'success',
+            'cached': cached is not None,
+            'ttft_ms': round(ttft_ms, 1) if ttft_ms is not None else None,
+            'total_ms': round(total_ms, 1)
+        })
+    except Exception as e:
+        outcome = 'failed'
+        logger.error(f"Error streaming {name}: {str(e)}")
+        yield sse_event('error', {'error': str(e) if isinstance(e, LLMBusyError) else error_message})
+    finally:
+        if stream is not None:
+            stream.close()
+        total_ms = (time.perf_counter() - started) * 1000
+        if cached is None:
+            llm_latency.record(f'{name}/stream', outcome, total_ms, ttft_ms)
+        logger.info(f"{name} stream {outcome}{' (cached)' if cached is not None else ''}: "
+                    f"ttft={ttft_ms if ttft_ms is None else round(ttft_ms)}ms total={round(total_ms)}ms")
+
+# ==================== Conversation Write-Behind ====================
+# Assistant conversations are saved by a background writer rather than on the
+# request path. Their ids come from SQL Server sequences (roi_conversation_ids,
+# complexity_conversation_ids), reserved in blocks of CONVERSATION_ID_BLOCK_SIZE
+# with sp_sequence_get_range. The id is therefore known, and returned as
+# conversation_id, before the row is written. The writer inserts queued rows in
+# batches every CONVERSATION_FLUSH_INTERVAL_SECONDS.
+#
+# Durability:
+# - Under normal operation a conversation is committed within the flush
+#   interval of being queued.
+# - A failed batch is retried with backoff and is not dropped. Inserts skip ids
+#   that already exist, so retrying after an ambiguous commit never duplicates
+#   a row.
+# - While the database is unreachable, up to CONVERSATION_MAX_PENDING rows wait
+#   in memory. Once the reserved id block runs out, rows are queued without an
+#   id and their saves return no conversation_id; the writer reserves their ids
+#   when it writes them. Beyond CONVERSATION_MAX_PENDING, saves are written
+#   synchronously and, as before, return no conversation_id if that fails.
+# - On a clean shutdown (normal exit, SIGINT or SIGTERM) the queue is flushed
+#   for up to CONVERSATION_SHUTDOWN_TIMEOUT_SECONDS. The ids of any rows still
+#   unsaved after that are logged at ERROR. SIGTERM only reaches the serving
+#   process when the Werkzeug reloader is off (FLASK_USE_RELOADER=false, as in
+#   the Dockerfile). With the reloader on, the reloader process gets SIGTERM
+#   and SIGKILLs the server, which counts as a hard crash.
+# - A hard crash (SIGKILL, OOM kill) loses rows that were queued but not yet
+#   flushed.
+# - The conversation read endpoints wait for this process's pending writes, so
+#   a client can read back what it just created.
+# Set CONVERSATION_WRITE_BEHIND=false to insert synchronously instead.
+
+CONVERSATION_WRITE_CONFIG = {
+    'enabled': os.environ.get('CONVERSATION_WRITE_BEHIND', 'true').lower() == 'true',
+    'batch_size': int(os.environ.get('CONVERSATION_BATCH_SIZE', '100')),
+    'flush_interval_seconds': float(os.environ.get('CONVERSATION_FLUSH_INTERVAL_SECONDS', '0.5')),
+    'max_pending': int(os.environ.get('CONVERSATION_MAX_PENDING', '5000')),
+    'id_block_size': int(os.environ.get('CONVERSATION_ID_BLOCK_SIZE', '50')),
+    'retry_max_seconds': float(os.environ.get('CONVERSATION_RETRY_MAX_SECONDS', '30')),
+    'shutdown_timeout_seconds': float(os.environ.get('CONVERSATION_SHUTDOWN_TIMEOUT_SECONDS', '10'))
+}
+
+# Table -> (id sequence, columns written besides id)
+CONVERSATION_TABLES = {
+    'roi_conversations': ('dbo.roi_conversation_ids', [
+        'user_responses', 'llm_recommendation', 'created_at', 'created_by_name', 'created_by_email'
+    ]),
+    'complexity_conversations': ('dbo.complexity_conversation_ids', [
+        'initiative_name', 'user_responses', 'complexity_score', 'value_score', 'quadrant',
+        'llm_recommendation', 'created_at', 'created_by_name', 'created_by_email'
+    ])
+}
+
+def reserve_conversation_ids(cursor, sequence, count):
+    """Reserve count consecutive ids from a sequence; returns the first"""
+    cursor.execute("""
+        SET NOCOUNT ON;
+        DECLARE @first SQL_VARIANT;
+        EXEC sys.sp_sequence_get_range @sequence_name = ?, @range_size = ?, @range_first_value = @first OUTPUT;
+        SELECT CAST(@first AS INT);
+    """, (sequence, count))
+    return cursor.fetchone()[0]
+
+def insert_conversations(cursor, table, rows):
+    """Insert (id, *columns) rows, skipping ids that are already present"""
+    columns = CONVERSATION_TABLES[table][1]
+    cursor.fast_executemany = True
+    cursor.executemany(f"""
+        INSERT INTO {table} (id, {', '.join(columns)})
+        SELECT {', '.join('?' * (len(columns) + 1))}
+        WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE id = ?)
+    """, [(*row, row[0]) for row in rows])
+    cursor.fast_executemany = False
+
+class ConversationWriter:
+    """
+    Write-behind queue for assistant conversations (see the durability notes above).
+
+    save() reserves an id, queues the row and returns the id. A daemon thread
+    writes queued rows in batches, one transaction per batch. Rows queued while
+    no id could be reserved get theirs just before they are written.
+    """
+
+    def __init__(self, enabled, batch_size, flush_interval_seconds, max_pending, id_block_size,
+                 retry_max_seconds, shutdown_timeout_seconds):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.id_block_size = id_block_size
+        self.retry_max_seconds = retry_max_seconds
+        self.shutdown_timeout_seconds = shutdown_timeout_seconds
+        self._pending = deque()
+        self._id_ranges = {}
+        self._id_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closing = False
+        self._shutdown_deadline = None
+        self._queued_seq = 0
+        self._written_seq = 0
+        self._stats = {
+            'queued': 0, 'written': 0, 'batches': 0, 'batch_failures': 0, 'sync_writes': 0,
+            'id_blocks_reserved': 0, 'queued_without_id': 0, 'lost_on_shutdown': 0, 'max_pending_seen': 0
+        }
+
+    def _next_id(self, table):
+        """Hand out the next reserved id for table, reserving a new block when the current one runs out"""
+        with self._id_lock:
+            next_id, end = self._id_ranges.get(table, (0, 0))
+            if next_id >= end:
+                conn = get_db_connection()
+                try:
+                    next_id = reserve_conversation_ids(conn.cursor(), CONVERSATION_TABLES[table][0], self.id_block_size)
+                    conn.commit()
+                finally:
+                    conn.close()
+                end = next_id + self.id_block_size
+                with self._cond:
+                    self._stats['id_blocks_reserved'] += 1
+            self._id_ranges[table] = (next_id + 1, end)
+            return next_id
+
+    def save(self, table, values):
+        """
+        Queue a conversation row (column values in CONVERSATION_TABLES order).
+
+        Returns its id, or None if the row was queued while no id could be reserved.
+        """
+        try:
+            conversation_id = self._next_id(table)
+        except Exception as e:
+            if not self.enabled:
+                raise
+            # The database is unreachable: keep the row and reserve its id when writing it
+            logger.warning(f"Could not reserve a {table} id, queuing the row without one: {str(e)}")
+            conversation_id = None
+        row = (conversation_id, *values)
+        with self._cond:
+            queue_row = self.enabled and not self._closing and len(self._pending) < self.max_pending
+            if queue_row:
+                self._start()
+                self._queued_seq += 1
+                self._pending.append((self._queued_seq, table, row))
+                self._stats['queued'] += 1
+                if conversation_id is None:
+                    self._stats['queued_without_id'] += 1
+                self._stats['max_pending_seen'] = max(self._stats['max_pending_seen'], len(self._pending))
+                self._cond.notify_all()
+            else:
+                self._stats['sync_writes'] += 1
+        if not queue_row:
+            # Disabled, shutting down or backed up: write in the caller's thread
+            self._write({table: [row]})
+        return row[0]
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='conversation-writer', daemon=True)
+            self._thread.start()
+
+    def _write(self, rows_by_table):
+        # Ids are assigned in place, so a retried batch inserts the same ids again
+        for table, rows in rows_by_table.items():
+            for index, row in enumerate(rows):
+                if row[0] is None:
+                    rows[index] = (self._next_id(table), *row[1:])
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            for table, rows in rows_by_table.items():
+                insert_conversations(cursor, table, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Give a lone row the flush interval to gather company, unless shutting down
+                deadline = time.monotonic() + self.flush_interval_seconds
+                while len(self._pending) < self.batch_size and not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+
+            rows_by_table = {}
+            for _, table, row in batch:
+                rows_by_table.setdefault(table, []).append(row)
+            if not self._write_with_retry(rows_by_table, len(batch)):
+                return
+            with self._cond:
+                self._written_seq = batch[-1][0]
+                self._stats['written'] += len(batch)
+                self._stats['batches'] += 1
+                self._cond.notify_all()
+
+    def _write_with_retry(self, rows_by_table, count):
+        """Write a batch until it succeeds; False if shutdown gave up on it"""
+        attempt = 0
+        while True:
+            try:
+                self._write(rows_by_table)
+                return True
+            except Exception as e:
+                attempt += 1
+                with self._cond:
+                    self._stats['batch_failures'] += 1
+                    closing = self._closing
+                if closing and time.monotonic() >= self._shutdown_deadline:
+                    self._give_up(rows_by_table, e)
+                    return False
+                delay = min(self.retry_max_seconds, 2 ** attempt * 0.5) * random.uniform(0.5, 1)
+                if closing:
+                    delay = min(delay, max(0.0, self._shutdown_deadline - time.monotonic()))
+                logger.warning(f"Failed to write {count} conversations (attempt {attempt}), retrying in {delay:.1f}s: {str(e)}")
+                with self._cond:
+                    self._cond.wait(delay)
+
+    def _give_up(self, rows_by_table, error):
+        """Log what could not be saved before the shutdown deadline"""
+        with self._cond:
+            for _, table, row in self._pending:
+                rows_by_table.setdefault(table, []).append(row)
+            self._pending.clear()
+            lost = sum(len(rows) for rows in rows_by_table.values())
+            self._stats['lost_on_shutdown'] += lost
+        for table, rows in rows_by_table.items():
+            ids = [row[0] for row in rows if row[0] is not None]
+            without_id = f" and {len(rows) - len(ids)} without an id" if len(ids) < len(rows) else ""
+            logger.error(f"Unsaved {table} at shutdown ({str(error)}): ids {ids}{without_id}")
+        logger.error(f"Gave up on {lost} conversations at shutdown")
+
+    def has_pending(self):
+        """Whether any queued row has not been written yet"""
+        with self._cond:
+            return self._written_seq < self._queued_seq
+
+    def wait_for_pending(self, timeout=None):
+        """Block until everything queued so far is written; False on timeout"""
+        timeout = self.flush_interval_seconds * 4 if timeout is None else timeout
+        with self._cond:
+            target = self._queued_seq
+            return self._cond.wait_for(lambda: self._written_seq >= target, timeout)
+
+    def close(self):
+        """Flush the queue and stop the writer, waiting up to shutdown_timeout_seconds"""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._shutdown_deadline = time.monotonic() + self.shutdown_timeout_seconds
+            pending = len(self._pending)
+            self._cond.notify_all()
+        if self._thread is not None:
+            if pending:
+                logger.info(f"Flushing {pending} queued conversations")
+            self._thread.join(self.shutdown_timeout_seconds + 5)
+
+    def stats(self):
+        """Queue depth and write counters"""
+        with self._cond:
+            return {**self._stats, 'pending': len(self._pending), 'enabled': self.enabled}
+
+conversation_writer = ConversationWriter(**CONVERSATION_WRITE_CONFIG)
+atexit.register(conversation_writer.close)
+
+@app.route('/api/llm/conversation-write-stats', methods=['GET'])
+def get_conversation_write_stats():
+    """Write-behind queue depth and counters for assistant conversations"""
+    return jsonify(conversation_writer.stats())
+
+# ==================== ROI Assistant ====================
+
+ROI_ERROR_MESSAGE = 'Failed to generate ROI recommendations. Please try again.'
+ROI_PROMPT_VERSION = 1  # bump when build_roi_messages changes, so cached recommendations are not reused
+ROI_ANSWER_FIELDS = [
+    'initiative_type', 'value_type', 'scale', 'units_processed', 'current_process',
+    'success_metrics', 'timeline', 'industry_specifics'
+]
+
+def roi_cache_key(data):
+    """Recommendation cache key for an ROI questionnaire"""
+    return recommendation_cache_key('roi-assistant', ROI_PROMPT_VERSION, {field: data.get(field) for field in ROI_ANSWER_FIELDS})
 
-        # Build the prompt from user responses
-        prompt = f"""You are an ROI measurement expert for TIH AI and RPA initiatives.
+def build_roi_messages(data):
+    """Chat messages asking for ROI metric guidance for the user's responses"""
+    prompt = f"""You are an ROI measurement expert for TIH AI and RPA initiatives.
 A user is planning to implement an initiative and needs guidance on which ROI metrics to use and how to measure them.
 
 Here is the information provided about the initiative:
@@ -2211,74 +5470,101 @@ IMPORTANT GUIDELINES:
 - Format your response clearly with headers and bullet points for readability
 - Your response must get to the point. Respond with guidance and dont start with terms such as 'Certainly' or 'Sure I can help with that...'"""
 
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
-            model="gpt-4.1",  # Using gpt-4.1 deployment
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an expert ROI consultant for TIH that operates in South Africa. You provide clear, professional, actionable guidance on how users can measure return on investment for AI and RPA initiatives. You never use emojis and always write in a professional manner suitable for executive reporting.
+    return [
+        {
+            "role": "system",
+            "content": """You are an expert ROI consultant for TIH that operates in South Africa. You provide clear, professional, actionable guidance on how users can measure return on investment for AI and RPA initiatives. You never use emojis and always write in a professional manner suitable for executive reporting.
                                   Your reponse must provide ROI metrics that the user must consider to for their initiative. Provide clear guidelines for the user to follow with appropiate calculation guides."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=2000
-        )
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
 
-        recommendation = response.choices[0].message.content
+def save_roi_conversation(data, recommendation):
+    """Queue an ROI assistant exchange for saving; returns its id, or None if the save failed"""
+    try:
+        return conversation_writer.save('roi_conversations', (
+            json.dumps(data),
+            recommendation,
+            datetime.now(),
+            DEFAULT_USER['name'],
+            DEFAULT_USER['email']
+        ))
+    except Exception as db_error:
+        # Don't fail the request if database save fails
+        logger.warning(f"Failed to save ROI conversation to database: {str(db_error)}")
+        return None
 
-        # Save conversation to database for tracking
-        try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+def run_roi_assistant(data, regenerate=False):
+    """Generate (or fetch from cache) an ROI recommendation and save the conversation"""
+    recommendation, cached = complete_chat(
+        'roi-assistant', build_roi_messages(data), max_tokens=2000,
+        cache_key=roi_cache_key(data), prompt_version=ROI_PROMPT_VERSION, regenerate=regenerate
+    )
 
-            import json
-            cursor.execute("""
-                INSERT INTO roi_conversations (
-                    user_responses, llm_recommendation,
-                    created_by_name, created_by_email
-                ) VALUES (?, ?, ?, ?)
-            """, (
-                json.dumps(data),
-                recommendation,
-                DEFAULT_USER['name'],
-                DEFAULT_USER['email']
-            ))
+    # Save conversation to database for tracking
+    save_roi_conversation(data, recommendation)
 
-            conn.commit()
-            conn.close()
-        except Exception as db_error:
-            logger.warning(f"Failed to save ROI conversation to database: {str(db_error)}")
-            # Don't fail the request if database save fails
+    return {
+        'recommendation': recommendation,
+        'cached': cached,
+        'status': 'success'
+    }
 
-        return jsonify({
-            'recommendation': recommendation,
-            'status': 'success'
-        })
+@app.route('/api/roi-assistant', methods=['POST'])
+def roi_assistant():
+    """Get ROI recommendations from OpenAI based on user responses"""
+    try:
+        data = request.json
+        result = run_roi_assistant(data, wants_regenerate(data))
+        return cached_json_response(result, result['cached'])
 
+    except LLMBusyError as e:
+        return jsonify({'error': str(e)}), 429
     except Exception as e:
         logger.error(f"Error in ROI assistant: {str(e)}")
-        return jsonify({'error': 'Failed to generate ROI recommendations. Please try again.'}), 500
+        return jsonify({'error': ROI_ERROR_MESSAGE}), 500
+
+@app.route('/api/roi-assistant/jobs', methods=['POST'])
+def create_roi_assistant_job():
+    """Queue an ROI recommendation; poll the returned status_url for the result"""
+    data = request.json or {}
+    regenerate = wants_regenerate(data)
+    return submit_llm_job('roi-assistant', lambda: run_roi_assistant(data, regenerate), ROI_ERROR_MESSAGE)
+
+@app.route('/api/roi-assistant/stream', methods=['POST'])
+def roi_assistant_stream():
+    """Stream ROI recommendations as Server-Sent Events (see LLM Assistants)"""
+    data = request.json or {}
+    regenerate = wants_regenerate(data)
+    return sse_response(stream_chat_events(
+        'roi-assistant', build_roi_messages(data), 2000,
+        on_complete=lambda recommendation: {'conversation_id': save_roi_conversation(data, recommendation)},
+        error_message=ROI_ERROR_MESSAGE,
+        cache_key=roi_cache_key(data), prompt_version=ROI_PROMPT_VERSION, regenerate=regenerate
+    ))
 
 # ==================== Complexity Analyzer ====================
 
-@app.route('/api/complexity-analyzer', methods=['POST'])
-def complexity_analyzer():
-    """Analyze initiative complexity based on user responses"""
-    try:
-        data = request.json
-
-        # Calculate complexity score based on user responses
-        complexity_score = calculate_complexity_score(data)
-        value_score = calculate_value_score(data)
-        quadrant = determine_quadrant(complexity_score, value_score)
-
-        # Build the prompt from user responses
-        prompt = f"""You are an AI initiative complexity expert for TIH operating in South Africa.
+COMPLEXITY_ERROR_MESSAGE = 'Failed to analyze complexity. Please try again.'
+COMPLEXITY_PROMPT_VERSION = 1  # bump when build_complexity_messages changes
+COMPLEXITY_ANSWER_FIELDS = [
+    'initiative_name', 'data_availability', 'data_quality', 'infrastructure_readiness', 'team_skills',
+    'stakeholder_buyin', 'budget_availability', 'regulatory_compliance', 'integration_complexity',
+    'technology_maturity', 'expected_timeline'
+]
+
+def complexity_cache_key(data, complexity_score, value_score, quadrant):
+    """The prompt also carries the scores, which depend on answers beyond the prompt fields"""
+    answers = {field: data.get(field) for field in COMPLEXITY_ANSWER_FIELDS}
+    answers.update(complexity_score=complexity_score, value_score=value_score, quadrant=quadrant)
+    return recommendation_cache_key('complexity-analyzer', COMPLEXITY_PROMPT_VERSION, answers)
+
+def build_complexity_messages(data, complexity_score, value_score, quadrant):
+    """Chat messages asking for a complexity analysis of the user's responses"""
+    prompt = f"""You are an AI initiative complexity expert for TIH operating in South Africa.
 A user has provided information about an AI initiative they want to implement. Based on their responses, analyze the complexity and provide actionable recommendations.
 
 Initiative Name: {data.get('initiative_name', 'Not specified')}
@@ -2334,69 +5620,110 @@ IMPORTANT GUIDELINES:
 - Consider TIH's context in your recommendations
 - Format your response clearly with headers and bullet points for readability"""
 
-        # Call OpenAI API
-        response = openai_client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an expert AI implementation consultant specializing in insurance companies in South Africa. You provide clear, professional, actionable guidance on implementing AI initiatives. You analyze complexity, identify gaps, and provide practical roadmaps. You never use emojis and always write in a professional manner."""
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=2500
-        )
+    return [
+        {
+            "role": "system",
+            "content": """You are an expert AI implementation consultant specializing in insurance companies in South Africa. You provide clear, professional, actionable guidance on implementing AI initiatives. You analyze complexity, identify gaps, and provide practical roadmaps. You never use emojis and always write in a professional manner."""
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
 
-        recommendation = response.choices[0].message.content
+def save_complexity_conversation(data, complexity_score, value_score, quadrant, recommendation):
+    """Queue a complexity analyzer exchange for saving; returns its id, or None if the save failed"""
+    try:
+        return conversation_writer.save('complexity_conversations', (
+            data.get('initiative_name'),
+            json.dumps(data),
+            complexity_score,
+            value_score,
+            quadrant,
+            recommendation,
+            datetime.now(),
+            DEFAULT_USER['name'],
+            DEFAULT_USER['email']
+        ))
+    except Exception as db_error:
+        logger.warning(f"Failed to save complexity conversation to database: {str(db_error)}")
+        return None
 
-        # Save conversation to database
-        try:
-            conn = get_db_connection()
-            cursor = conn.cursor()
+def run_complexity_analyzer(data, regenerate=False):
+    """Score the responses, generate (or fetch from cache) the analysis and save the conversation"""
+    # Calculate complexity score based on user responses
+    complexity_score = calculate_complexity_score(data)
+    value_score = calculate_value_score(data)
+    quadrant = determine_quadrant(complexity_score, value_score)
+
+    messages = build_complexity_messages(data, complexity_score, value_score, quadrant)
+    recommendation, cached = complete_chat(
+        'complexity-analyzer', messages, max_tokens=2500,
+        cache_key=complexity_cache_key(data, complexity_score, value_score, quadrant),
+        prompt_version=COMPLEXITY_PROMPT_VERSION, regenerate=regenerate
+    )
+
+    # Save conversation to database
+    conversation_id = save_complexity_conversation(data, complexity_score, value_score, quadrant, recommendation)
+
+    return {
+        'recommendation': recommendation,
+        'complexity_score': complexity_score,
+        'value_score': value_score,
+        'quadrant': quadrant,
+        'conversation_id': conversation_id,
+        'cached': cached,
+        'status': 'success'
+    }
 
-            import json
-            cursor.execute("""
-                INSERT INTO complexity_conversations (
-                    initiative_name, user_responses, complexity_score, value_score,
-                    quadrant, llm_recommendation, created_by_name, created_by_email
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                data.get('initiative_name'),
-                json.dumps(data),
-                complexity_score,
-                value_score,
-                quadrant,
-                recommendation,
-                DEFAULT_USER['name'],
-                DEFAULT_USER['email']
-            ))
-
-            # Get the inserted ID
-            cursor.execute("SELECT @@IDENTITY")
-            conversation_id = cursor.fetchone()[0]
+@app.route('/api/complexity-analyzer', methods=['POST'])
+def complexity_analyzer():
+    """Analyze initiative complexity based on user responses"""
+    try:
+        data = request.json
+        result = run_complexity_analyzer(data, wants_regenerate(data))
+        return cached_json_response(result, result['cached'])
 
-            conn.commit()
-            conn.close()
-        except Exception as db_error:
-            logger.warning(f"Failed to save complexity conversation to database: {str(db_error)}")
-            conversation_id = None
+    except LLMBusyError as e:
+        return jsonify({'error': str(e)}), 429
+    except Exception as e:
+        logger.error(f"Error in complexity analyzer: {str(e)}")
+        return jsonify({'error': COMPLEXITY_ERROR_MESSAGE}), 500
 
-        return jsonify({
-            'recommendation': recommendation,
-            'complexity_score': complexity_score,
-            'value_score': value_score,
-            'quadrant': quadrant,
-            'conversation_id': conversation_id,
-            'status': 'success'
-        })
+@app.route('/api/complexity-analyzer/jobs', methods=['POST'])
+def create_complexity_analyzer_job():
+    """Queue a complexity analysis; poll the returned status_url for the result"""
+    data = request.json or {}
+    regenerate = wants_regenerate(data)
+    return submit_llm_job('complexity-analyzer', lambda: run_complexity_analyzer(data, regenerate), COMPLEXITY_ERROR_MESSAGE)
+
+@app.route('/api/complexity-analyzer/stream', methods=['POST'])
+def complexity_analyzer_stream():
+    """
+    Stream a complexity analysis as Server-Sent Events (see LLM Assistants).
 
+    The scores are computed locally and sent first as the meta event.
+    """
+    try:
+        data = request.json or {}
+        regenerate = wants_regenerate(data)
+        complexity_score = calculate_complexity_score(data)
+        value_score = calculate_value_score(data)
+        quadrant = determine_quadrant(complexity_score, value_score)
     except Exception as e:
         logger.error(f"Error in complexity analyzer: {str(e)}")
-        return jsonify({'error': 'Failed to analyze complexity. Please try again.'}), 500
+        return jsonify({'error': COMPLEXITY_ERROR_MESSAGE}), 500
+
+    return sse_response(stream_chat_events(
+        'complexity-analyzer', build_complexity_messages(data, complexity_score, value_score, quadrant), 2500,
+        on_complete=lambda recommendation: {
+            'conversation_id': save_complexity_conversation(data, complexity_score, value_score, quadrant, recommendation)
+        },
+        error_message=COMPLEXITY_ERROR_MESSAGE,
+        meta={'complexity_score': complexity_score, 'value_score': value_score, 'quadrant': quadrant},
+        cache_key=complexity_cache_key(data, complexity_score, value_score, quadrant),
+        prompt_version=COMPLEXITY_PROMPT_VERSION, regenerate=regenerate
+    ))
 
 def calculate_complexity_score(data):
     """Calculate complexity score based on user responses (0-100, higher = more complex)"""
@@ -2620,6 +5947,7 @@ def determine_quadrant(complexity_score, value_score):
 def get_complexity_conversations():
     """Get all complexity conversations for the current user"""
     try:
+        conversation_writer.wait_for_pending()
         conn = get_db_connection()
         cursor = conn.cursor()
 
@@ -2651,6 +5979,10 @@ def get_complexity_conversation(conversation_id):
         """, conversation_id)
 
         row = cursor.fetchone()
+        if not row and conversation_writer.has_pending() and conversation_writer.wait_for_pending():
+            # It may have been created moments ago and still be queued
+            cursor.execute("SELECT * FROM complexity_conversations WHERE id = ?", conversation_id)
+            row = cursor.fetchone()
         if not row:
             conn.close()
             return jsonify({'error': 'Conversation not found'}), 404
@@ -2667,6 +5999,7 @@ def get_complexity_conversation(conversation_id):
 def get_complexity_matrix_data():
     """Get all conversations for plotting on the complexity matrix"""
     try:
+        conversation_writer.wait_for_pending()
         conn = get_db_connection()
         cursor = conn.cursor()
 
@@ -2685,4 +6018,9 @@ def get_complexity_matrix_data():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000, debug=True)
+    # Exit normally on SIGTERM (docker stop) so atexit handlers flush queued conversations.
+    # As PID 1 without a handler the process would ignore SIGTERM until docker SIGKILLs it.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    # The reloader runs the server in a child it SIGKILLs on SIGTERM, so the container turns it off
+    use_reloader = os.environ.get('FLASK_USE_RELOADER', 'true').lower() == 'true'
+    app.run(host='0.0.0.0', port=8000, debug=True, use_reloader=use_reloader)
@@ -0,0 +1,382 @@
+"""
+Benchmarks for backend hot paths, run against simulated databases so they need
+no SQL Server instance.
+
+Usage:
+    python benchmark.py dashboard-stats [--rtt-ms 40] [--iterations 20]
+    python benchmark.py metric-drilldown [--rows 100000] [--iterations 20]
+    python benchmark.py trend-aggregation [--rows 100000] [--iterations 20]
+    python benchmark.py export-formats [--rows 20000] [--iterations 3]
+    python benchmark.py metric-import [--rows 100000] [--rtt-ms 40] [--iterations 3]
+"""
+import argparse
+import csv
+import datetime
+import io
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+
+from app import (
+    EXPORT_SHEETS, METRIC_IMPORT_BATCH_SIZE, aggregate_metric_values, fetch_result_sets,
+    iter_export_rows, iter_metric_import_rows, parse_metric_import, stream_export_archive,
+    write_export_sheet, write_metric_import
+)
+
+# ==================== Simulated Database ====================
+
+class SimulatedCursor:
+    """
+    Cursor that charges one network round trip per execute() and serves canned
+    result sets. nextset() is free, matching how SQL Server streams every result
+    set of a batch back in the same response.
+    """
+
+    def __init__(self, rtt_seconds, result_sets):
+        self.rtt_seconds = rtt_seconds
+        self.result_sets = result_sets
+        self.round_trips = 0
+        self.statements = 0
+        self._pending = []
+        self.description = None
+        self._rows = []
+
+    def execute(self, sql, *params):
+        time.sleep(self.rtt_seconds)
+        self.round_trips += 1
+        statement_count = max(1, sql.count('SELECT'))
+        self.statements += statement_count
+        self._pending = [self.result_sets[i % len(self.result_sets)] for i in range(statement_count)]
+        self._advance()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        # With fast_executemany the whole parameter array goes in one round trip
+        time.sleep(self.rtt_seconds)
+        self.round_trips += 1
+        self.statements += len(seq_of_params)
+
+    def _advance(self):
+        if not self._pending:
+            self.description = None
+            self._rows = []
+            return False
+        columns, rows = self._pending.pop(0)
+        self.description = [(column,) for column in columns]
+        self._rows = list(rows)
+        return True
+
+    def nextset(self):
+        return self._advance()
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows = self._rows[:size]
+        del self._rows[:size]
+        return rows
+
+def report(label, samples):
+    """Print latency percentiles for a list of second-resolution samples"""
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))]
+    print(f"{label:<28} mean={statistics.mean(samples_ms):8.2f}ms  p50={statistics.median(samples_ms):8.2f}ms  p95={p95:8.2f}ms")
+
+# ==================== Dashboard Stats ====================
+
+DASHBOARD_RESULT_SETS = [
+    (['total_initiatives', 'ideation_count', 'in_progress_count', 'completed_count', 'avg_completion', 'new_initiatives_count'],
+     [(120, 30, 60, 30, 54.2, 4)]),
+    (['id', 'use_case_name', 'percentage_complete', 'health_status', 'status', 'departments'],
+     [(i, f'Initiative {i}', 50, 'Green', 'In Progress', 'Sales, Claims') for i in range(10)]),
+    (['department', 'count'], [(f'Department {i}', 10 - i) for i in range(6)]),
+    (['benefit', 'count'], [('Productivity', 70), ('Customer experience', 50)]),
+    (['business_unit', 'count'], [(f'Unit {i}', 15) for i in range(8)]),
+    (['id', 'use_case_name', 'description', 'percentage_complete', 'health_status', 'status',
+      'initiative_type', 'pinned_at', 'departments'],
+     [(i, f'Pinned {i}', 'Description', 80, 'Green', 'In Progress', 'Internal AI', None, 'Sales') for i in range(4)])
+]
+
+def bench_dashboard_stats(args):
+    """Six sequential executes (previous behaviour) vs one batched multi-result-set execute"""
+    rtt = args.rtt_ms / 1000
+    statements = [(f"SELECT {i}", ()) for i in range(len(DASHBOARD_RESULT_SETS))]
+
+    sequential, batched = [], []
+    for _ in range(args.iterations):
+        cursor = SimulatedCursor(rtt, DASHBOARD_RESULT_SETS)
+        started = time.perf_counter()
+        for sql, params in statements:
+            cursor.execute(sql, *params)
+            cursor.fetchall()
+        sequential.append(time.perf_counter() - started)
+
+        cursor = SimulatedCursor(rtt, DASHBOARD_RESULT_SETS)
+        started = time.perf_counter()
+        fetch_result_sets(cursor, statements)
+        batched.append(time.perf_counter() - started)
+        assert cursor.round_trips == 1
+
+    print(f"Dashboard stats, simulated RTT {args.rtt_ms}ms, {args.iterations} iterations")
+    report("sequential (6 round trips)", sequential)
+    report("batched (1 round trip)", batched)
+
+# ==================== Metric Drilldown ====================
+
+def build_metric_database(rows, metrics_per_period=10, metric_names=40):
+    """
+    In-memory SQLite copy of monthly_metrics (JSON blobs) and metric_values
+    holding `rows` metric cells in total.
+    """
+    db = sqlite3.connect(':memory:')
+    db.execute("CREATE TABLE monthly_metrics (id INTEGER PRIMARY KEY, initiative_id INT, metric_period TEXT, additional_metrics TEXT)")
+    db.execute("""
+        CREATE TABLE metric_values (
+            id INTEGER PRIMARY KEY, monthly_metric_id INT, initiative_id INT, metric_period TEXT,
+            metric_name TEXT, numeric_value REAL, raw_value TEXT, comments TEXT
+        )
+    """)
+
+    rng = random.Random(42)
+    names = [f'Metric {i}' for i in range(metric_names)]
+    periods = [f'{2020 + month // 12}-{month % 12 + 1:02d}' for month in range(60)]
+    blobs, values = [], []
+    for monthly_id in range(1, rows // metrics_per_period + 1):
+        initiative_id = monthly_id % 2000
+        period = periods[monthly_id % len(periods)]
+        metrics = {name: {'value': str(rng.randint(0, 1000)), 'comments': 'Monthly figure'}
+                   for name in rng.sample(names, metrics_per_period)}
+        blobs.append((monthly_id, initiative_id, period, json.dumps(metrics)))
+        for name, data in metrics.items():
+            values.append((monthly_id, initiative_id, period, name, float(data['value']), json.dumps(data['value']), data['comments']))
+
+    db.executemany("INSERT INTO monthly_metrics VALUES (?, ?, ?, ?)", blobs)
+    db.executemany("""
+        INSERT INTO metric_values (monthly_metric_id, initiative_id, metric_period, metric_name, numeric_value, raw_value, comments)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, values)
+    db.commit()
+    return db, names
+
+def drilldown_from_json(db, metric_name):
+    """Previous behaviour: read every blob and parse it in Python"""
+    matches = []
+    for period, initiative_id, blob in db.execute("SELECT metric_period, initiative_id, additional_metrics FROM monthly_metrics"):
+        metrics = json.loads(blob)
+        if metric_name in metrics:
+            matches.append((period, initiative_id, metrics[metric_name].get('value')))
+    return matches
+
+def drilldown_from_metric_values(db, metric_name):
+    """Current behaviour: seek the metric name in metric_values"""
+    return db.execute("""
+        SELECT metric_period, initiative_id, raw_value,
+               SUM(COALESCE(numeric_value, 0)) OVER (PARTITION BY metric_period)
+        FROM metric_values
+        WHERE metric_name = ?
+        ORDER BY metric_period
+    """, (metric_name,)).fetchall()
+
+def bench_metric_drilldown(args):
+    """JSON scan vs metric_values scan vs metric_values with IX_metric_values_name"""
+    db, names = build_metric_database(args.rows)
+    lookups = [names[i % len(names)] for i in range(args.iterations)]
+
+    def run(label, fn):
+        samples = []
+        for metric_name in lookups:
+            started = time.perf_counter()
+            fn(db, metric_name)
+            samples.append(time.perf_counter() - started)
+        report(label, samples)
+
+    print(f"Metric drilldown, {args.rows} metric values, {args.iterations} lookups")
+    run("JSON blob scan", drilldown_from_json)
+    run("metric_values, no index", drilldown_from_metric_values)
+    db.execute("CREATE INDEX IX_metric_values_name ON metric_values(metric_name, metric_period, initiative_id, numeric_value)")
+    run("metric_values, name index", drilldown_from_metric_values)
+
+# ==================== Trend Aggregation ====================
+
+def aggregate_trends_loop(periods, metric_names, values):
+    """Previous behaviour: per-period dicts built one value at a time"""
+    period_aggregates = {}
+    for period, metric_name, value in zip(periods, metric_names, values):
+        metrics = period_aggregates.setdefault(period, {})
+        if metric_name not in metrics:
+            metrics[metric_name] = {'values': [], 'total': 0, 'count': 0}
+        value = float(value)
+        metrics[metric_name]['values'].append(value)
+        metrics[metric_name]['total'] += value
+        metrics[metric_name]['count'] += 1
+    return period_aggregates
+
+def bench_trend_aggregation(args):
+    """Python loop vs NumPy grouped reductions over the same metric values"""
+    rng = random.Random(42)
+    periods = [f'{2020 + month // 12}-{month % 12 + 1:02d}' for month in range(60)]
+    names = [f'Metric {i}' for i in range(40)]
+    rows = [(rng.choice(periods), rng.choice(names), rng.uniform(0, 1000)) for _ in range(args.rows)]
+    row_periods, row_names, row_values = (list(column) for column in zip(*rows))
+
+    # Both paths must agree before timing them
+    loop_result = aggregate_trends_loop(row_periods, row_names, row_values)
+    for group in aggregate_metric_values(row_periods, row_names, row_values):
+        expected = loop_result[group['metric_period']][group['metric_name']]
+        assert group['count'] == expected['count']
+        assert round(group['total'], 2) == round(expected['total'], 2)
+
+    def run(label, fn):
+        samples = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - started)
+        report(label, samples)
+
+    print(f"Trend aggregation, {args.rows} metric values, {args.iterations} iterations")
+    run("python loop", lambda: aggregate_trends_loop(row_periods, row_names, row_values))
+    run("numpy total/count", lambda: aggregate_metric_values(row_periods, row_names, row_values))
+    run("numpy + min/max/median/p90", lambda: aggregate_metric_values(row_periods, row_names, row_values, extended=True))
+
+# ==================== Export Formats ====================
+
+def build_initiative_export_rows(rows):
+    """Synthetic rows shaped like the Initiatives export sheet"""
+    rng = random.Random(42)
+    created = datetime.datetime(2024, 1, 1, 9, 30)
+    sample = {
+        None: lambda i: f'Value {rng.randint(0, 10 ** 6)} ' + 'x' * rng.randint(0, 60),
+        'number': lambda i: Decimal(rng.randint(0, 10 ** 7)) / 100,
+        'date': lambda i: created.date() + datetime.timedelta(days=i % 365),
+        'datetime': lambda i: created + datetime.timedelta(minutes=i),
+        'flag': lambda i: i % 7 == 0,
+    }
+    kinds = [kind for _, _, kind in EXPORT_SHEETS[0]['columns']]
+    return [tuple([i] + [sample[kind](i) for kind in kinds[1:]]) for i in range(rows)]
+
+def export_xlsx(cursor, sheet):
+    """Styled write-only workbook for one sheet; returns the file size"""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    write_export_sheet(wb.create_sheet(sheet['title']), sheet, iter_export_rows(cursor, sheet))
+    with tempfile.TemporaryFile() as output:
+        wb.save(output)
+        return output.tell()
+
+def export_raw(export_format):
+    def run(cursor, sheet):
+        return sum(len(chunk) for chunk in stream_export_archive(cursor, export_format, sheets=[sheet]))
+    return run
+
+def bench_export_formats(args):
+    sheet = EXPORT_SHEETS[0]
+    rows = build_initiative_export_rows(args.rows)
+    columns = [expression for _, expression, _ in sheet['columns']]
+    print(f"{args.rows} rows x {len(columns)} columns ({sheet['title']} sheet)")
+
+    for label, run in [('xlsx (styled)', export_xlsx), ('csv (zip)', export_raw('csv')), ('ndjson (zip)', export_raw('ndjson'))]:
+        samples = []
+        for _ in range(args.iterations):
+            cursor = SimulatedCursor(0, [(columns, list(rows))])
+            started = time.perf_counter()
+            size = run(cursor, sheet)
+            samples.append(time.perf_counter() - started)
+
+        # Separate pass so tracing overhead stays out of the timings
+        tracemalloc.start()
+        run(SimulatedCursor(0, [(columns, list(rows))]), sheet)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        report(label, samples)
+        print(f"{'':<28} {args.rows / statistics.median(samples):,.0f} rows/s  output={size / 1024:,.0f}KiB  "
+              f"peak traced memory={peak / 1024 / 1024:.1f}MiB")
+
+# ==================== Metric Import ====================
+
+def build_metric_import_upload(cells, export_format, metric_count=40):
+    """Wide-layout upload with one row per (initiative, period); returns (bytes, metric_types)"""
+    rng = random.Random(42)
+    metrics = [f'Metric {i}' for i in range(metric_count)]
+    header = ['initiative_id', 'metric_period'] + metrics
+    rows = []
+    for i in range(max(1, cells // metric_count)):
+        period = f'{2020 + (i // 12) % 10}-{i % 12 + 1:02d}'
+        rows.append([i // 120 + 1, period] + [round(rng.uniform(0, 1000), 2) for _ in metrics])
+
+    output = io.BytesIO()
+    if export_format == 'csv':
+        text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+        writer = csv.writer(text)
+        writer.writerow(header)
+        writer.writerows(rows)
+        text.flush()
+        text.detach()
+    else:
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Metrics')
+        ws.append(header)
+        for row in rows:
+            ws.append(row)
+        wb.save(output)
+    metric_types = {name.lower(): (name, 'quantitative') for name in metrics}
+    return output.getvalue(), metric_types
+
+def bench_metric_import(args):
+    from werkzeug.datastructures import FileStorage
+
+    rtt = args.rtt_ms / 1000
+    user = {'name': 'Benchmark', 'email': 'benchmark@example.com'}
+    for export_format in ('csv', 'xlsx'):
+        data, metric_types = build_metric_import_upload(args.rows, export_format)
+        samples = []
+        for _ in range(args.iterations):
+            started = time.perf_counter()
+            upload = FileStorage(stream=io.BytesIO(data), filename=f'metrics.{export_format}')
+            cells, errors, summary = parse_metric_import(iter_metric_import_rows(upload), metric_types)
+            samples.append(time.perf_counter() - started)
+        report(f'parse + validate ({export_format})', samples)
+        print(f"{'':<28} {len(cells) / statistics.median(samples):,.0f} cells/s  "
+              f"upload={len(data) / 1024:,.0f}KiB  errors={len(errors)}")
+
+    staged = [cell[1:] for cell in cells]
+    periods = len({cell[:2] for cell in staged})
+    cursor = SimulatedCursor(rtt, [(['created_periods', 'updated_periods'], [(0, periods)])])
+    started = time.perf_counter()
+    write_metric_import(cursor, staged, user)
+    elapsed = time.perf_counter() - started
+    print(f"{len(staged)} cells over {periods} periods, batches of {METRIC_IMPORT_BATCH_SIZE}, rtt={args.rtt_ms}ms")
+    print(f"  set-based import: {cursor.round_trips} round trips, {elapsed * 1000:,.0f}ms")
+    # POST /metrics per period costs a MERGE, a DELETE and an executemany round trip each
+    print(f"  per-period POSTs: {periods * 3} round trips, ~{periods * 3 * args.rtt_ms:,.0f}ms of network time alone")
+
+BENCHMARKS = {
+    'dashboard-stats': bench_dashboard_stats,
+    'metric-drilldown': bench_metric_drilldown,
+    'trend-aggregation': bench_trend_aggregation,
+    'export-formats': bench_export_formats,
+    'metric-import': bench_metric_import
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backend benchmarks')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--rtt-ms', type=float, default=40, help='Simulated database round-trip time')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=100000, help='Metric values (or export rows) to generate')
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
@@ -0,0 +1,219 @@
+"""
+Local stand-in for the Azure OpenAI chat.completions API, for load-testing the
+assistant endpoints without spending real quota.
+
+Point the backend at it with OPENAI_ENDPOINT=http://localhost:8089 (any
+OPENAI_API_KEY is accepted) and drive it with loadtest.py.
+
+Usage:
+    python fake_openai.py [--port 8089] [--latency-ms 400] [--tokens-per-second 50]
+                          [--completion-tokens 300] [--capacity 0]
+                          [--rate-limit-ratio 0.0] [--error-ratio 0.0] [--retry-after 2]
+
+Latency is the time to the first token; the rest of the completion is then
+produced at --tokens-per-second, streamed as SSE chunks when the request asks
+for stream=true. --rate-limit-ratio and --error-ratio inject 429s (with
+Retry-After / retry-after-ms headers) and 500s at random; --capacity returns
+429 once that many requests are in flight, like a deployment at its quota.
+GET /stats reports request, error and concurrency counters.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATH = re.compile(r'^/openai/deployments/(?P<deployment>[^/]+)/chat/completions$')
+
+WORDS = ('the initiative should focus on measurable outcomes such as reduced handling time '
+         'improved accuracy and customer satisfaction with a phased rollout and clear ownership').split()
+
+class FakeOpenAIState:
+    """Counters shared by all request threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.counters = {'requests': 0, 'completed': 0, 'streamed': 0, 'rate_limited': 0,
+                         'server_errors': 0, 'max_in_flight': 0, 'completion_tokens': 0}
+
+    def enter(self, capacity):
+        """Count a new request; False when it would exceed capacity"""
+        with self._lock:
+            self.counters['requests'] += 1
+            if capacity and self.in_flight >= capacity:
+                return False
+            self.in_flight += 1
+            self.counters['max_in_flight'] = max(self.counters['max_in_flight'], self.in_flight)
+            return True
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def count(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return {**self.counters, 'in_flight': self.in_flight}
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    config = None
+    state = None
+
+    def log_message(self, format, *args):
+        if self.config.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, code, message, headers=None):
+        self.send_json(status, {'error': {'code': code, 'message': message}}, headers)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self.send_json(200, self.state.snapshot())
+        else:
+            self.send_error_json(404, 'NotFound', 'Resource not found')
+
+    def do_POST(self):
+        match = CHAT_PATH.match(self.path.split('?', 1)[0])
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if not match:
+            self.send_error_json(404, 'NotFound', 'Resource not found')
+            return
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            self.send_error_json(400, 'BadRequest', 'Request body is not valid JSON')
+            return
+
+        if not self.state.enter(self.config.capacity):
+            self.rate_limited('Deployment is at capacity')
+            return
+        try:
+            roll = random.random()
+            if roll < self.config.rate_limit_ratio:
+                self.rate_limited('Injected rate limit')
+                return
+            if roll < self.config.rate_limit_ratio + self.config.error_ratio:
+                self.state.count('server_errors')
+                self.send_error_json(500, 'InternalServerError', 'Injected server error')
+                return
+
+            deployment = match.group('deployment')
+            tokens = min(payload.get('max_tokens') or self.config.completion_tokens, self.config.completion_tokens)
+            time.sleep(self.config.latency_ms / 1000)
+            if payload.get('stream'):
+                self.stream_completion(deployment, tokens)
+            else:
+                time.sleep(tokens / self.config.tokens_per_second)
+                self.state.count('completed')
+                self.state.count('completion_tokens', tokens)
+                self.send_json(200, {
+                    'id': f'chatcmpl-{uuid.uuid4().hex}',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': deployment,
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': ' '.join(completion_words(tokens))},
+                        'finish_reason': 'stop'
+                    }],
+                    'usage': {'prompt_tokens': len(body) // 4, 'completion_tokens': tokens,
+                              'total_tokens': len(body) // 4 + tokens}
+                })
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.state.leave()
+
+    def rate_limited(self, message):
+        self.state.count('rate_limited')
+        retry_after = self.config.retry_after
+        self.send_error_json(429, '429', message, {
+            'Retry-After': str(max(1, round(retry_after))),
+            'retry-after-ms': str(int(retry_after * 1000))
+        })
+
+    def stream_completion(self, deployment, tokens):
+        """Send the completion as chat.completion.chunk SSE events, one word per token"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        completion_id = f'chatcmpl-{uuid.uuid4().hex}'
+        created = int(time.time())
+
+        def send(payload):
+            self.wfile.write(f'data: {json.dumps(payload)}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+
+        def chunk(delta, finish_reason=None):
+            send({'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': deployment,
+                  'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]})
+
+        # Azure leads with a content-filter chunk that has no choices
+        send({'id': '', 'object': '', 'created': 0, 'model': '', 'choices': [],
+              'prompt_filter_results': [{'prompt_index': 0, 'content_filter_results': {}}]})
+        chunk({'role': 'assistant', 'content': ''})
+        interval = 1 / self.config.tokens_per_second
+        for index, word in enumerate(completion_words(tokens)):
+            chunk({'content': word if index == 0 else f' {word}'})
+            time.sleep(interval)
+        chunk({}, 'stop')
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.wfile.flush()
+        self.state.count('streamed')
+        self.state.count('completion_tokens', tokens)
+
+def completion_words(tokens):
+    return [WORDS[i % len(WORDS)] for i in range(tokens)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Local fake Azure OpenAI chat.completions server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=400, help='Time to first token')
+    parser.add_argument('--tokens-per-second', type=float, default=50, help='Generation rate after the first token')
+    parser.add_argument('--completion-tokens', type=int, default=300, help='Tokens per completion (capped by max_tokens)')
+    parser.add_argument('--capacity', type=int, default=0, help='Return 429 beyond this many in-flight requests (0 = unlimited)')
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--error-ratio', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--retry-after', type=float, default=2, help='Seconds advertised in Retry-After on 429s')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.config = args
+    FakeOpenAIHandler.state = FakeOpenAIState()
+    server = ThreadingHTTPServer((args.host, args.port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    print(f"Fake Azure OpenAI listening on http://{args.host}:{args.port} "
+          f"(latency={args.latency_ms}ms, {args.tokens_per_second} tokens/s, "
+          f"429={args.rate_limit_ratio:.0%}, 500={args.error_ratio:.0%}, capacity={args.capacity or 'unlimited'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""
+Load test for the LLM assistant endpoints. Start the backend with
+OPENAI_ENDPOINT pointing at fake_openai.py (or a real deployment, if you mean
+to spend the quota), then drive it with N concurrent users.
+
+Usage:
+    python loadtest.py roi [--users 20] [--duration 60] [--base-url http://localhost:8000]
+    python loadtest.py complexity-stream [--users 50] [--cache-hit-ratio 0.3]
+    python loadtest.py roi-jobs [--users 100] [--fake-url http://localhost:8089]
+
+Each user sends requests back to back. It waits for each full response: the
+SSE done event for the stream scenarios, and the finished job for the job
+scenarios. The report covers:
+- throughput
+- p50/p95/p99 latency (plus time to first token for streams)
+- response statuses
+- worker saturation, sampled from /api/llm/executor-stats while the test
+  runs: slot utilization, peak in-flight calls, queued jobs, retries and
+  busy rejections.
+"""
+import argparse
+import itertools
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+
+ROI_ANSWERS = {
+    'initiative_type': 'AI Initiative',
+    'value_type': 'Cost reduction',
+    'scale': 'Department-wide',
+    'units_processed': '5,000 claims per month',
+    'current_process': 'Manual review of claim documents',
+    'success_metrics': 'Handling time, accuracy',
+    'timeline': '6 months',
+    'industry_specifics': 'Short-term insurance'
+}
+
+COMPLEXITY_ANSWERS = {
+    'initiative_name': 'Claims triage assistant',
+    'business_case_clarity': 'Clear',
+    'data_availability': 'Partially available',
+    'data_quality': 'Good',
+    'infrastructure_readiness': 'Partially ready',
+    'team_skills': 'Some experience',
+    'stakeholder_buyin': 'Strong',
+    'budget_availability': 'Approved',
+    'regulatory_compliance': 'Some requirements',
+    'integration_complexity': 'Moderate',
+    'technology_maturity': 'Established',
+    'expected_timeline': '3-6 months'
+}
+
+SCENARIOS = {
+    'roi': ('/api/roi-assistant', ROI_ANSWERS, 'industry_specifics'),
+    'roi-stream': ('/api/roi-assistant/stream', ROI_ANSWERS, 'industry_specifics'),
+    'roi-jobs': ('/api/roi-assistant/jobs', ROI_ANSWERS, 'industry_specifics'),
+    'complexity': ('/api/complexity-analyzer', COMPLEXITY_ANSWERS, 'initiative_name'),
+    'complexity-stream': ('/api/complexity-analyzer/stream', COMPLEXITY_ANSWERS, 'initiative_name'),
+    'complexity-jobs': ('/api/complexity-analyzer/jobs', COMPLEXITY_ANSWERS, 'initiative_name')
+}
+
+# ==================== HTTP ====================
+
+def get_json(url, timeout=10):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def post(url, payload, timeout):
+    """POST JSON; returns (status, response) and leaves the response open for streaming"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+        return response.status, response
+    except urllib.error.HTTPError as e:
+        return e.code, e
+
+def read_stream(response, started):
+    """Consume an SSE response; returns (outcome, ttft_seconds)"""
+    ttft, event = None, None
+    for raw in response:
+        line = raw.decode('utf-8').rstrip('\r\n')
+        if line.startswith('event:'):
+            event = line[6:].strip()
+            if event == 'token' and ttft is None:
+                ttft = time.perf_counter() - started
+            elif event in ('done', 'error'):
+                return event, ttft
+    return 'incomplete', ttft
+
+def poll_job(base_url, job, poll_interval, timeout):
+    """Poll a submitted job until it finishes; returns its final status"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        job = get_json(base_url + job['status_url'])
+        if job['status'] in ('completed', 'failed'):
+            return job['status']
+    return 'timeout'
+
+# ==================== Users ====================
+
+class Results:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.ttfts = []
+        self.outcomes = Counter()
+
+    def record(self, outcome, latency=None, ttft=None):
+        with self._lock:
+            self.outcomes[outcome] += 1
+            if latency is not None:
+                self.latencies.append(latency)
+            if ttft is not None:
+                self.ttfts.append(ttft)
+
+def build_payload(answers, vary_field, cache_hit_ratio, run_id, sequence):
+    """Fixed answers for cache_hit_ratio of requests, otherwise a unique answer set that misses the cache"""
+    payload = dict(answers)
+    if random.random() >= cache_hit_ratio:
+        payload[vary_field] = f"{answers[vary_field]} #{run_id}-{next(sequence)}"
+    return payload
+
+def run_user(args, path, answers, vary_field, sequence, stop_at, results):
+    url = args.base_url + path
+    while time.monotonic() < stop_at:
+        payload = build_payload(answers, vary_field, args.cache_hit_ratio, args.run_id, sequence)
+        started = time.perf_counter()
+        try:
+            status, response = post(url, payload, args.timeout)
+            with response:
+                if status >= 400:
+                    response.read()
+                    results.record(f'http {status}')
+                    if status == 429:
+                        time.sleep(args.backoff)
+                    continue
+                ttft = None
+                if path.endswith('/stream'):
+                    outcome, ttft = read_stream(response, started)
+                elif path.endswith('/jobs'):
+                    outcome = poll_job(args.base_url, json.loads(response.read()), args.poll_interval, args.timeout)
+                else:
+                    response.read()
+                    outcome = 'completed'
+        except Exception as e:
+            results.record(f'error {type(e).__name__}')
+            continue
+        results.record(outcome, time.perf_counter() - started if outcome in ('completed', 'done') else None, ttft)
+
+# ==================== Saturation ====================
+
+class SaturationSampler(threading.Thread):
+    """Polls /api/llm/executor-stats while the test runs"""
+
+    def __init__(self, base_url, interval):
+        super().__init__(daemon=True)
+        self.url = base_url + '/api/llm/executor-stats'
+        self.interval = interval
+        self.samples = []
+        self.first = None
+        self.last = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                stats = get_json(self.url)
+                self.first = self.first or stats
+                self.last = stats
+                self.samples.append(stats)
+            except Exception:
+                pass
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+# ==================== Report ====================
+
+def percentile(sorted_samples, fraction):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
+
+def report_latency(label, samples):
+    if not samples:
+        print(f"{label:<10} no samples")
+        return
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    print(f"{label:<10} mean={statistics.mean(samples_ms):8.0f}ms  p50={percentile(samples_ms, 0.50):8.0f}ms  "
+          f"p95={percentile(samples_ms, 0.95):8.0f}ms  p99={percentile(samples_ms, 0.99):8.0f}ms  "
+          f"max={samples_ms[-1]:8.0f}ms")
+
+def report_saturation(sampler):
+    if not sampler.samples:
+        print("saturation: /api/llm/executor-stats unavailable")
+        return
+    capacity = sampler.last['max_concurrency']
+    in_flight = [sample['in_flight'] for sample in sampler.samples]
+    queued = [sample['jobs_queued'] for sample in sampler.samples]
+    saturated = sum(1 for value in in_flight if value >= capacity)
+    delta = {key: sampler.last[key] - sampler.first[key]
+             for key in ('calls', 'retries', 'throttled', 'busy_rejections', 'failed')}
+    calls = max(1, delta['calls'])
+    print(f"workers    {capacity} slots, mean in flight {statistics.mean(in_flight):.1f} "
+          f"({statistics.mean(in_flight) / capacity:.0%} utilization), saturated {saturated / len(in_flight):.0%} of samples, "
+          f"peak {max(in_flight)}")
+    print(f"queue      mean {statistics.mean(queued):.1f} jobs, peak {max(queued)}; "
+          f"slot wait {(sampler.last['slot_wait_ms'] - sampler.first['slot_wait_ms']) / calls:.0f}ms/call, "
+          f"rate-limit wait {(sampler.last['rate_limit_wait_ms'] - sampler.first['rate_limit_wait_ms']) / calls:.0f}ms/call")
+    print(f"upstream   {delta['calls']} calls, {delta['retries']} retries ({delta['throttled']} throttled), "
+          f"{delta['failed']} failed, {delta['busy_rejections']} busy rejections")
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the LLM assistant endpoints')
+    parser.add_argument('scenario', choices=sorted(SCENARIOS))
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--users', type=int, default=20, help='Concurrent users')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to keep sending requests')
+    parser.add_argument('--cache-hit-ratio', type=float, default=0.0,
+                        help='Fraction of requests repeating the same answers (recommendation cache hits)')
+    parser.add_argument('--timeout', type=float, default=300, help='Per-request timeout in seconds')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='Job status poll interval in seconds')
+    parser.add_argument('--backoff', type=float, default=1, help='Seconds a user waits after a 429')
+    parser.add_argument('--sample-interval', type=float, default=0.5, help='Executor stats sampling interval')
+    parser.add_argument('--fake-url', help='fake_openai.py base URL, to include its counters in the report')
+    args = parser.parse_args()
+
+    path, answers, vary_field = SCENARIOS[args.scenario]
+    # Unique answers are tagged per run so they don't hit entries cached by an earlier run
+    args.run_id = uuid.uuid4().hex[:8]
+    sequence = itertools.count()
+    results = Results()
+    sampler = SaturationSampler(args.base_url, args.sample_interval)
+    fake_before = get_json(args.fake_url + '/stats') if args.fake_url else None
+
+    print(f"{args.scenario}: {args.users} users for {args.duration:.0f}s against {args.base_url}{path}")
+    sampler.start()
+    started = time.perf_counter()
+    stop_at = time.monotonic() + args.duration
+    users = [threading.Thread(target=run_user, args=(args, path, answers, vary_field, sequence, stop_at, results))
+             for _ in range(args.users)]
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+    elapsed = time.perf_counter() - started
+    sampler.stop()
+
+    completed = len(results.latencies)
+    print(f"requests   {sum(results.outcomes.values())} sent, {completed} completed in {elapsed:.1f}s "
+          f"= {completed / elapsed:.2f} req/s")
+    print(f"outcomes   {dict(results.outcomes)}")
+    report_latency('latency', results.latencies)
+    if results.ttfts:
+        report_latency('ttft', results.ttfts)
+    report_saturation(sampler)
+    if fake_before is not None:
+        fake_after = get_json(args.fake_url + '/stats')
+        print("fake llm   " + ', '.join(f"{key}={fake_after[key] - fake_before.get(key, 0)}"
+                                       for key in ('requests', 'completed', 'streamed', 'rate_limited', 'server_errors'))
+              + f", max in flight {fake_after['max_in_flight']}")
+
+if __name__ == '__main__':
+    main()
@@ -6,12 +6,21 @@ USE AIReporting;
 GO
 
 -- Drop tables in reverse order of dependencies
+IF OBJECT_ID('dbo.llm_response_cache', 'U') IS NOT NULL DROP TABLE dbo.llm_response_cache;
+IF OBJECT_ID('dbo.export_tombstones', 'U') IS NOT NULL DROP TABLE dbo.export_tombstones;
+IF OBJECT_ID('dbo.complexity_conversations', 'U') IS NOT NULL DROP TABLE dbo.complexity_conversations;
+IF OBJECT_ID('dbo.roi_conversations', 'U') IS NOT NULL DROP TABLE dbo.roi_conversations;
 IF OBJECT_ID('dbo.risks', 'U') IS NOT NULL DROP TABLE dbo.risks;
+IF OBJECT_ID('dbo.metric_values', 'U') IS NOT NULL DROP TABLE dbo.metric_values;
 IF OBJECT_ID('dbo.monthly_metrics', 'U') IS NOT NULL DROP TABLE dbo.monthly_metrics;
 IF OBJECT_ID('dbo.initiative_departments', 'U') IS NOT NULL DROP TABLE dbo.initiative_departments;
 IF OBJECT_ID('dbo.initiatives', 'U') IS NOT NULL DROP TABLE dbo.initiatives;
 IF OBJECT_ID('dbo.custom_metrics', 'U') IS NOT NULL DROP TABLE dbo.custom_metrics;
+IF OBJECT_ID('dbo.image_blobs', 'U') IS NOT NULL DROP TABLE dbo.image_blobs;
 IF OBJECT_ID('dbo.field_options', 'U') IS NOT NULL DROP TABLE dbo.field_options;
+IF OBJECT_ID('dbo.json_merge_objects', 'FN') IS NOT NULL DROP FUNCTION dbo.json_merge_objects;
+IF OBJECT_ID('dbo.complexity_conversation_ids', 'SO') IS NOT NULL DROP SEQUENCE dbo.complexity_conversation_ids;
+IF OBJECT_ID('dbo.roi_conversation_ids', 'SO') IS NOT NULL DROP SEQUENCE dbo.roi_conversation_ids;
 GO
 
 PRINT 'All tables have been dropped successfully.';
@@ -2,15 +2,21 @@
 -- This script creates all necessary tables for the AI reporting application
 
 -- Drop tables if they exist (in reverse order of dependencies)
+IF OBJECT_ID('dbo.llm_response_cache', 'U') IS NOT NULL DROP TABLE dbo.llm_response_cache;
+IF OBJECT_ID('dbo.export_tombstones', 'U') IS NOT NULL DROP TABLE dbo.export_tombstones;
 IF OBJECT_ID('dbo.complexity_conversations', 'U') IS NOT NULL DROP TABLE dbo.complexity_conversations;
 IF OBJECT_ID('dbo.roi_conversations', 'U') IS NOT NULL DROP TABLE dbo.roi_conversations;
 IF OBJECT_ID('dbo.progress_updates', 'U') IS NOT NULL DROP TABLE dbo.progress_updates;
 IF OBJECT_ID('dbo.risks', 'U') IS NOT NULL DROP TABLE dbo.risks;
+IF OBJECT_ID('dbo.metric_values', 'U') IS NOT NULL DROP TABLE dbo.metric_values;
 IF OBJECT_ID('dbo.monthly_metrics', 'U') IS NOT NULL DROP TABLE dbo.monthly_metrics;
 IF OBJECT_ID('dbo.initiative_departments', 'U') IS NOT NULL DROP TABLE dbo.initiative_departments;
 IF OBJECT_ID('dbo.initiatives', 'U') IS NOT NULL DROP TABLE dbo.initiatives;
 IF OBJECT_ID('dbo.custom_metrics', 'U') IS NOT NULL DROP TABLE dbo.custom_metrics;
+IF OBJECT_ID('dbo.image_blobs', 'U') IS NOT NULL DROP TABLE dbo.image_blobs;
 IF OBJECT_ID('dbo.field_options', 'U') IS NOT NULL DROP TABLE dbo.field_options;
+IF OBJECT_ID('dbo.complexity_conversation_ids', 'SO') IS NOT NULL DROP SEQUENCE dbo.complexity_conversation_ids;
+IF OBJECT_ID('dbo.roi_conversation_ids', 'SO') IS NOT NULL DROP SEQUENCE dbo.roi_conversation_ids;
 GO
 
 -- Table: field_options
@@ -70,7 +76,8 @@ CREATE TABLE dbo.initiatives (
     business_unit NVARCHAR(100), -- Business unit for the initiative
     is_pinned BIT DEFAULT 0, -- Pinned to dashboard
     pinned_at DATETIME, -- When it was pinned
-    initiative_image NVARCHAR(MAX), -- Base64 encoded image (JPG/PNG)
+    initiative_image NVARCHAR(MAX), -- Legacy base64 image, moved to image_blobs by migrate-initiative-images
+    image_hash CHAR(64), -- SHA-256 of the original image in dbo.image_blobs
 
     -- Audit fields
     created_at DATETIME DEFAULT GETDATE(),
@@ -80,7 +87,20 @@ CREATE TABLE dbo.initiatives (
     modified_by_name NVARCHAR(255),
     modified_by_email NVARCHAR(255),
     is_featured BIT DEFAULT 0, -- For featured solutions page
-    featured_month NVARCHAR(7) -- Format: YYYY-MM
+    featured_month NVARCHAR(7), -- Format: YYYY-MM
+    row_version ROWVERSION -- Change tracking for delta exports
+);
+
+-- Table: image_blobs
+-- Content-addressed image store; one row per variant (original, sm, md thumbnails)
+CREATE TABLE dbo.image_blobs (
+    image_hash CHAR(64) NOT NULL,
+    variant NVARCHAR(20) NOT NULL,
+    content_type NVARCHAR(100) NOT NULL,
+    byte_size INT NOT NULL,
+    data VARBINARY(MAX) NOT NULL,
+    created_at DATETIME DEFAULT GETDATE(),
+    PRIMARY KEY (image_hash, variant)
 );
 
 -- Table: initiative_departments
@@ -89,6 +109,7 @@ CREATE TABLE dbo.initiative_departments (
     id INT IDENTITY(1,1) PRIMARY KEY,
     initiative_id INT NOT NULL,
     department NVARCHAR(255) NOT NULL,
+    row_version ROWVERSION, -- Change tracking for export fingerprints
     FOREIGN KEY (initiative_id) REFERENCES dbo.initiatives(id) ON DELETE CASCADE
 );
 
@@ -110,6 +131,7 @@ CREATE TABLE dbo.risks (
     modified_at DATETIME DEFAULT GETDATE(),
     modified_by_name NVARCHAR(255),
     modified_by_email NVARCHAR(255),
+    row_version ROWVERSION, -- Change tracking for delta exports
     FOREIGN KEY (initiative_id) REFERENCES dbo.initiatives(id) ON DELETE CASCADE
 );
 
@@ -127,13 +149,31 @@ CREATE TABLE dbo.progress_updates (
     modified_at DATETIME DEFAULT GETDATE(),
     modified_by_name NVARCHAR(255),
     modified_by_email NVARCHAR(255),
+    row_version ROWVERSION, -- Change tracking for delta exports
     FOREIGN KEY (initiative_id) REFERENCES dbo.initiatives(id) ON DELETE CASCADE
 );
 
+-- Table: export_tombstones
+-- Deleted rows from initiatives, monthly_metrics, risks and progress_updates, written by
+-- the AFTER DELETE triggers below so delta exports (since=) can report deletions
+CREATE TABLE dbo.export_tombstones (
+    id BIGINT IDENTITY(1,1) PRIMARY KEY,
+    table_name NVARCHAR(50) NOT NULL,
+    row_id INT NOT NULL,
+    initiative_id INT,
+    deleted_at DATETIME DEFAULT GETDATE(),
+    row_version ROWVERSION
+);
+
+-- Conversation ids come from sequences so the backend can reserve them in blocks
+-- and return conversation_id before its write-behind queue inserts the row
+CREATE SEQUENCE dbo.roi_conversation_ids AS INT START WITH 1 INCREMENT BY 1;
+CREATE SEQUENCE dbo.complexity_conversation_ids AS INT START WITH 1 INCREMENT BY 1;
+
 -- Table: roi_conversations
 -- Stores ROI Assistant conversations for tracking and analysis
 CREATE TABLE dbo.roi_conversations (
-    id INT IDENTITY(1,1) PRIMARY KEY,
+    id INT NOT NULL PRIMARY KEY DEFAULT (NEXT VALUE FOR dbo.roi_conversation_ids),
     user_responses NVARCHAR(MAX) NOT NULL, -- JSON object containing all user responses
     llm_recommendation NVARCHAR(MAX) NOT NULL, -- LLM generated recommendation
     created_at DATETIME DEFAULT GETDATE(),
@@ -144,7 +184,7 @@ CREATE TABLE dbo.roi_conversations (
 -- Table: complexity_conversations
 -- Stores Complexity Analyzer conversations for tracking and analysis
 CREATE TABLE dbo.complexity_conversations (
-    id INT IDENTITY(1,1) PRIMARY KEY,
+    id INT NOT NULL PRIMARY KEY DEFAULT (NEXT VALUE FOR dbo.complexity_conversation_ids),
     initiative_name NVARCHAR(500),
     user_responses NVARCHAR(MAX) NOT NULL, -- JSON object containing all user responses
     complexity_score DECIMAL(5,2), -- Calculated complexity score (0-100)
@@ -156,6 +196,21 @@ CREATE TABLE dbo.complexity_conversations (
     created_by_email NVARCHAR(255)
 );
 
+-- Table: llm_response_cache
+-- Persistent tier of the assistant recommendation cache, keyed by a hash of the
+-- normalized questionnaire answers, prompt version and deployment
+CREATE TABLE dbo.llm_response_cache (
+    cache_key CHAR(64) NOT NULL PRIMARY KEY, -- sha256 hex
+    assistant NVARCHAR(50) NOT NULL, -- 'roi-assistant' or 'complexity-analyzer'
+    prompt_version INT NOT NULL,
+    response NVARCHAR(MAX) NOT NULL,
+    generation_ms INT, -- How long the completion took, i.e. the latency a hit saves
+    hit_count INT NOT NULL DEFAULT 0, -- Hits served from this table (not the in-memory tier)
+    created_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+    expires_at DATETIME2 NOT NULL,
+    last_hit_at DATETIME2
+);
+
 -- Table: monthly_metrics
 -- Stores monthly metric values for each initiative
 CREATE TABLE dbo.monthly_metrics (
@@ -205,11 +260,28 @@ CREATE TABLE dbo.monthly_metrics (
     modified_at DATETIME DEFAULT GETDATE(),
     modified_by_name NVARCHAR(255),
     modified_by_email NVARCHAR(255),
+    row_version ROWVERSION, -- Change tracking for delta exports
 
     FOREIGN KEY (initiative_id) REFERENCES dbo.initiatives(id) ON DELETE CASCADE,
     UNIQUE (initiative_id, metric_period)
 );
 
+-- Table: metric_values
+-- One row per metric in monthly_metrics.additional_metrics, kept in sync by the API
+-- so dashboard aggregates can run in SQL instead of parsing JSON
+CREATE TABLE dbo.metric_values (
+    id INT IDENTITY(1,1) PRIMARY KEY,
+    monthly_metric_id INT NOT NULL,
+    initiative_id INT NOT NULL,
+    metric_period NVARCHAR(7) NOT NULL, -- Format: YYYY-MM
+    metric_name NVARCHAR(255) NOT NULL,
+    numeric_value FLOAT, -- NULL when the value is not numeric
+    raw_value NVARCHAR(MAX), -- JSON-encoded value as submitted
+    comments NVARCHAR(MAX),
+    FOREIGN KEY (monthly_metric_id) REFERENCES dbo.monthly_metrics(id) ON DELETE CASCADE,
+    UNIQUE (initiative_id, metric_period, metric_name)
+);
+
 -- Insert default field options
 INSERT INTO dbo.field_options (field_name, option_value, display_order) VALUES
 -- Benefits
@@ -300,15 +372,106 @@ INSERT INTO dbo.custom_metrics (metric_name, metric_description, metric_type, un
 GO
 
 -- Create indexes for better performance
-CREATE INDEX IX_initiatives_status ON dbo.initiatives(status);
 CREATE INDEX IX_initiatives_featured ON dbo.initiatives(is_featured, featured_month);
-CREATE INDEX IX_initiatives_health_status ON dbo.initiatives(health_status);
+-- Keyset pagination for GET /api/initiatives: (sort column, id), optionally behind an equality filter
+CREATE INDEX IX_initiatives_modified ON dbo.initiatives(modified_at DESC, id DESC);
+CREATE INDEX IX_initiatives_created ON dbo.initiatives(created_at DESC, id DESC);
+CREATE INDEX IX_initiatives_name ON dbo.initiatives(use_case_name, id);
+CREATE INDEX IX_initiatives_status ON dbo.initiatives(status, modified_at DESC, id DESC);
+CREATE INDEX IX_initiatives_health_status ON dbo.initiatives(health_status, modified_at DESC, id DESC);
+CREATE INDEX IX_initiatives_business_unit ON dbo.initiatives(business_unit, modified_at DESC, id DESC);
+CREATE INDEX IX_initiatives_type ON dbo.initiatives(initiative_type, modified_at DESC, id DESC);
+CREATE INDEX IX_initiatives_priority ON dbo.initiatives(priority, modified_at DESC, id DESC);
+CREATE INDEX IX_initiative_departments_initiative ON dbo.initiative_departments(initiative_id);
+CREATE INDEX IX_initiative_departments_department ON dbo.initiative_departments(department, initiative_id);
 CREATE INDEX IX_monthly_metrics_period ON dbo.monthly_metrics(metric_period);
+CREATE INDEX IX_metric_values_period ON dbo.metric_values(metric_period, metric_name) INCLUDE (monthly_metric_id, numeric_value);
+CREATE INDEX IX_metric_values_monthly_metric ON dbo.metric_values(monthly_metric_id);
+CREATE INDEX IX_metric_values_name ON dbo.metric_values(metric_name, metric_period) INCLUDE (initiative_id, numeric_value);
 CREATE INDEX IX_field_options_field_name ON dbo.field_options(field_name, is_active);
 CREATE INDEX IX_risks_initiative ON dbo.risks(initiative_id);
 CREATE INDEX IX_progress_updates_initiative ON dbo.progress_updates(initiative_id, created_at DESC);
 CREATE INDEX IX_roi_conversations_created_at ON dbo.roi_conversations(created_at DESC);
 CREATE INDEX IX_complexity_conversations_created_at ON dbo.complexity_conversations(created_at DESC);
 CREATE INDEX IX_complexity_conversations_user ON dbo.complexity_conversations(created_by_email, created_at DESC);
+CREATE INDEX IX_llm_response_cache_expires ON dbo.llm_response_cache(assistant, expires_at);
+-- Delta exports: row_version for since=<token>, modified_at for since=<timestamp>
+CREATE INDEX IX_initiatives_row_version ON dbo.initiatives(row_version);
+CREATE INDEX IX_monthly_metrics_row_version ON dbo.monthly_metrics(row_version);
+CREATE INDEX IX_monthly_metrics_modified ON dbo.monthly_metrics(modified_at);
+CREATE INDEX IX_risks_row_version ON dbo.risks(row_version);
+CREATE INDEX IX_risks_modified ON dbo.risks(modified_at);
+CREATE INDEX IX_progress_updates_row_version ON dbo.progress_updates(row_version);
+CREATE INDEX IX_progress_updates_modified ON dbo.progress_updates(modified_at);
+CREATE INDEX IX_export_tombstones_row_version ON dbo.export_tombstones(row_version);
+CREATE INDEX IX_export_tombstones_deleted ON dbo.export_tombstones(deleted_at);
+
+GO
+
+-- Tombstone triggers for delta exports (fire for cascaded deletes too)
+CREATE TRIGGER dbo.TR_initiatives_tombstone ON dbo.initiatives AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'initiatives', id, id FROM deleted;
+END;
+GO
+
+CREATE TRIGGER dbo.TR_monthly_metrics_tombstone ON dbo.monthly_metrics AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'monthly_metrics', id, initiative_id FROM deleted;
+END;
+GO
+
+CREATE TRIGGER dbo.TR_risks_tombstone ON dbo.risks AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'risks', id, initiative_id FROM deleted;
+END;
+GO
+
+CREATE TRIGGER dbo.TR_progress_updates_tombstone ON dbo.progress_updates AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'progress_updates', id, initiative_id FROM deleted;
+END;
+GO
 
+-- Shallow merge of two JSON objects: keys in @patch replace or extend those in @base.
+-- Used by the monthly metrics upsert so additional_metrics is merged in the same
+-- statement that writes it. Invalid JSON counts as an empty object, keys compare
+-- case-sensitively, and an empty result is NULL.
+CREATE OR ALTER FUNCTION dbo.json_merge_objects (@base NVARCHAR(MAX), @patch NVARCHAR(MAX))
+RETURNS NVARCHAR(MAX)
+AS
+BEGIN
+    DECLARE @merged NVARCHAR(MAX);
+    IF ISJSON(@base) = 0 OR @base IS NULL SET @base = N'{}';
+    IF ISJSON(@patch) = 0 OR @patch IS NULL SET @patch = N'{}';
+
+    SELECT @merged = N'{' + STRING_AGG(
+        CAST(N'"' + STRING_ESCAPE(m.[key], 'json') + N'":' +
+            CASE m.[type]
+                WHEN 0 THEN N'null'
+                WHEN 1 THEN N'"' + STRING_ESCAPE(m.[value], 'json') + N'"'
+                ELSE m.[value]
+            END AS NVARCHAR(MAX)),
+        N',') + N'}'
+    FROM (
+        SELECT b.[key], b.[value], b.[type]
+        FROM OPENJSON(@base) b
+        WHERE NOT EXISTS (
+            SELECT 1 FROM OPENJSON(@patch) p
+            WHERE p.[key] COLLATE Latin1_General_BIN2 = b.[key] COLLATE Latin1_General_BIN2
+        )
+        UNION ALL
+        SELECT [key], [value], [type] FROM OPENJSON(@patch)
+    ) m;
+
+    RETURN @merged;
+END;
 GO
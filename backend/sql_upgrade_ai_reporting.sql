@@ -0,0 +1,303 @@
+-- AI Reporting Application - Upgrade Script
+-- Brings an existing database up to the current schema without dropping data.
+-- Every step is idempotent, so the whole script can be re-run safely.
+
+USE AIReporting;
+GO
+
+-- metric_values: normalized copy of monthly_metrics.additional_metrics
+-- After creating it, populate it with: flask --app app backfill-metric-values
+IF OBJECT_ID('dbo.metric_values', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.metric_values (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        monthly_metric_id INT NOT NULL,
+        initiative_id INT NOT NULL,
+        metric_period NVARCHAR(7) NOT NULL, -- Format: YYYY-MM
+        metric_name NVARCHAR(255) NOT NULL,
+        numeric_value FLOAT, -- NULL when the value is not numeric
+        raw_value NVARCHAR(MAX), -- JSON-encoded value as submitted
+        comments NVARCHAR(MAX),
+        FOREIGN KEY (monthly_metric_id) REFERENCES dbo.monthly_metrics(id) ON DELETE CASCADE,
+        UNIQUE (initiative_id, metric_period, metric_name)
+    );
+END
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_metric_values_period' AND object_id = OBJECT_ID('dbo.metric_values'))
+    CREATE INDEX IX_metric_values_period ON dbo.metric_values(metric_period, metric_name) INCLUDE (monthly_metric_id, numeric_value);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_metric_values_monthly_metric' AND object_id = OBJECT_ID('dbo.metric_values'))
+    CREATE INDEX IX_metric_values_monthly_metric ON dbo.metric_values(monthly_metric_id);
+GO
+
+-- Metric name lookup for /api/dashboard/metric/<metric_name>
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_metric_values_name' AND object_id = OBJECT_ID('dbo.metric_values'))
+    CREATE INDEX IX_metric_values_name ON dbo.metric_values(metric_name, metric_period) INCLUDE (initiative_id, numeric_value);
+GO
+
+-- Keyset pagination and filters for GET /api/initiatives
+-- The single-column status and health_status indexes are widened to (column, modified_at, id)
+IF EXISTS (SELECT 1 FROM sys.index_columns ic JOIN sys.indexes ix ON ix.object_id = ic.object_id AND ix.index_id = ic.index_id
+           WHERE ix.name = 'IX_initiatives_status' AND ix.object_id = OBJECT_ID('dbo.initiatives') AND ic.key_ordinal = 2)
+    PRINT 'IX_initiatives_status already widened';
+ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_status' AND object_id = OBJECT_ID('dbo.initiatives'))
+    DROP INDEX IX_initiatives_status ON dbo.initiatives;
+IF EXISTS (SELECT 1 FROM sys.index_columns ic JOIN sys.indexes ix ON ix.object_id = ic.object_id AND ix.index_id = ic.index_id
+           WHERE ix.name = 'IX_initiatives_health_status' AND ix.object_id = OBJECT_ID('dbo.initiatives') AND ic.key_ordinal = 2)
+    PRINT 'IX_initiatives_health_status already widened';
+ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_health_status' AND object_id = OBJECT_ID('dbo.initiatives'))
+    DROP INDEX IX_initiatives_health_status ON dbo.initiatives;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_modified' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_modified ON dbo.initiatives(modified_at DESC, id DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_created' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_created ON dbo.initiatives(created_at DESC, id DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_name' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_name ON dbo.initiatives(use_case_name, id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_status' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_status ON dbo.initiatives(status, modified_at DESC, id DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_health_status' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_health_status ON dbo.initiatives(health_status, modified_at DESC, id DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_business_unit' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_business_unit ON dbo.initiatives(business_unit, modified_at DESC, id DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_type' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_type ON dbo.initiatives(initiative_type, modified_at DESC, id DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_priority' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_priority ON dbo.initiatives(priority, modified_at DESC, id DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiative_departments_initiative' AND object_id = OBJECT_ID('dbo.initiative_departments'))
+    CREATE INDEX IX_initiative_departments_initiative ON dbo.initiative_departments(initiative_id);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiative_departments_department' AND object_id = OBJECT_ID('dbo.initiative_departments'))
+    CREATE INDEX IX_initiative_departments_department ON dbo.initiative_departments(department, initiative_id);
+GO
+
+-- Content-addressed image store
+IF OBJECT_ID('dbo.image_blobs', 'U') IS NULL
+    CREATE TABLE dbo.image_blobs (
+        image_hash CHAR(64) NOT NULL,
+        variant NVARCHAR(20) NOT NULL,
+        content_type NVARCHAR(100) NOT NULL,
+        byte_size INT NOT NULL,
+        data VARBINARY(MAX) NOT NULL,
+        created_at DATETIME DEFAULT GETDATE(),
+        PRIMARY KEY (image_hash, variant)
+    );
+IF COL_LENGTH('dbo.initiatives', 'image_hash') IS NULL
+    ALTER TABLE dbo.initiatives ADD image_hash CHAR(64);
+GO
+-- Then run `flask --app app migrate-initiative-images` to move existing base64 images.
+
+-- Delta exports (since=): row_version change tracking, tombstones and their indexes
+IF OBJECT_ID('dbo.export_tombstones', 'U') IS NULL
+    CREATE TABLE dbo.export_tombstones (
+        id BIGINT IDENTITY(1,1) PRIMARY KEY,
+        table_name NVARCHAR(50) NOT NULL,
+        row_id INT NOT NULL,
+        initiative_id INT,
+        deleted_at DATETIME DEFAULT GETDATE(),
+        row_version ROWVERSION
+    );
+IF COL_LENGTH('dbo.initiatives', 'row_version') IS NULL
+    ALTER TABLE dbo.initiatives ADD row_version ROWVERSION;
+IF COL_LENGTH('dbo.monthly_metrics', 'row_version') IS NULL
+    ALTER TABLE dbo.monthly_metrics ADD row_version ROWVERSION;
+IF COL_LENGTH('dbo.risks', 'row_version') IS NULL
+    ALTER TABLE dbo.risks ADD row_version ROWVERSION;
+IF COL_LENGTH('dbo.progress_updates', 'row_version') IS NULL
+    ALTER TABLE dbo.progress_updates ADD row_version ROWVERSION;
+-- Export fingerprints also track department changes, which don't touch initiatives
+IF COL_LENGTH('dbo.initiative_departments', 'row_version') IS NULL
+    ALTER TABLE dbo.initiative_departments ADD row_version ROWVERSION;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_initiatives_row_version' AND object_id = OBJECT_ID('dbo.initiatives'))
+    CREATE INDEX IX_initiatives_row_version ON dbo.initiatives(row_version);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_monthly_metrics_row_version' AND object_id = OBJECT_ID('dbo.monthly_metrics'))
+    CREATE INDEX IX_monthly_metrics_row_version ON dbo.monthly_metrics(row_version);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_monthly_metrics_modified' AND object_id = OBJECT_ID('dbo.monthly_metrics'))
+    CREATE INDEX IX_monthly_metrics_modified ON dbo.monthly_metrics(modified_at);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_risks_row_version' AND object_id = OBJECT_ID('dbo.risks'))
+    CREATE INDEX IX_risks_row_version ON dbo.risks(row_version);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_risks_modified' AND object_id = OBJECT_ID('dbo.risks'))
+    CREATE INDEX IX_risks_modified ON dbo.risks(modified_at);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_progress_updates_row_version' AND object_id = OBJECT_ID('dbo.progress_updates'))
+    CREATE INDEX IX_progress_updates_row_version ON dbo.progress_updates(row_version);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_progress_updates_modified' AND object_id = OBJECT_ID('dbo.progress_updates'))
+    CREATE INDEX IX_progress_updates_modified ON dbo.progress_updates(modified_at);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_export_tombstones_row_version' AND object_id = OBJECT_ID('dbo.export_tombstones'))
+    CREATE INDEX IX_export_tombstones_row_version ON dbo.export_tombstones(row_version);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_export_tombstones_deleted' AND object_id = OBJECT_ID('dbo.export_tombstones'))
+    CREATE INDEX IX_export_tombstones_deleted ON dbo.export_tombstones(deleted_at);
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_initiatives_tombstone ON dbo.initiatives AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'initiatives', id, id FROM deleted;
+END;
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_monthly_metrics_tombstone ON dbo.monthly_metrics AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'monthly_metrics', id, initiative_id FROM deleted;
+END;
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_risks_tombstone ON dbo.risks AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'risks', id, initiative_id FROM deleted;
+END;
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_progress_updates_tombstone ON dbo.progress_updates AFTER DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.export_tombstones (table_name, row_id, initiative_id)
+    SELECT 'progress_updates', id, initiative_id FROM deleted;
+END;
+GO
+
+-- monthly_metrics: one row per (initiative_id, metric_period), required by the MERGE upsert.
+-- Databases created from older scripts may lack the constraint; duplicates must be
+-- resolved by hand before it can be added.
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes ix
+    WHERE ix.object_id = OBJECT_ID('dbo.monthly_metrics') AND ix.is_unique = 1
+      AND (SELECT COUNT(*) FROM sys.index_columns ic WHERE ic.object_id = ix.object_id AND ic.index_id = ix.index_id) = 2
+      AND EXISTS (SELECT 1 FROM sys.index_columns ic WHERE ic.object_id = ix.object_id AND ic.index_id = ix.index_id
+                  AND ic.column_id = COLUMNPROPERTY(ix.object_id, 'initiative_id', 'ColumnId'))
+      AND EXISTS (SELECT 1 FROM sys.index_columns ic WHERE ic.object_id = ix.object_id AND ic.index_id = ix.index_id
+                  AND ic.column_id = COLUMNPROPERTY(ix.object_id, 'metric_period', 'ColumnId'))
+)
+BEGIN
+    IF EXISTS (SELECT 1 FROM dbo.monthly_metrics GROUP BY initiative_id, metric_period HAVING COUNT(*) > 1)
+        RAISERROR('monthly_metrics has duplicate (initiative_id, metric_period) rows; merge them before re-running', 16, 1);
+    ELSE
+        CREATE UNIQUE INDEX UX_monthly_metrics_initiative_period ON dbo.monthly_metrics(initiative_id, metric_period);
+END;
+GO
+
+-- Shallow merge of two JSON objects: keys in @patch replace or extend those in @base.
+-- Used by the monthly metrics upsert so additional_metrics is merged in the same
+-- statement that writes it. Invalid JSON counts as an empty object, keys compare
+-- case-sensitively, and an empty result is NULL.
+CREATE OR ALTER FUNCTION dbo.json_merge_objects (@base NVARCHAR(MAX), @patch NVARCHAR(MAX))
+RETURNS NVARCHAR(MAX)
+AS
+BEGIN
+    DECLARE @merged NVARCHAR(MAX);
+    IF ISJSON(@base) = 0 OR @base IS NULL SET @base = N'{}';
+    IF ISJSON(@patch) = 0 OR @patch IS NULL SET @patch = N'{}';
+
+    SELECT @merged = N'{' + STRING_AGG(
+        CAST(N'"' + STRING_ESCAPE(m.[key], 'json') + N'":' +
+            CASE m.[type]
+                WHEN 0 THEN N'null'
+                WHEN 1 THEN N'"' + STRING_ESCAPE(m.[value], 'json') + N'"'
+                ELSE m.[value]
+            END AS NVARCHAR(MAX)),
+        N',') + N'}'
+    FROM (
+        SELECT b.[key], b.[value], b.[type]
+        FROM OPENJSON(@base) b
+        WHERE NOT EXISTS (
+            SELECT 1 FROM OPENJSON(@patch) p
+            WHERE p.[key] COLLATE Latin1_General_BIN2 = b.[key] COLLATE Latin1_General_BIN2
+        )
+        UNION ALL
+        SELECT [key], [value], [type] FROM OPENJSON(@patch)
+    ) m;
+
+    RETURN @merged;
+END;
+GO
+
+-- Recommendation cache: persistent tier for ROI assistant / complexity analyzer responses
+IF OBJECT_ID('dbo.llm_response_cache', 'U') IS NULL
+    CREATE TABLE dbo.llm_response_cache (
+        cache_key CHAR(64) NOT NULL PRIMARY KEY,
+        assistant NVARCHAR(50) NOT NULL,
+        prompt_version INT NOT NULL,
+        response NVARCHAR(MAX) NOT NULL,
+        generation_ms INT,
+        hit_count INT NOT NULL DEFAULT 0,
+        created_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+        expires_at DATETIME2 NOT NULL,
+        last_hit_at DATETIME2
+    );
+GO
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_llm_response_cache_expires' AND object_id = OBJECT_ID('dbo.llm_response_cache'))
+    CREATE INDEX IX_llm_response_cache_expires ON dbo.llm_response_cache(assistant, expires_at);
+GO
+
+-- Conversation ids: move roi_conversations / complexity_conversations from IDENTITY
+-- to sequences (continuing from the current max id) so the backend can reserve ids
+-- in blocks for its write-behind queue. Each table is rebuilt once, keeping its ids.
+IF COLUMNPROPERTY(OBJECT_ID('dbo.roi_conversations'), 'id', 'IsIdentity') = 1
+BEGIN
+    BEGIN TRANSACTION;
+    DECLARE @next_id INT = (SELECT ISNULL(MAX(id), 0) + 1 FROM dbo.roi_conversations WITH (TABLOCKX, HOLDLOCK));
+    DECLARE @sql NVARCHAR(MAX) = N'CREATE SEQUENCE dbo.roi_conversation_ids AS INT START WITH '
+        + CAST(@next_id AS NVARCHAR(12)) + N' INCREMENT BY 1;';
+    IF OBJECT_ID('dbo.roi_conversation_ids', 'SO') IS NOT NULL DROP SEQUENCE dbo.roi_conversation_ids;
+    EXEC sp_executesql @sql;
+    EXEC sp_rename 'dbo.roi_conversations', 'roi_conversations_identity';
+    EXEC(N'
+        CREATE TABLE dbo.roi_conversations (
+            id INT NOT NULL PRIMARY KEY DEFAULT (NEXT VALUE FOR dbo.roi_conversation_ids),
+            user_responses NVARCHAR(MAX) NOT NULL,
+            llm_recommendation NVARCHAR(MAX) NOT NULL,
+            created_at DATETIME DEFAULT GETDATE(),
+            created_by_name NVARCHAR(255),
+            created_by_email NVARCHAR(255)
+        );
+        INSERT INTO dbo.roi_conversations (id, user_responses, llm_recommendation, created_at, created_by_name, created_by_email)
+        SELECT id, user_responses, llm_recommendation, created_at, created_by_name, created_by_email FROM dbo.roi_conversations_identity;
+        DROP TABLE dbo.roi_conversations_identity;
+    ');
+    COMMIT TRANSACTION;
+END
+GO
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_roi_conversations_created_at' AND object_id = OBJECT_ID('dbo.roi_conversations'))
+    CREATE INDEX IX_roi_conversations_created_at ON dbo.roi_conversations(created_at DESC);
+GO
+
+IF COLUMNPROPERTY(OBJECT_ID('dbo.complexity_conversations'), 'id', 'IsIdentity') = 1
+BEGIN
+    BEGIN TRANSACTION;
+    DECLARE @next_id INT = (SELECT ISNULL(MAX(id), 0) + 1 FROM dbo.complexity_conversations WITH (TABLOCKX, HOLDLOCK));
+    DECLARE @sql NVARCHAR(MAX) = N'CREATE SEQUENCE dbo.complexity_conversation_ids AS INT START WITH '
+        + CAST(@next_id AS NVARCHAR(12)) + N' INCREMENT BY 1;';
+    IF OBJECT_ID('dbo.complexity_conversation_ids', 'SO') IS NOT NULL DROP SEQUENCE dbo.complexity_conversation_ids;
+    EXEC sp_executesql @sql;
+    EXEC sp_rename 'dbo.complexity_conversations', 'complexity_conversations_identity';
+    EXEC(N'
+        CREATE TABLE dbo.complexity_conversations (
+            id INT NOT NULL PRIMARY KEY DEFAULT (NEXT VALUE FOR dbo.complexity_conversation_ids),
+            initiative_name NVARCHAR(500),
+            user_responses NVARCHAR(MAX) NOT NULL,
+            complexity_score DECIMAL(5,2),
+            value_score DECIMAL(5,2),
+            quadrant NVARCHAR(100),
+            llm_recommendation NVARCHAR(MAX) NOT NULL,
+            created_at DATETIME DEFAULT GETDATE(),
+            created_by_name NVARCHAR(255),
+            created_by_email NVARCHAR(255)
+        );
+        INSERT INTO dbo.complexity_conversations (id, initiative_name, user_responses, complexity_score, value_score, quadrant, llm_recommendation, created_at, created_by_name, created_by_email)
+        SELECT id, initiative_name, user_responses, complexity_score, value_score, quadrant, llm_recommendation, created_at, created_by_name, created_by_email FROM dbo.complexity_conversations_identity;
+        DROP TABLE dbo.complexity_conversations_identity;
+    ');
+    COMMIT TRANSACTION;
+END
+GO
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_complexity_conversations_created_at' AND object_id = OBJECT_ID('dbo.complexity_conversations'))
+    CREATE INDEX IX_complexity_conversations_created_at ON dbo.complexity_conversations(created_at DESC);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_complexity_conversations_user' AND object_id = OBJECT_ID('dbo.complexity_conversations'))
+    CREATE INDEX IX_complexity_conversations_user ON dbo.complexity_conversations(created_by_email, created_at DESC);
+GO
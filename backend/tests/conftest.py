@@ -0,0 +1,146 @@
+"""
+Shared fixtures: the app imported with a fake database in place of SQL Server.
+
+Tests never open a real connection. FakeDatabase stands in for get_db_connection()
+and records every statement so tests can assert on what was sent and how often.
+Run with `python -m pytest tests` from backend/.
+"""
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('OPENAI_API_KEY', 'test')
+os.environ.setdefault('OPENAI_ENDPOINT', 'http://127.0.0.1:9')
+
+try:
+    import pyodbc  # noqa: F401
+except ImportError:
+    # pyodbc needs the unixODBC driver manager at import time; the tests only
+    # use FakeDatabase, so a bare module is enough to import the app without it
+    sys.modules['pyodbc'] = types.SimpleNamespace(pooling=False, connect=None)
+
+import app as backend  # noqa: E402
+
+class FakeCursor:
+    """Cursor that records statements and serves result sets from FakeDatabase.handler"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.fast_executemany = False
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+        self._pending = []
+
+    def execute(self, sql, *params):
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = tuple(params[0])
+        self.connection.database.record('execute', sql, params)
+        result = self.connection.database.handler(self.connection, sql, params)
+        self._pending = list(result) if isinstance(result, list) else [result or ([], [])]
+        self._advance()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        rows = [tuple(params) for params in seq_of_params]
+        self.connection.database.record('executemany', sql, rows)
+        self.connection.database.handle_many(self.connection, sql, rows)
+
+    def _advance(self):
+        if not self._pending:
+            self.description = None
+            self._rows = []
+            return False
+        columns, rows = self._pending.pop(0)
+        self.description = [(column,) for column in columns] if columns else None
+        self._rows = list(rows)
+        self.rowcount = len(self._rows)
+        return True
+
+    def nextset(self):
+        return self._advance()
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+        self.staged = []
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.database.commit(self)
+
+    def rollback(self):
+        self.staged = []
+
+    def close(self):
+        self.closed = True
+
+class FakeDatabase:
+    """
+    Records statements and delegates results to overridable hooks.
+
+    handler(conn, sql, params) returns (columns, rows), a list of them for
+    multi-result batches, or None. handle_many(conn, sql, rows) receives
+    executemany calls and commit(conn) is called on commit.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.statements = []
+        self.commits = 0
+
+    def record(self, kind, sql, params):
+        with self.lock:
+            self.statements.append((kind, ' '.join(sql.split()), params))
+
+    def handler(self, conn, sql, params):
+        return None
+
+    def handle_many(self, conn, sql, rows):
+        pass
+
+    def commit(self, conn):
+        with self.lock:
+            self.commits += 1
+
+    def connect(self):
+        return FakeConnection(self)
+
+    def sql(self, kind=None):
+        """Recorded statement texts, optionally only those of one kind"""
+        return [sql for statement_kind, sql, _ in self.statements if kind in (None, statement_kind)]
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(backend, 'get_db_connection', database.connect)
+    backend.dashboard_cache.invalidate(backend.DASHBOARD_STATS, backend.MONTHLY_TRENDS)
+    return database
+
+@pytest.fixture
+def pooled_db(monkeypatch):
+    """FakeDatabase behind a real ConnectionPool, for tests about connection checkout"""
+    database = FakeDatabase()
+    monkeypatch.setattr(backend, 'db_pool', backend.ConnectionPool(database.connect, max_size=2, checkout_timeout=1))
+    return database
+
+@pytest.fixture
+def client():
+    return backend.app.test_client()
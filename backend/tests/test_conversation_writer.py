@@ -0,0 +1,301 @@
+"""Write-behind conversation persistence and its documented durability guarantees"""
+import logging
+import threading
+import time
+
+import pytest
+
+import app as backend
+from app import ConversationWriter
+
+class ConversationTables:
+    """
+    In-memory conversation tables behind FakeDatabase.
+
+    Ids come from per-table sequences. Inserts are staged per connection and
+    applied on commit, skipping ids that already exist, like the WHERE NOT
+    EXISTS insert. fail_commits makes the next insert commits raise, either before
+    (lost) or after (ambiguous) the rows are applied. reservations_down makes
+    id reservations raise, as they do while the database is unreachable.
+    """
+
+    def __init__(self, fake_db):
+        self.fake_db = fake_db
+        self.rows = {'roi_conversations': [], 'complexity_conversations': []}
+        self.sequences = {'dbo.roi_conversation_ids': 1, 'dbo.complexity_conversation_ids': 1}
+        self.fail_commits = 0
+        self.apply_before_failing = False
+        self.reservations_down = False
+        self.block_writer = None
+        self.lock = threading.Lock()
+        fake_db.handler = self.handler
+        fake_db.handle_many = self.handle_many
+        fake_db.commit = self.commit
+
+    def handler(self, conn, sql, params):
+        if 'sp_sequence_get_range' in sql:
+            if self.reservations_down:
+                raise RuntimeError('database unavailable')
+            sequence, count = params
+            with self.lock:
+                first = self.sequences[sequence]
+                self.sequences[sequence] += count
+            return (['first'], [(first,)])
+        if 'FROM complexity_conversations' in sql and 'WHERE id' in sql:
+            return (['id', 'initiative_name'], [(row[0], row[1]) for row in self.rows['complexity_conversations']
+                                                 if row[0] == params[0]])
+        return None
+
+    def handle_many(self, conn, sql, rows):
+        table = sql.split('INSERT INTO', 1)[1].split()[0]
+        conn.staged.append((table, rows))
+
+    def commit(self, conn):
+        if self.block_writer is not None and threading.current_thread().name == 'conversation-writer':
+            self.block_writer.wait(5)
+        staged, conn.staged = conn.staged, []
+        with self.lock:
+            # fail_commits only affects insert batches; reservations_down covers id reservations
+            failing = bool(staged) and self.fail_commits > 0
+            if failing:
+                self.fail_commits -= 1
+            if failing and not self.apply_before_failing:
+                raise RuntimeError('database unavailable')
+            for table, rows in staged:
+                existing = {row[0] for row in self.rows[table]}
+                for row in rows:
+                    # Parameters are the row followed by its id again for WHERE NOT EXISTS
+                    assert row[-1] == row[0]
+                    if row[0] not in existing:
+                        self.rows[table].append(row[:-1])
+                        existing.add(row[0])
+        if failing:
+            raise RuntimeError('connection lost after commit')
+
+    def ids(self, table='roi_conversations'):
+        with self.lock:
+            return [row[0] for row in self.rows[table]]
+
+    def batches(self):
+        return [len(rows) for kind, _, rows in self.fake_db.statements if kind == 'executemany']
+
+@pytest.fixture
+def tables(fake_db):
+    return ConversationTables(fake_db)
+
+@pytest.fixture
+def make_writer():
+    writers = []
+
+    def make(**overrides):
+        config = dict(enabled=True, batch_size=100, flush_interval_seconds=0.05, max_pending=1000,
+                      id_block_size=10, retry_max_seconds=0.05, shutdown_timeout_seconds=2)
+        config.update(overrides)
+        writer = ConversationWriter(**config)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.close()
+
+def roi_row(text='answer'):
+    return ('{}', text, None, 'Test User', 'test@example.com')
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_save_returns_ids_without_writing(tables, make_writer):
+    writer = make_writer(flush_interval_seconds=5)
+    ids = [writer.save('roi_conversations', roi_row()) for _ in range(3)]
+
+    assert ids == [1, 2, 3]
+    assert tables.ids() == []
+    assert writer.stats()['pending'] == 3
+
+def test_ids_are_reserved_in_blocks(tables, make_writer):
+    writer = make_writer(id_block_size=4)
+    ids = [writer.save('roi_conversations', roi_row()) for _ in range(9)]
+
+    assert ids == list(range(1, 10))
+    assert len([sql for sql in tables.fake_db.sql() if 'sp_sequence_get_range' in sql]) == 3
+    assert writer.stats()['id_blocks_reserved'] == 3
+
+def test_batches_by_size(tables, make_writer):
+    writer = make_writer(batch_size=3, flush_interval_seconds=30)
+    for _ in range(7):
+        writer.save('roi_conversations', roi_row())
+
+    # Two full batches go out at once; the seventh row waits for the interval
+    assert wait_until(lambda: len(tables.ids()) == 6)
+    time.sleep(0.1)
+    assert tables.ids() == [1, 2, 3, 4, 5, 6]
+    assert tables.batches() == [3, 3]
+
+def test_batches_by_interval(tables, make_writer):
+    writer = make_writer(batch_size=100, flush_interval_seconds=0.2)
+    started = time.monotonic()
+    writer.save('roi_conversations', roi_row())
+    writer.save('roi_conversations', roi_row())
+
+    assert wait_until(lambda: len(tables.ids()) == 2)
+    assert time.monotonic() - started >= 0.15
+    assert tables.batches() == [2]
+
+def test_batch_covers_both_tables_in_one_transaction(tables, make_writer):
+    writer = make_writer(flush_interval_seconds=0.1)
+    writer.save('roi_conversations', roi_row())
+    writer.save('complexity_conversations', ('Name', '{}', 10, 20, 'Quick Wins', 'text', None, 'Test User', 'test@example.com'))
+
+    assert writer.wait_for_pending(2)
+    assert tables.ids('roi_conversations') == [1]
+    assert tables.ids('complexity_conversations') == [1]
+    assert writer.stats()['batches'] == 1
+
+def test_failed_batch_is_retried_not_dropped(tables, make_writer):
+    tables.fail_commits = 2
+    writer = make_writer()
+    ids = [writer.save('roi_conversations', roi_row()) for _ in range(3)]
+
+    assert writer.wait_for_pending(5)
+    assert tables.ids() == ids
+    stats = writer.stats()
+    assert stats['batch_failures'] == 2 and stats['written'] == 3
+
+def test_retry_after_ambiguous_commit_does_not_duplicate(tables, make_writer):
+    # The first commit lands but reports failure, so the same batch is sent again
+    tables.fail_commits = 1
+    tables.apply_before_failing = True
+    writer = make_writer()
+    ids = [writer.save('roi_conversations', roi_row()) for _ in range(3)]
+
+    assert writer.wait_for_pending(5)
+    assert tables.ids() == ids
+    assert tables.batches() == [3, 3]
+    insert_sql = tables.fake_db.sql('executemany')[0]
+    assert 'WHERE NOT EXISTS (SELECT 1 FROM roi_conversations WHERE id = ?)' in insert_sql
+
+def test_full_queue_falls_back_to_synchronous_write(tables, make_writer):
+    tables.block_writer = threading.Event()
+    writer = make_writer(max_pending=2, batch_size=1, flush_interval_seconds=0)
+    writer.save('roi_conversations', roi_row('in flight'))
+    assert wait_until(lambda: writer.stats()['pending'] == 0)  # taken by the (blocked) writer thread
+    writer.save('roi_conversations', roi_row('queued 1'))
+    writer.save('roi_conversations', roi_row('queued 2'))
+
+    sync_id = writer.save('roi_conversations', roi_row('overflow'))
+
+    # Written by the caller before save() returned, ahead of the blocked queue
+    assert tables.ids() == [sync_id]
+    assert writer.stats()['sync_writes'] == 1
+    tables.block_writer.set()
+    assert writer.wait_for_pending(5)
+    assert sorted(tables.ids()) == [1, 2, 3, 4]
+
+def test_saves_are_queued_while_ids_cannot_be_reserved(tables, make_writer):
+    writer = make_writer(id_block_size=2)
+    first_id = writer.save('roi_conversations', roi_row())
+    tables.reservations_down = True
+    tables.fail_commits = 10 ** 6
+
+    # The rest of the reserved block is used first, then rows are queued without an id
+    ids = [writer.save('roi_conversations', roi_row(f'outage {n}')) for n in range(3)]
+
+    assert ids == [2, None, None]
+    assert writer.stats()['queued_without_id'] == 2
+    assert not writer.wait_for_pending(0.3)
+
+    tables.reservations_down = False
+    tables.fail_commits = 0
+    assert writer.wait_for_pending(5)
+    assert tables.ids() == [first_id, 2, 3, 4]
+    assert [row[2] for row in tables.rows['roi_conversations'][2:]] == ['outage 1', 'outage 2']
+
+def test_ids_reserved_at_write_survive_an_ambiguous_commit(tables, make_writer):
+    tables.reservations_down = True
+    writer = make_writer(flush_interval_seconds=30)
+    assert writer.save('roi_conversations', roi_row()) is None
+    tables.reservations_down = False
+    tables.fail_commits = 1
+    tables.apply_before_failing = True
+
+    writer.close()
+
+    # The retry reuses the id reserved for the first attempt instead of reserving another
+    assert tables.ids() == [1]
+    assert tables.batches() == [1, 1]
+
+def test_full_queue_without_ids_reports_no_conversation_id(tables, make_writer, monkeypatch):
+    tables.reservations_down = True
+    writer = make_writer(max_pending=1, flush_interval_seconds=30)
+    monkeypatch.setattr(backend, 'conversation_writer', writer)
+
+    assert backend.save_roi_conversation({}, 'queued') is None
+    assert backend.save_roi_conversation({}, 'overflow') is None
+    stats = writer.stats()
+    assert stats['pending'] == 1 and stats['sync_writes'] == 1
+
+def test_disabled_writer_inserts_synchronously(tables, make_writer):
+    writer = make_writer(enabled=False)
+    conversation_id = writer.save('roi_conversations', roi_row())
+
+    assert tables.ids() == [conversation_id]
+    assert writer.stats()['sync_writes'] == 1
+
+def test_close_flushes_the_queue(tables, make_writer):
+    writer = make_writer(flush_interval_seconds=30)
+    ids = [writer.save('roi_conversations', roi_row()) for _ in range(5)]
+    assert tables.ids() == []
+
+    writer.close()
+
+    assert tables.ids() == ids
+    assert not writer._thread.is_alive()
+    # After close, saves are written synchronously rather than queued
+    late_id = writer.save('roi_conversations', roi_row())
+    assert tables.ids()[-1] == late_id
+
+def test_close_gives_up_after_timeout_and_logs_ids(tables, make_writer, caplog):
+    tables.fail_commits = 10 ** 6
+    writer = make_writer(flush_interval_seconds=30, shutdown_timeout_seconds=0.3)
+    ids = [writer.save('roi_conversations', roi_row()) for _ in range(3)]
+
+    started = time.monotonic()
+    with caplog.at_level(logging.ERROR, logger=backend.logger.name):
+        writer.close()
+
+    assert time.monotonic() - started < 2
+    assert tables.ids() == []
+    assert writer.stats()['lost_on_shutdown'] == 3
+    assert f"ids {ids}" in caplog.text
+
+def test_wait_for_pending_gives_read_after_write(tables, make_writer):
+    writer = make_writer(flush_interval_seconds=0.2)
+    conversation_id = writer.save('roi_conversations', roi_row())
+
+    assert writer.has_pending()
+    assert writer.wait_for_pending(2)
+    assert not writer.has_pending()
+    assert tables.ids() == [conversation_id]
+
+def test_wait_for_pending_times_out_while_database_is_down(tables, make_writer):
+    tables.fail_commits = 10 ** 6
+    writer = make_writer(shutdown_timeout_seconds=0.1)
+    writer.save('roi_conversations', roi_row())
+
+    assert writer.wait_for_pending(0.2) is False
+
+def test_new_conversation_can_be_read_back_immediately(tables, make_writer, monkeypatch, client):
+    writer = make_writer(flush_interval_seconds=0.2)
+    monkeypatch.setattr(backend, 'conversation_writer', writer)
+    conversation_id = backend.save_complexity_conversation({'initiative_name': 'Triage'}, 10, 20, 'Quick Wins', 'text')
+
+    response = client.get(f'/api/complexity-conversations/{conversation_id}')
+
+    assert response.status_code == 200
+    assert response.get_json()['id'] == conversation_id
@@ -0,0 +1,44 @@
+"""Export fingerprints change whenever the exported tables do"""
+import pytest
+
+from app import EXPORT_SOURCE_TABLES, export_source_fingerprint
+
+def fingerprint(fake_db, tables):
+    """Fingerprint with tables mapping each table name to its (row_count, max_row_version)"""
+    fake_db.handler = lambda conn, sql, params: [
+        (['row_count', 'max_row_version'], [tables[table]]) for table in EXPORT_SOURCE_TABLES
+    ]
+    return export_source_fingerprint(fake_db.connect().cursor())
+
+@pytest.fixture
+def baseline():
+    return {table: (10, bytes.fromhex('00000000000007d0')) for table in EXPORT_SOURCE_TABLES}
+
+def test_one_batch_without_checksums(fake_db, baseline):
+    fingerprint(fake_db, baseline)
+
+    assert len(fake_db.statements) == 1
+    batch = fake_db.sql()[0]
+    assert 'CHECKSUM' not in batch.upper()
+    assert all(f'FROM {table}' in batch for table in EXPORT_SOURCE_TABLES)
+
+def test_unchanged_tables_give_the_same_fingerprint(fake_db, baseline):
+    assert fingerprint(fake_db, baseline) == fingerprint(fake_db, dict(baseline))
+
+@pytest.mark.parametrize('table', EXPORT_SOURCE_TABLES)
+def test_update_in_any_table_changes_the_fingerprint(fake_db, baseline, table):
+    changed = dict(baseline, **{table: (10, bytes.fromhex('00000000000007d1'))})
+    assert fingerprint(fake_db, changed) != fingerprint(fake_db, baseline)
+
+@pytest.mark.parametrize('table', EXPORT_SOURCE_TABLES)
+def test_delete_in_any_table_changes_the_fingerprint(fake_db, baseline, table):
+    changed = dict(baseline, **{table: (9, baseline[table][1])})
+    assert fingerprint(fake_db, changed) != fingerprint(fake_db, baseline)
+
+def test_same_change_in_different_tables_is_distinguished(fake_db, baseline):
+    first = dict(baseline, initiatives=(11, baseline['initiatives'][1]))
+    second = dict(baseline, risks=(11, baseline['risks'][1]))
+    assert fingerprint(fake_db, first) != fingerprint(fake_db, second)
+
+def test_empty_tables(fake_db):
+    assert fingerprint(fake_db, {table: (0, None) for table in EXPORT_SOURCE_TABLES})
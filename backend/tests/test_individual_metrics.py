@@ -0,0 +1,101 @@
+"""Individual metric edits rewrite only their own key, so concurrent edits to one period don't clobber each other"""
+import json
+import threading
+
+import pytest
+
+from app import app
+
+class MetricsBlobDatabase:
+    """
+    Keeps one period's additional_metrics blob and applies the JSON_MODIFY
+    UPDATEs atomically, the way SQL Server applies a single UPDATE. A barrier
+    holds concurrent requests inside the UPDATE so they interleave.
+    """
+
+    def __init__(self, fake_db, blob, parties=1):
+        self.blob = blob
+        self.lock = threading.Lock()
+        self.barrier = threading.Barrier(parties, timeout=5)
+        fake_db.handler = self.handler
+
+    def handler(self, conn, sql, params):
+        if 'UPDATE monthly_metrics' not in sql:
+            return None
+        self.barrier.wait()
+        key = json.loads(params[0][2:])
+        with self.lock:
+            current = json.loads(self.blob)
+            if 'JSON_MODIFY' in sql and 'NULL), N' in sql:
+                previous = current.pop(key, None)
+                self.blob = json.dumps(current)
+                return (['deleted'], [(json.dumps(previous) if previous is not None else None,)])
+            current[key] = json.loads(params[1])
+            self.blob = json.dumps(current)
+            return (['saved'], [(json.dumps(current[key]),)])
+
+def metric_url(name):
+    return f'/api/initiatives/7/metrics/2026-09/metric/{name}'
+
+def run_concurrently(*requests):
+    results = [None] * len(requests)
+
+    def run(index, request):
+        results[index] = request(app.test_client())
+
+    threads = [threading.Thread(target=run, args=(index, request)) for index, request in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+def test_concurrent_edits_to_different_metrics_both_survive(fake_db):
+    store = MetricsBlobDatabase(fake_db, json.dumps({'Hours saved': {'value': 1, 'comments': ''}}), parties=2)
+
+    responses = run_concurrently(
+        lambda client: client.put(metric_url('Hours saved'), json={'value': 10}),
+        lambda client: client.put(metric_url('Cost saved'), json={'value': 500, 'comments': 'Q3'})
+    )
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert json.loads(store.blob) == {
+        'Hours saved': {'value': 10, 'comments': ''},
+        'Cost saved': {'value': 500, 'comments': 'Q3'}
+    }
+
+def test_concurrent_edit_and_delete_of_different_metrics(fake_db):
+    store = MetricsBlobDatabase(fake_db, json.dumps({'Hours saved': {'value': 1}, 'Cost saved': {'value': 2}}), parties=2)
+
+    responses = run_concurrently(
+        lambda client: client.put(metric_url('Hours saved'), json={'value': 10}),
+        lambda client: client.delete(metric_url('Cost saved'))
+    )
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert json.loads(store.blob) == {'Hours saved': {'value': 10, 'comments': ''}}
+
+@pytest.mark.parametrize('method', ['put', 'delete'])
+def test_single_json_modify_update_and_no_read(fake_db, client, method):
+    MetricsBlobDatabase(fake_db, json.dumps({'Hours saved': {'value': 1}}))
+
+    response = getattr(client, method)(metric_url('Hours saved'), json={'value': 3})
+
+    assert response.status_code == 200
+    metric_statements = [sql for sql in fake_db.sql() if 'monthly_metrics' in sql and 'metric_values' not in sql]
+    assert len(metric_statements) == 1
+    assert metric_statements[0].startswith('UPDATE monthly_metrics') and 'JSON_MODIFY' in metric_statements[0]
+    assert not [sql for sql in fake_db.sql() if sql.startswith('SELECT') and 'FROM monthly_metrics' in sql]
+
+def test_metric_names_with_quotes_stay_one_key(fake_db, client):
+    store = MetricsBlobDatabase(fake_db, json.dumps({}))
+
+    response = client.put(metric_url('The "best" metric'), json={'value': 1})
+
+    assert response.status_code == 200
+    assert list(json.loads(store.blob)) == ['The "best" metric']
+
+def test_missing_period_is_404(fake_db, client):
+    fake_db.handler = lambda conn, sql, params: (['saved'], [])
+    assert client.put(metric_url('Hours saved'), json={'value': 1}).status_code == 404
+    assert client.delete(metric_url('Hours saved')).status_code == 404
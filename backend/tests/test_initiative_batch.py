@@ -0,0 +1,174 @@
+"""POST /api/initiatives/batch: per-item validation, client_key to id mapping and per-chunk commits"""
+import json
+
+import pytest
+
+import app as backend
+from app import INITIATIVE_BATCH_COLUMNS, write_initiative_batch
+
+class InitiativeStore:
+    """
+    initiatives and initiative_departments behind FakeDatabase.
+
+    The chunk statement is applied the way its SQL reads: staged rows without a
+    target_id are inserted under new ids and the rest replace their target, with
+    their departments replaced too. Changes are staged per connection and applied
+    on commit, so a rolled-back chunk leaves no trace. Chunks containing an item
+    named in fail_names raise instead.
+    """
+
+    def __init__(self, fake_db, initiatives=None, departments=None):
+        self.initiatives = dict(initiatives or {})
+        self.departments = dict(departments or {})
+        self.next_id = 100
+        self.fail_names = set()
+        fake_db.handler = self.handler
+        fake_db.handle_many = self.handle_many
+        fake_db.commit = self.commit
+
+    def handle_many(self, conn, sql, rows):
+        table = sql.split('INSERT INTO', 1)[1].split()[0]
+        conn.temp_tables = getattr(conn, 'temp_tables', {})
+        conn.temp_tables[table] = rows
+
+    def handler(self, conn, sql, params):
+        if sql.lstrip().startswith('SELECT id FROM initiatives WHERE id IN'):
+            return (['id'], [(initiative_id,) for initiative_id in json.loads(params[0]) if initiative_id in self.initiatives])
+        if 'MERGE initiatives' not in sql:
+            return None
+        staged = [dict(zip(['position', 'target_id', *INITIATIVE_BATCH_COLUMNS], row))
+                  for row in conn.temp_tables['#initiative_batch']]
+        if self.fail_names & {row['use_case_name'] for row in staged}:
+            raise RuntimeError('String or binary data would be truncated')
+        ids = {}
+        for row in staged:
+            if row['target_id'] is None:
+                ids[row['position']] = self.next_id
+                self.next_id += 1
+            else:
+                ids[row['position']] = row['target_id']
+        departments = {}
+        for position, department in conn.temp_tables.get('#initiative_batch_departments', []):
+            departments.setdefault(ids[position], []).append(department)
+        conn.staged.append([(ids[row['position']], row, departments.get(ids[row['position']], [])) for row in staged])
+        return (['position', 'id'], sorted(ids.items()))
+
+    def commit(self, conn):
+        staged, conn.staged = conn.staged, []
+        for changes in staged:
+            for initiative_id, row, departments in changes:
+                self.initiatives[initiative_id] = row
+                self.departments[initiative_id] = departments
+
+def batch(*items):
+    return {'initiatives': [dict({'use_case_name': f'Initiative {index}'}, **item) for index, item in enumerate(items)]}
+
+@pytest.mark.parametrize('image, error', [
+    ({'initiative_image': 'data:image/png;base64,not base64!'}, 'initiative_image is not valid base64 image data'),
+    ({'initiative_image': 12345}, 'initiative_image must be a string'),
+    ({'image_hash': 'abc'}, 'Invalid image_hash'),
+    ({'image_hash': ['f' * 64]}, 'Invalid image_hash')
+])
+def test_bad_image_is_reported_per_item(fake_db, client, image, error):
+    response = client.post('/api/initiatives/batch', json=batch({}, image, {}))
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'index': 1, 'client_key': '1', 'error': error}]
+    assert fake_db.sql('executemany') == []
+
+def test_fast_executemany_is_reset_when_staging_fails(fake_db):
+    def handle_many(conn, sql, rows):
+        raise RuntimeError('conversion failed')
+    fake_db.handle_many = handle_many
+    cursor = fake_db.connect().cursor()
+
+    with pytest.raises(RuntimeError):
+        write_initiative_batch(cursor, [(0, {'use_case_name': 'Initiative 0'})], {0: None})
+
+    assert cursor.fast_executemany is False
+
+@pytest.fixture
+def store(fake_db):
+    return InitiativeStore(fake_db, initiatives={7: {'use_case_name': 'Claims triage'}}, departments={7: ['Old']})
+
+def chunk_statements(fake_db):
+    """Statement kinds sent after validation, one list per chunk"""
+    chunks = []
+    for kind, sql, _ in fake_db.statements:
+        if 'DROP TABLE #initiative_batch;' in sql and 'SELECT TOP 0' in sql:
+            chunks.append([])
+        if chunks:
+            chunks[-1].append('stage' if kind == 'executemany' else 'merge' if 'MERGE initiatives' in sql else 'setup')
+    return chunks
+
+def test_mixed_create_and_update_map_client_keys(fake_db, client, store):
+    response = client.post('/api/initiatives/batch', json=batch(
+        {'client_key': 'new-a', 'departments': ['Sales', 'Sales', 'Claims']},
+        {'client_key': 'existing', 'id': 7, 'use_case_name': 'Claims triage v2', 'departments': ['Claims']},
+        {}
+    ))
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['ids'] == {'new-a': 100, 'existing': 7, '2': 101}
+    assert [(result['client_key'], result['action']) for result in body['results']] == [
+        ('new-a', 'created'), ('existing', 'updated'), ('2', 'created')
+    ]
+    assert (body['created'], body['updated']) == (2, 1)
+    assert store.initiatives[7]['use_case_name'] == 'Claims triage v2'
+    assert store.departments == {7: ['Claims'], 100: ['Sales', 'Claims'], 101: []}
+
+def test_one_chunk_sends_one_staging_insert_per_table_and_one_merge(fake_db, client, store):
+    response = client.post('/api/initiatives/batch', json=batch(
+        {'departments': ['Sales']}, {'id': 7, 'departments': ['Claims', '']}
+    ))
+
+    assert response.status_code == 201
+    assert chunk_statements(fake_db) == [['setup', 'stage', 'stage', 'merge']]
+    staged_rows, staged_departments = [params for kind, _, params in fake_db.statements if kind == 'executemany']
+    assert [(row[0], row[1]) for row in staged_rows] == [(0, None), (1, 7)]
+    assert staged_departments == [(0, 'Sales'), (1, 'Claims')]
+    merge = next(sql for sql in fake_db.sql() if 'MERGE initiatives' in sql)
+    assert 'OUTPUT source.position, INSERTED.id INTO #initiative_batch_ids' in merge
+    assert 'DELETE FROM initiative_departments WHERE initiative_id IN (SELECT target_id FROM #initiative_batch' in merge
+
+def test_items_are_written_in_chunks(fake_db, client, store, monkeypatch):
+    monkeypatch.setattr(backend, 'INITIATIVE_BATCH_SIZE', 2)
+
+    response = client.post('/api/initiatives/batch', json=batch(*[{} for _ in range(5)]))
+
+    assert response.status_code == 201
+    assert chunk_statements(fake_db) == [['setup', 'stage', 'merge']] * 3
+    assert [len(params) for kind, _, params in fake_db.statements if kind == 'executemany'] == [2, 2, 1]
+    assert response.get_json()['ids'] == {str(index): 100 + index for index in range(5)}
+
+def test_failed_chunk_is_207_and_earlier_chunks_stay_committed(fake_db, client, store, monkeypatch):
+    monkeypatch.setattr(backend, 'INITIATIVE_BATCH_SIZE', 2)
+    store.fail_names = {'Initiative 3'}
+
+    response = client.post('/api/initiatives/batch', json=batch(*[{} for _ in range(5)]))
+
+    assert response.status_code == 207
+    body = response.get_json()
+    assert body['ids'] == {'0': 100, '1': 101, '4': 102}
+    assert body['failed'] == [{'client_keys': ['2', '3'], 'error': 'String or binary data would be truncated'}]
+    assert sorted(store.initiatives) == [7, 100, 101, 102]
+
+def test_every_chunk_failing_is_500(fake_db, client, store):
+    store.fail_names = {'Initiative 0'}
+
+    response = client.post('/api/initiatives/batch', json=batch({}, {}))
+
+    assert response.status_code == 500
+    assert response.get_json()['ids'] == {}
+    assert sorted(store.initiatives) == [7]
+
+def test_invalid_item_saves_nothing(fake_db, client, store):
+    response = client.post('/api/initiatives/batch', json=batch({}, {'id': 8}, {'use_case_name': ' '}))
+
+    assert response.status_code == 400
+    assert [(error['index'], error['error']) for error in response.get_json()['errors']] == [
+        (1, 'Initiative 8 not found'), (2, 'use_case_name is required')
+    ]
+    assert chunk_statements(fake_db) == []
+    assert sorted(store.initiatives) == [7]
@@ -0,0 +1,43 @@
+"""Initiatives can only reference images that have been uploaded"""
+import pytest
+
+from app import resolve_image_hash
+
+KNOWN = 'a' * 64
+UNKNOWN = 'b' * 64
+
+@pytest.fixture
+def image_blobs(fake_db):
+    def handler(conn, sql, params):
+        if 'FROM image_blobs' in sql:
+            return (['found'], [(1,)] if params[0] == KNOWN else [])
+        return None
+    fake_db.handler = handler
+    return fake_db
+
+@pytest.mark.parametrize('data', [
+    {'image_hash': KNOWN},
+    {'image_hash': KNOWN.upper()},
+    {'initiative_image': f'https://reports.example.com/api/images/{KNOWN}?size=sm'}
+])
+def test_uploaded_image_is_accepted(image_blobs, data):
+    assert resolve_image_hash(image_blobs.connect().cursor(), data) == KNOWN
+
+@pytest.mark.parametrize('data', [
+    {'image_hash': UNKNOWN},
+    {'initiative_image': f'/api/images/{UNKNOWN}'}
+])
+def test_unknown_image_is_rejected(image_blobs, data):
+    with pytest.raises(ValueError, match=f'No uploaded image with hash {UNKNOWN}'):
+        resolve_image_hash(image_blobs.connect().cursor(), data)
+
+def test_unknown_image_in_batch_is_400(image_blobs, client):
+    response = client.post('/api/initiatives/batch', json={'initiatives': [
+        {'use_case_name': 'Known', 'image_hash': KNOWN},
+        {'use_case_name': 'Unknown', 'image_hash': UNKNOWN}
+    ]})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [
+        {'index': 1, 'client_key': '1', 'error': f'No uploaded image with hash {UNKNOWN}'}
+    ]
@@ -0,0 +1,60 @@
+"""Keyset pagination reaches every initiative, including those with NULL sort values"""
+import re
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+ROWS = [
+    (1, 'Claims triage', '2026-01-05 09:00:00', '2026-01-01 08:00:00'),
+    (2, None, None, '2026-01-02 08:00:00'),
+    (3, 'Underwriting', '2026-01-05 09:00:00', None),
+    (4, None, '2026-03-01 12:00:00', None),
+    (5, 'Agent assist', None, '2026-01-02 08:00:00'),
+    (6, 'Claims triage', '2026-02-10 10:00:00', '2026-01-03 08:00:00'),
+    (7, None, None, None)
+]
+
+@pytest.fixture
+def initiatives_db(fake_db):
+    """
+    Run the initiative SELECTs against SQLite, which orders NULLs like SQL Server
+    (lowest). TOP becomes LIMIT and the DATETIME casts become plain strings.
+    """
+    db = sqlite3.connect(':memory:', check_same_thread=False)
+    db.execute('CREATE TABLE initiatives (id INTEGER PRIMARY KEY, use_case_name TEXT, modified_at TEXT, created_at TEXT)')
+    db.executemany('INSERT INTO initiatives VALUES (?, ?, ?, ?)', ROWS)
+
+    def handler(conn, sql, params):
+        if 'FROM initiatives' not in sql:
+            return None
+        top = re.search(r'TOP \((\d+)\)', sql)
+        sql = re.sub(r'TOP \(\d+\)', '', sql).replace('CAST(? AS DATETIME)', '?')
+        if top:
+            sql += f' LIMIT {top.group(1)}'
+        params = [param.isoformat(' ') if isinstance(param, datetime) else param for param in params]
+        result = db.execute(sql, params)
+        return ([column[0] for column in result.description], result.fetchall())
+
+    fake_db.handler = handler
+    return db
+
+def all_pages(client, sort, order):
+    ids, cursor = [], None
+    while True:
+        query = f'/api/initiatives?fields=id&page_size=2&sort={sort}&order={order}'
+        response = client.get(query + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        body = response.get_json()
+        ids.extend(item['id'] for item in body['items'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            return ids
+
+@pytest.mark.parametrize('sort', ['use_case_name', 'modified_at', 'created_at'])
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_pages_cover_every_row_once_in_order(initiatives_db, client, sort, order):
+    expected = [row[0] for row in initiatives_db.execute(
+        f'SELECT id FROM initiatives ORDER BY {sort} {order}, id {order}')]
+
+    assert all_pages(client, sort, order) == expected
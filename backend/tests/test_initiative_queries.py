@@ -0,0 +1,61 @@
+"""Initiative list endpoints load departments in one batched query, whatever the row count"""
+import json
+
+import pytest
+
+from app import load_related
+
+def initiatives_db(fake_db, count):
+    """Serve `count` initiatives and two departments for each"""
+    def handler(conn, sql, params):
+        if 'FROM initiative_departments' in sql:
+            ids = json.loads(params[0])
+            return (['initiative_id', 'department'], [(i, name) for i in ids for name in ('Sales', 'Claims')])
+        if 'FROM initiatives' in sql:
+            return (['id', 'use_case_name'], [(i, f' Initiative {i} ') for i in range(1, count + 1)])
+        return None
+    fake_db.handler = handler
+    return fake_db
+
+def statement_count(fake_db):
+    return len([sql for sql in fake_db.sql() if sql.startswith('SELECT')])
+
+@pytest.mark.parametrize('path', [
+    '/api/initiatives?fields=id,use_case_name,departments',
+    '/api/initiatives?page_size=100&fields=id,use_case_name,departments',
+    '/api/featured-solutions?fields=id,use_case_name,departments'
+])
+def test_statement_count_does_not_grow_with_rows(fake_db, client, path):
+    counts = {}
+    for rows in (1, 50):
+        fake_db.statements.clear()
+        initiatives_db(fake_db, rows)
+        response = client.get(path)
+        assert response.status_code == 200
+        body = response.get_json()
+        items = body['items'] if isinstance(body, dict) else body
+        assert len(items) == rows
+        assert all(item['departments'] == ['Sales', 'Claims'] for item in items)
+        counts[rows] = statement_count(fake_db)
+
+    # One SELECT for the initiatives and one for all of their departments
+    assert counts[1] == counts[50] == 2
+    assert len([sql for sql in fake_db.sql() if 'FROM initiative_departments' in sql]) == 1
+
+def test_departments_not_loaded_when_not_requested(fake_db, client):
+    initiatives_db(fake_db, 10)
+    response = client.get('/api/initiatives?fields=id,use_case_name')
+    assert response.status_code == 200
+    assert not [sql for sql in fake_db.sql() if 'initiative_departments' in sql]
+
+def test_load_related_sends_one_statement(fake_db):
+    initiatives_db(fake_db, 0)
+    cursor = fake_db.connect().cursor()
+    related = load_related(cursor, 'initiative_departments', 'initiative_id', 'department', list(range(1, 501)))
+    assert len(fake_db.statements) == 1
+    assert related[1] == ['Sales', 'Claims'] and related[500] == ['Sales', 'Claims']
+
+def test_load_related_skips_query_without_keys(fake_db):
+    cursor = fake_db.connect().cursor()
+    assert load_related(cursor, 'initiative_departments', 'initiative_id', 'department', []) == {}
+    assert fake_db.statements == []
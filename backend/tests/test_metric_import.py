@@ -0,0 +1,228 @@
+"""Bulk metrics import: layout detection, cell validation and initiative resolution"""
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from app import parse_metric_import, resolve_metric_import
+
+METRIC_TYPES = {
+    'hours saved': ('Hours saved', 'quantitative'),
+    'adoption notes': ('Adoption notes', 'qualitative')
+}
+
+def parse(*rows):
+    return parse_metric_import(rows, METRIC_TYPES)
+
+def initiatives_db(fake_db, initiatives):
+    """Serve custom_metrics, initiatives given as {id: use_case_name} and the import's period counts"""
+    def handler(conn, sql, params):
+        if 'FROM custom_metrics' in sql:
+            return (['metric_name', 'metric_type'], list(METRIC_TYPES.values()))
+        if 'SELECT id FROM initiatives' in sql:
+            return (['id'], [(i,) for i in json.loads(params[0]) if i in initiatives])
+        if 'SELECT use_case_name, id FROM initiatives' in sql:
+            names = {name.lower() for name in json.loads(params[0])}
+            return (['use_case_name', 'id'], [(name, i) for i, name in initiatives.items() if name.lower() in names])
+        if 'SELECT @created_periods' in sql:
+            return (['created_periods', 'updated_periods'], [(1, 0)])
+        return None
+    fake_db.handler = handler
+    return fake_db
+
+# ---- Layouts ----
+
+def test_long_layout():
+    cells, errors, summary = parse(
+        ('initiative_id', 'metric_period', 'metric_name', 'value', 'comments'),
+        ('7', '2026-09', 'Hours saved', '12.5', 'From the timesheets'),
+        ('7', '2026-09', 'adoption notes', 'Rolled out to claims', None)
+    )
+
+    assert summary == {'layout': 'long', 'by_id': True, 'rows_read': 2}
+    assert errors == []
+    assert cells == [
+        (2, 7, '2026-09', 'Hours saved', 12.5, '12.5', 'From the timesheets'),
+        (3, 7, '2026-09', 'Adoption notes', None, '"Rolled out to claims"', None)
+    ]
+
+def test_wide_layout_pairs_comment_columns():
+    cells, errors, summary = parse(
+        ('Initiative ID', 'Metric Period', 'Hours saved', 'Hours saved Comments', 'Adoption notes'),
+        (7, '2026-09', 40, 'Estimated', 'Going well'),
+        (8, '2026-09', None, 'Comment without a value', '')
+    )
+
+    assert summary == {'layout': 'wide', 'by_id': True, 'rows_read': 2}
+    assert errors == []
+    # Blank wide cells are skipped, so row 3 adds nothing
+    assert cells == [
+        (2, 7, '2026-09', 'Hours saved', 40.0, '40', 'Estimated'),
+        (2, 7, '2026-09', 'Adoption notes', None, '"Going well"', None)
+    ]
+
+def test_wide_layout_unknown_metric_column():
+    cells, errors, _ = parse(
+        ('initiative_id', 'metric_period', 'Hours saved', 'Mystery metric', 'Mystery metric Comments'),
+        (7, '2026-09', 1, 2, 'x')
+    )
+
+    # The comments column of an unknown metric is still paired, not reported separately
+    assert errors == [{'row': 1, 'column': 'Mystery metric',
+                       'error': "Unknown metric 'Mystery metric'; add it under custom metrics first"}]
+    assert [cell[3] for cell in cells] == ['Hours saved']
+
+def test_use_case_name_identifies_initiatives():
+    cells, _, summary = parse(
+        ('use_case_name', 'metric_period', 'Hours saved'),
+        ('  Claims triage ', '2026-09', 3)
+    )
+
+    assert summary['by_id'] is False
+    assert cells[0][1] == 'Claims triage'
+
+@pytest.mark.parametrize('rows, message', [
+    ([], 'The file is empty'),
+    ([('initiative_id', 'Hours saved')], 'metric_period and initiative_id'),
+    ([('metric_period', 'Hours saved')], 'metric_period and initiative_id'),
+    ([('initiative_id', 'metric_period', 'metric_name')], 'metric_name but no value'),
+    ([('initiative_id', 'metric_period', 'comments')], 'no metric columns')
+])
+def test_unusable_header(rows, message):
+    with pytest.raises(ValueError, match=message):
+        parse_metric_import(rows, METRIC_TYPES)
+
+# ---- Cells ----
+
+def test_excel_cells():
+    # openpyxl returns dates as datetimes and whole numbers as floats
+    cells, errors, _ = parse(
+        ('initiative_id', 'metric_period', 'Hours saved'),
+        (7.0, datetime(2026, 9, 1), 5)
+    )
+
+    assert errors == []
+    assert cells[0][1:3] == (7, '2026-09')
+
+@pytest.mark.parametrize('row, error', [
+    (('x7', '2026-09', 1), "Invalid initiative_id: 'x7'"),
+    ((None, '2026-09', 1), 'Invalid initiative_id: None'),
+    (('7', '2026-13', 1), "Invalid metric_period '2026-13'; expected YYYY-MM"),
+    (('7', 'Sep 2026', 1), "Invalid metric_period 'Sep 2026'; expected YYYY-MM"),
+    (('7', '2026-09', 'twelve'), "'Hours saved' must be a number"),
+    (('7', '2026-09', 'nan'), "'Hours saved' must be a number")
+])
+def test_invalid_cells(row, error):
+    cells, errors, _ = parse(('initiative_id', 'metric_period', 'Hours saved'), row)
+
+    assert cells == []
+    assert [(entry['row'], entry['error']) for entry in errors] == [(2, error)]
+
+def test_long_layout_requires_known_metric_and_value():
+    cells, errors, _ = parse(
+        ('initiative_id', 'metric_period', 'metric_name', 'value'),
+        (7, '2026-09', 'Unheard of', 1),
+        (7, '2026-09', 'Hours saved', ' '),
+        (),
+        (None, '', None, None)
+    )
+
+    assert cells == []
+    assert errors == [
+        {'row': 2, 'error': "Unknown metric 'Unheard of'"},
+        {'row': 3, 'error': "Missing value for 'Hours saved'"}
+    ]
+
+def test_overlong_text_is_rejected():
+    cells, errors, _ = parse(
+        ('initiative_id', 'metric_period', 'Adoption notes'),
+        (7, '2026-09', 'x' * 5000)
+    )
+
+    assert cells == []
+    assert errors[0]['row'] == 2 and 'exceed 4000 characters' in errors[0]['error']
+
+# ---- Resolution ----
+
+def test_duplicate_cells_are_rejected(fake_db):
+    initiatives_db(fake_db, {7: 'Claims triage'})
+    cells, errors, _ = parse(
+        ('initiative_id', 'metric_period', 'metric_name', 'value'),
+        (7, '2026-09', 'Hours saved', 1),
+        (7, '2026-10', 'Hours saved', 2),
+        (7, '2026-09', 'HOURS SAVED', 3)
+    )
+
+    staged = resolve_metric_import(fake_db.connect().cursor(), cells, True, errors)
+
+    assert [(row[1], row[3]) for row in staged] == [('2026-09', 1.0), ('2026-10', 2.0)]
+    assert errors == [{'row': 4, 'column': 'Hours saved', 'error': "'Hours saved' for 2026-09 is already given on row 2"}]
+
+def test_unknown_initiative_id(fake_db):
+    initiatives_db(fake_db, {7: 'Claims triage'})
+    cells, errors, _ = parse(('initiative_id', 'metric_period', 'Hours saved'), (7, '2026-09', 1), (9, '2026-09', 1))
+
+    staged = resolve_metric_import(fake_db.connect().cursor(), cells, True, errors)
+
+    assert [row[0] for row in staged] == [7]
+    assert errors == [{'row': 3, 'error': 'Initiative 9 not found'}]
+    assert len(fake_db.statements) == 1
+
+def test_use_case_names_match_case_insensitively_unless_ambiguous(fake_db):
+    initiatives_db(fake_db, {7: 'Claims triage', 8: 'Underwriting', 9: 'UNDERWRITING'})
+    cells, errors, _ = parse(
+        ('use_case_name', 'metric_period', 'Hours saved'),
+        ('claims TRIAGE', '2026-09', 1),
+        ('Underwriting', '2026-09', 2),
+        ('Fraud', '2026-09', 3)
+    )
+
+    staged = resolve_metric_import(fake_db.connect().cursor(), cells, False, errors)
+
+    assert [row[0] for row in staged] == [7]
+    assert errors == [
+        {'row': 3, 'error': "Use case name 'Underwriting' matches initiatives [8, 9]; use initiative_id"},
+        {'row': 4, 'error': "Initiative 'Fraud' not found"}
+    ]
+
+# ---- Endpoint ----
+
+def upload(client, text, **params):
+    query = '&'.join(f'{key}={value}' for key, value in params.items())
+    return client.post(f'/api/metrics/import?{query}', data={'file': (io.BytesIO(text.encode('utf-8')), 'metrics.csv')},
+                       content_type='multipart/form-data')
+
+IMPORT_CSV = 'initiative_id,metric_period,Hours saved\n7,2026-09,10\n7,2026-13,11\n8,2026-09,12\n'
+
+def test_abort_imports_nothing_when_any_row_is_invalid(fake_db, client):
+    initiatives_db(fake_db, {7: 'Claims triage', 8: 'Underwriting'})
+
+    response = upload(client, IMPORT_CSV)
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['imported'] is False and body['error_count'] == 1
+    assert body['errors'][0]['row'] == 3
+    assert fake_db.sql('executemany') == []
+
+def test_skip_imports_the_valid_cells(fake_db, client):
+    initiatives_db(fake_db, {7: 'Claims triage', 8: 'Underwriting'})
+
+    response = upload(client, IMPORT_CSV, on_error='skip')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['imported'] is True
+    assert (body['cells'], body['initiatives'], body['periods'], body['error_count']) == (2, 2, 2, 1)
+    staged = [params for kind, _, params in fake_db.statements if kind == 'executemany']
+    assert staged == [[(7, '2026-09', 'Hours saved', 10.0, '10', None), (8, '2026-09', 'Hours saved', 12.0, '12', None)]]
+
+def test_dry_run_validates_without_writing(fake_db, client):
+    initiatives_db(fake_db, {7: 'Claims triage', 8: 'Underwriting'})
+
+    response = upload(client, IMPORT_CSV, on_error='skip', dry_run='true')
+
+    assert response.status_code == 200
+    assert response.get_json()['imported'] is False
+    assert fake_db.sql('executemany') == []
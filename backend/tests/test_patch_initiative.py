@@ -0,0 +1,19 @@
+"""PATCH /api/initiatives/<id> rejects missing or malformed row versions before touching the database"""
+import pytest
+
+from app import parse_row_version
+
+@pytest.mark.parametrize('value', [None, '', 'stale', 12345, 1.5, True, ['00000000000007d0'], {'v': 1}])
+def test_unusable_row_version_parses_to_none(value):
+    assert parse_row_version(value) is None
+
+@pytest.mark.parametrize('value', ['00000000000007d0', '0x00000000000007D0', '"00000000000007d0"', 'W/"00000000000007d0"'])
+def test_row_version_formats(value):
+    assert parse_row_version(value) == bytes.fromhex('00000000000007d0')
+
+@pytest.mark.parametrize('row_version', [12345, ['00000000000007d0'], {'value': '00000000000007d0'}, None])
+def test_non_string_row_version_is_428(fake_db, client, row_version):
+    response = client.patch('/api/initiatives/7', json={'use_case_name': 'Renamed', 'row_version': row_version})
+
+    assert response.status_code == 428
+    assert fake_db.statements == []
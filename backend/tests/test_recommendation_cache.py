@@ -0,0 +1,44 @@
+"""The recommendation cache doesn't hold a database connection while the LLM generates"""
+import types
+import uuid
+
+import pytest
+
+import app as backend
+
+class StubExecutor:
+    """Runs in place of llm_executor and records the pool while the completion is in flight"""
+
+    def __init__(self):
+        self.in_use_during_call = []
+
+    def call(self, fn, tokens=None):
+        self.in_use_during_call.append(backend.db_pool.stats()['in_use'])
+        message = types.SimpleNamespace(content='Track handling time per claim.')
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = StubExecutor()
+    monkeypatch.setattr(backend, 'llm_executor', executor)
+    monkeypatch.setattr(backend.recommendation_cache, 'enabled', True)
+    monkeypatch.setattr(backend.conversation_writer, 'save', lambda table, values: 1)
+    return executor
+
+@pytest.mark.parametrize('path, answers', [
+    ('/api/roi-assistant', {'industry_specifics': 'Claims'}),
+    ('/api/complexity-analyzer', {'initiative_name': 'Claims triage'})
+])
+def test_no_connection_checked_out_during_completion(pooled_db, client, executor, path, answers):
+    # Unique answers so neither cache tier has this recommendation yet
+    answers = {key: f'{value} {uuid.uuid4().hex}' for key, value in answers.items()}
+
+    response = client.post(path, json=answers)
+
+    assert response.status_code == 200
+    assert response.get_json()['cached'] is False
+    assert executor.in_use_during_call == [0]
+    assert backend.db_pool.stats()['in_use'] == 0
+    # Both database tiers were used: the lookup before the completion and the store after it
+    cache_sql = [sql for sql in pooled_db.sql() if 'llm_response_cache' in sql]
+    assert [sql.split()[0] for sql in cache_sql] == ['UPDATE', 'MERGE']
@@ -14,6 +14,11 @@ export const API_ENDPOINTS = {
   // Initiatives
   INITIATIVES: `${API_BASE_URL}/api/initiatives`,
   INITIATIVE_BY_ID: (id) => `${API_BASE_URL}/api/initiatives/${id}`,
+  EXPORT_JOBS: `${API_BASE_URL}/api/initiatives/export/jobs`,
+  EXPORT_JOB_BY_ID: (jobId) => `${API_BASE_URL}/api/initiatives/export/jobs/${jobId}`,
+
+  // Images
+  IMAGES: `${API_BASE_URL}/api/images`,
 
   // Metrics
   INITIATIVE_METRICS: (id) => `${API_BASE_URL}/api/initiatives/${id}/metrics`,
@@ -43,9 +48,14 @@ export const API_ENDPOINTS = {
 
   // ROI Assistant
   ROI_ASSISTANT: `${API_BASE_URL}/api/roi-assistant`,
+  ROI_ASSISTANT_STREAM: `${API_BASE_URL}/api/roi-assistant/stream`,
+  ROI_ASSISTANT_JOBS: `${API_BASE_URL}/api/roi-assistant/jobs`,
+  LLM_JOB_BY_ID: (jobId) => `${API_BASE_URL}/api/llm/jobs/${jobId}`,
 
   // Complexity Analyzer
   COMPLEXITY_ANALYZER: `${API_BASE_URL}/api/complexity-analyzer`,
+  COMPLEXITY_ANALYZER_STREAM: `${API_BASE_URL}/api/complexity-analyzer/stream`,
+  COMPLEXITY_ANALYZER_JOBS: `${API_BASE_URL}/api/complexity-analyzer/jobs`,
   COMPLEXITY_CONVERSATIONS: `${API_BASE_URL}/api/complexity-conversations`,
   COMPLEXITY_CONVERSATION_BY_ID: (id) => `${API_BASE_URL}/api/complexity-conversations/${id}`,
   COMPLEXITY_MATRIX_DATA: `${API_BASE_URL}/api/complexity-matrix-data`,
@@ -199,7 +199,7 @@ function ComplexityAnalyzer() {
     }
   };
 
-  const sendToLLM = async (responses) => {
+  const sendToLLM = async (responses, regenerate = false) => {
     setIsLoading(true);
 
     setMessages(prev => [...prev, {
@@ -209,23 +209,28 @@ function ComplexityAnalyzer() {
     }]);
 
     try {
-      const response = await api.analyzeComplexity(responses);
-
-      // Add complexity assessment
-      setMessages(prev => [...prev, {
-        role: 'assistant',
-        content: `Analysis Complete:\n\nComplexity Score: ${response.data.complexity_score}/100\nValue Score: ${response.data.value_score}/100\nClassification: ${response.data.quadrant}`,
-        isMetrics: true,
-        timestamp: new Date()
-      }]);
-
-      // Add LLM response
-      setMessages(prev => [...prev, {
-        role: 'assistant',
-        content: response.data.recommendation,
-        isRecommendation: true,
-        timestamp: new Date()
-      }]);
+      let started = false;
+      await api.analyzeComplexityStream(regenerate ? { ...responses, regenerate: true } : responses, (event, payload) => {
+        if (event === 'meta') {
+          // Scores are computed before the LLM call, so they arrive first
+          setMessages(prev => [...prev, {
+            role: 'assistant',
+            content: `Analysis Complete:\n\nComplexity Score: ${payload.complexity_score}/100\nValue Score: ${payload.value_score}/100\nClassification: ${payload.quadrant}`,
+            isMetrics: true,
+            timestamp: new Date()
+          }]);
+        } else if (event === 'token') {
+          // Stream the LLM response into a single message as tokens arrive
+          const first = !started;
+          started = true;
+          if (first) setIsLoading(false);
+          setMessages(prev => first
+            ? [...prev, { role: 'assistant', content: payload.text, isRecommendation: true, timestamp: new Date() }]
+            : [...prev.slice(0, -1), { ...prev[prev.length - 1], content: prev[prev.length - 1].content + payload.text }]);
+        } else if (event === 'error') {
+          throw new Error(payload.error);
+        }
+      });
 
       // Reload history and matrix data
       loadConversationHistory();
@@ -618,6 +623,16 @@ function ComplexityAnalyzer() {
             >
               Start New Analysis
             </button>
+            {messages.some(message => message.isRecommendation) && (
+              <button
+                className="reset-button"
+                onClick={() => sendToLLM(userResponses, true)}
+                disabled={isLoading}
+                title="Ask for a fresh answer instead of a cached one"
+              >
+                Regenerate
+              </button>
+            )}
           </div>
         </div>
       </div>
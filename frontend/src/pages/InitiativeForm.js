@@ -9,7 +9,8 @@ import {
   updateInitiative,
   getFieldOptions,
   getProcessOwnerSuggestions,
-  getBusinessOwnerSuggestions
+  getBusinessOwnerSuggestions,
+  uploadImage
 } from '../services/api';
 
 function InitiativeForm() {
@@ -206,7 +207,7 @@ function InitiativeForm() {
     }));
   };
 
-  const handleImageUpload = (e) => {
+  const handleImageUpload = async (e) => {
     const file = e.target.files[0];
     if (file) {
       // Validate file type
@@ -221,17 +222,18 @@ function InitiativeForm() {
         return;
       }
 
-      // Convert to base64
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        const base64String = reader.result;
+      // Upload as multipart; the initiative stores the returned image URL
+      try {
+        const response = await uploadImage(file);
         setFormData(prev => ({
           ...prev,
-          initiative_image: base64String
+          initiative_image: response.data.url
         }));
-        setImagePreview(base64String);
-      };
-      reader.readAsDataURL(file);
+        setImagePreview(response.data.url);
+      } catch (err) {
+        setError(err.response?.data?.error || 'Failed to upload image');
+        console.error(err);
+      }
     }
   };
 
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Plus, Eye, Edit, Trash2, Filter, BarChart3, AlertTriangle, Download } from 'lucide-react';
-import { getInitiatives, deleteInitiative, getFieldOptions } from '../services/api';
+import { getInitiatives, deleteInitiative, getFieldOptions, startExportJob, getExportJob, downloadExportJob } from '../services/api';
 import MetricsModal from '../components/MetricsModal';
 import RiskModal from '../components/RiskModal';
 
@@ -86,31 +86,22 @@ function Initiatives() {
 
   const handleExportToExcel = async () => {
     try {
-      const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
-      const response = await fetch(`${API_BASE_URL}/api/initiatives/export`, {
-        method: 'GET',
-        headers: {
-          'Accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        }
-      });
-
-      if (!response.ok) {
-        throw new Error('Failed to export initiatives');
+      // Exports run as a background job on the server; poll until the workbook is ready
+      let { data: job } = await startExportJob();
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        ({ data: job } = await getExportJob(job.id));
       }
 
-      // Get filename from Content-Disposition header or use default
-      const contentDisposition = response.headers.get('Content-Disposition');
-      let filename = 'AI_Initiatives_Export.xlsx';
-      if (contentDisposition) {
-        const filenameMatch = contentDisposition.match(/filename="?(.+)"?/);
-        if (filenameMatch) {
-          filename = filenameMatch[1];
-        }
+      if (job.status !== 'completed') {
+        throw new Error(job.error || 'Failed to export initiatives');
       }
 
+      const response = await downloadExportJob(job.id);
+      const filename = job.filename || 'AI_Initiatives_Export.xlsx';
+
       // Create blob and download
-      const blob = await response.blob();
-      const url = window.URL.createObjectURL(blob);
+      const url = window.URL.createObjectURL(response.data);
       const a = document.createElement('a');
       a.href = url;
       a.download = filename;
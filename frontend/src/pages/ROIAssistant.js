@@ -161,7 +161,7 @@ function ROIAssistant() {
     }
   };
 
-  const sendToLLM = async (responses) => {
+  const sendToLLM = async (responses, regenerate = false) => {
     setIsLoading(true);
 
     // Add loading message
@@ -172,15 +172,20 @@ function ROIAssistant() {
     }]);
 
     try {
-      const response = await api.roiAssistant(responses);
-
-      // Add LLM response
-      setMessages(prev => [...prev, {
-        role: 'assistant',
-        content: response.data.recommendation,
-        isRecommendation: true,
-        timestamp: new Date()
-      }]);
+      // Stream the LLM response into a single message as tokens arrive
+      let started = false;
+      await api.roiAssistantStream(regenerate ? { ...responses, regenerate: true } : responses, (event, payload) => {
+        if (event === 'token') {
+          const first = !started;
+          started = true;
+          if (first) setIsLoading(false);
+          setMessages(prev => first
+            ? [...prev, { role: 'assistant', content: payload.text, isRecommendation: true, timestamp: new Date() }]
+            : [...prev.slice(0, -1), { ...prev[prev.length - 1], content: prev[prev.length - 1].content + payload.text }]);
+        } else if (event === 'error') {
+          throw new Error(payload.error);
+        }
+      });
     } catch (error) {
       console.error('Error getting ROI recommendations:', error);
       setMessages(prev => [...prev, {
@@ -279,6 +284,16 @@ function ROIAssistant() {
           >
             Start New Conversation
           </button>
+          {messages.some(message => message.isRecommendation) && (
+            <button
+              className="reset-button"
+              onClick={() => sendToLLM(userResponses, true)}
+              disabled={isLoading}
+              title="Ask for a fresh answer instead of a cached one"
+            >
+              Regenerate
+            </button>
+          )}
         </div>
       </div>
     </div>
@@ -16,10 +16,24 @@ export const getInitiatives = (params) => api.get(API_ENDPOINTS.INITIATIVES, { p
 export const getInitiativeById = (id) => api.get(API_ENDPOINTS.INITIATIVE_BY_ID(id));
 export const createInitiative = (data) => api.post(API_ENDPOINTS.INITIATIVES, data);
 export const updateInitiative = (id, data) => api.put(API_ENDPOINTS.INITIATIVE_BY_ID(id), data);
+export const patchInitiative = (id, changes, rowVersion) =>
+  api.patch(API_ENDPOINTS.INITIATIVE_BY_ID(id), changes, { headers: { 'If-Match': `"${rowVersion}"` } });
 export const deleteInitiative = (id) => api.delete(API_ENDPOINTS.INITIATIVE_BY_ID(id));
 export const pinInitiative = (id) => api.post(`${API_ENDPOINTS.INITIATIVE_BY_ID(id)}/pin`);
 export const unpinInitiative = (id) => api.post(`${API_ENDPOINTS.INITIATIVE_BY_ID(id)}/unpin`);
 
+// Export jobs
+export const startExportJob = () => api.post(API_ENDPOINTS.EXPORT_JOBS);
+export const getExportJob = (jobId) => api.get(API_ENDPOINTS.EXPORT_JOB_BY_ID(jobId));
+export const downloadExportJob = (jobId) => api.get(`${API_ENDPOINTS.EXPORT_JOB_BY_ID(jobId)}/download`, { responseType: 'blob' });
+
+// Images
+export const uploadImage = (file) => {
+  const formData = new FormData();
+  formData.append('image', file);
+  return api.post(API_ENDPOINTS.IMAGES, formData, { headers: { 'Content-Type': 'multipart/form-data' } });
+};
+
 // Metrics
 export const getInitiativeMetrics = (id) => api.get(API_ENDPOINTS.INITIATIVE_METRICS(id));
 export const getInitiativeMetricByPeriod = (id, period) => api.get(API_ENDPOINTS.INITIATIVE_METRIC_BY_PERIOD(id, period));
@@ -63,11 +77,51 @@ export const createProgressUpdate = (initiativeId, data) => api.post(API_ENDPOIN
 export const updateProgressUpdate = (id, data) => api.put(API_ENDPOINTS.PROGRESS_UPDATE_BY_ID(id), data);
 export const deleteProgressUpdate = (id) => api.delete(API_ENDPOINTS.PROGRESS_UPDATE_BY_ID(id));
 
+// Server-Sent Events over POST (EventSource only supports GET).
+// Calls onEvent(event, payload) for each event as it arrives.
+export const streamEvents = async (url, data, onEvent) => {
+  const response = await fetch(url, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify(data),
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = 'message';
+      const dataLines = [];
+      block.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+      });
+      if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
+    }
+  }
+};
+
 // ROI Assistant
 export const roiAssistant = (data) => api.post(API_ENDPOINTS.ROI_ASSISTANT, data);
+export const roiAssistantStream = (data, onEvent) => streamEvents(API_ENDPOINTS.ROI_ASSISTANT_STREAM, data, onEvent);
+export const startRoiAssistantJob = (data) => api.post(API_ENDPOINTS.ROI_ASSISTANT_JOBS, data);
+export const getLlmJob = (jobId) => api.get(API_ENDPOINTS.LLM_JOB_BY_ID(jobId));
 
 // Complexity Analyzer
 export const analyzeComplexity = (data) => api.post(API_ENDPOINTS.COMPLEXITY_ANALYZER, data);
+export const analyzeComplexityStream = (data, onEvent) => streamEvents(API_ENDPOINTS.COMPLEXITY_ANALYZER_STREAM, data, onEvent);
+export const startComplexityAnalyzerJob = (data) => api.post(API_ENDPOINTS.COMPLEXITY_ANALYZER_JOBS, data);
 export const getComplexityConversations = () => api.get(API_ENDPOINTS.COMPLEXITY_CONVERSATIONS);
 export const getComplexityConversation = (id) => api.get(API_ENDPOINTS.COMPLEXITY_CONVERSATION_BY_ID(id));
 export const getComplexityMatrixData = () => api.get(API_ENDPOINTS.COMPLEXITY_MATRIX_DATA);
@@ -78,7 +132,12 @@ export default {
   put: api.put.bind(api),
   delete: api.delete.bind(api),
   roiAssistant,
+  roiAssistantStream,
+  startRoiAssistantJob,
+  getLlmJob,
   analyzeComplexity,
+  analyzeComplexityStream,
+  startComplexityAnalyzerJob,
   getComplexityConversations,
   getComplexityConversation,
   getComplexityMatrixData,